@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,7 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "app.renderers.LargeResponseGZipMiddleware",
+    "app.sessions.ReadOnlyAPISessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -93,6 +95,39 @@ DATABASES = {
     }
 }
 
+# SQLite tuned for concurrent games, applied to every new connection: with WAL readers do not wait for the writer,
+# IMMEDIATE transactions take the write lock when they start and wait for it up to the timeout instead of failing
+# with "database is locked" when they upgrade from reading to writing, and NORMAL synchronous mode skips fsync on
+# every commit (still safe with WAL). Turned on with ARCTRACKER_DATABASE_PROFILE=production, compare both with
+# `manage.py sqlite_benchmark`.
+SQLITE_PRODUCTION_OPTIONS = {
+    "init_command": (
+        "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA mmap_size=134217728; PRAGMA cache_size=-20000"
+    ),
+    "timeout": 20,
+    "transaction_mode": "IMMEDIATE",
+}
+if os.environ.get("ARCTRACKER_DATABASE_PROFILE") == "production":
+    DATABASES["default"]["OPTIONS"] = SQLITE_PRODUCTION_OPTIONS
+    # connections are reused by requests for up to ten minutes, checked before reuse
+    DATABASES["default"]["CONN_MAX_AGE"] = 600
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Where sessions of the web UI and of session authenticated API calls are kept, chosen with
+# ARCTRACKER_SESSION_ENGINE. "db" reads django_session on every request with a session cookie. "cached_db" reads it
+# from the cache and falls back to the table, the default cache is local to the process, so with more than one
+# process a shared cache has to be configured in CACHES or logouts are seen late by other processes. "signed_cookies"
+# keeps the session in a signed cookie and never touches the database, but a copied cookie stays valid after logout
+# until SESSION_COOKIE_AGE passes.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get("ARCTRACKER_SESSION_ENGINE", "db")]
+# safe requests to these paths never save the session, see app/sessions.py
+READ_ONLY_SESSION_PATHS = ("/api/",)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -138,10 +173,45 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "app.api_error_handler.custom_exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # user is built from token claims, see app/authentication.py
+        "app.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # JSON encoded and decoded with orjson when it is installed, see app/renderers.py
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
+
+# Live game updates, see app/game_updates.py
+GAME_UPDATES_BACKEND = "app.game_updates.InProcessBackend"
+# seconds between keepalive comments sent to idle event streams
+GAME_UPDATES_KEEPALIVE = 15
+
+# threads rendering responses of async API views
+ASYNC_API_RENDER_WORKERS = 4
+
+# rows on one page of list endpoints paged with ?cursor= alone, clients can ask for up to API_MAX_PAGE_SIZE with
+# ?limit=, lists requested without either are not paged
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+# smallest response body compressed for clients accepting gzip, None turns compression off
+API_GZIP_MIN_LENGTH = 1024
+
+# games, players and hands looked up by game endpoints kept by every worker process, 0 turns the cache off. Changes
+# made by other processes are not seen, so it may only be turned on when a single process serves the database.
+API_LOOKUP_CACHE_SIZE = int(os.environ.get("ARCTRACKER_LOOKUP_CACHE_SIZE", "0"))
+
+# seconds a worker trusts its last read of a user authenticated with JWT, so deleted or deactivated users keep access
+# for at most this long on workers that did not make the change, 0 reads the user on every request
+API_AUTH_USER_CHECK_SECONDS = 30
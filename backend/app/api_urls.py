@@ -9,8 +9,11 @@ from .api_views import (
     CardsAbleToPlayInRoundAPIView,
     CardUnrevealedSerializerAPIView,
     ChapterCreateAPIView,
+    ChapterHistoryAPIView,
     GameAPIView,
+    GameInferenceAPIView,
     GameRoundAPIView,
+    GameStateAPIView,
     LatestChapterAPIView,
     LoginAPIView,
     LogoutAPIView,
@@ -18,9 +21,18 @@ from .api_views import (
     PlayerAPIView,
     RegisterAPIView,
     RoundCreateAPIView,
+    RoundSubmitAPIView,
     csrf,
+    game_events,
     meAPIView,
 )
+from .async_api_views import (
+    AsyncCardPlayedInRoundAPIView,
+    AsyncCardsAbleToPlayInRoundAPIView,
+    AsyncGameAPIView,
+    AsyncGameRoundAPIView,
+    AsyncLatestChapterAPIView,
+)
 
 urlpatterns = [
     path("csrf/", csrf, name="csrf"),
@@ -33,10 +45,15 @@ urlpatterns = [
     path("cards/", CardAPIView.as_view(), name="cards"),
     path("players/", PlayerAPIView.as_view(), name="players"),
     path("games/", GameAPIView.as_view(), name="games"),
+    path("games/<str:game_id>/state", GameStateAPIView.as_view(), name="game-state"),
+    path("games/<str:game_id>/events", game_events, name="game-events"),
+    path("games/<str:game_id>/inference", GameInferenceAPIView.as_view(), name="game-inference"),
     path("games/<str:game_id>/game_rounds", GameRoundAPIView.as_view(), name="game-rounds"),
     path("games/<str:game_id>/rounds/create", RoundCreateAPIView.as_view(), name="create-round"),
+    path("games/<str:game_id>/rounds/submit", RoundSubmitAPIView.as_view(), name="submit-round"),
     path("games/<str:game_id>/chapters/create", ChapterCreateAPIView.as_view(), name="create-chapter"),
     path("games/<str:game_id>/chapters/latest", LatestChapterAPIView.as_view(), name="latest-chapter"),
+    path("games/<str:game_id>/chapters/<int:chapter>/history", ChapterHistoryAPIView.as_view(), name="chapter-history"),
     path("games/<str:game_id>/players/<str:player_id>/hand/play", CardPlayedInRoundAPIView.as_view(), name="play-card"),
     path(
         "games/<str:game_id>/players/<str:player_id>/hand/play/cards",
@@ -63,4 +80,18 @@ urlpatterns = [
         CardUnrevealedSerializerAPIView.as_view(),
         name="unreveal-card",
     ),
+    # async variants of read endpoints, served without holding a thread when the app runs under ASGI
+    path("async/games/", AsyncGameAPIView.as_view(), name="async-games"),
+    path("async/games/<str:game_id>/game_rounds", AsyncGameRoundAPIView.as_view(), name="async-game-rounds"),
+    path("async/games/<str:game_id>/chapters/latest", AsyncLatestChapterAPIView.as_view(), name="async-latest-chapter"),
+    path(
+        "async/games/<str:game_id>/players/<str:player_id>/hand/play",
+        AsyncCardPlayedInRoundAPIView.as_view(),
+        name="async-play-card",
+    ),
+    path(
+        "async/games/<str:game_id>/players/<str:player_id>/hand/play/cards",
+        AsyncCardsAbleToPlayInRoundAPIView.as_view(),
+        name="async-cards-able-to-play",
+    ),
 ]
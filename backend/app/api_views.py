@@ -1,20 +1,41 @@
+import asyncio
+import functools
 import uuid
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth import models as auth_models
 from django.db import transaction
-from django.http import JsonResponse
+from django.http import HttpRequest, HttpResponseBase, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status
-from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .api_views_logic import prepare_new_game
-from .models import Card, CardPlayedInRound, Game, GameRound, Player, PlayerHand
+from .api_views_logic import get_game_state, lock_game, prepare_new_game, submit_round
+from .cards_catalog import get_catalog
+from .game_events import record_event
+from .game_updates import get_backend
+from .hand_inference import get_hand_inference, represent_inference
+from .lookup_cache import lookup_cache
+from .models import Card, CardPlayedInRound, Game, GameEventKind, GameRound, Player, PlayerHand
+from .pagination import (
+    GAME_ROUNDS_KEYSET,
+    GAMES_KEYSET,
+    PLAYERS_KEYSET,
+    KeysetPagination,
+    filter_created_time,
+    filter_games,
+    set_next_link,
+)
+from .renderers import FastJSONRenderer
 from .serializers import (
     CardPlayedInRoundSerializerGet,
     CardPlayedInRoundSerializerPost,
@@ -27,8 +48,23 @@ from .serializers import (
     PlayerSerializerGet,
     PlayerSerializerPost,
     RegisterSerializer,
+    RoundSubmitSerializerPost,
+    card_format_context,
+)
+from .views_logic import (
+    add_card_to_hand,
+    add_card_to_not_played,
+    change_number_of_cards,
+    get_cards_to_play,
+    get_cards_to_retrieve,
+    get_cards_to_reveal,
+    get_chapter_history,
+    play_cards_from_hand,
+    remove_card_from_hand,
+    remove_card_from_not_played,
 )
-from .views_logic import cards_number_order, get_cards_to_play, get_cards_to_retrieve, get_cards_to_reveal
+
+HttpResponseT = TypeVar("HttpResponseT", bound=HttpResponseBase)
 
 
 @ensure_csrf_cookie
@@ -36,23 +72,182 @@ def csrf(request: Request) -> JsonResponse:
     return JsonResponse({"detail": "CSRF cookie set"})
 
 
+def set_game_etag(response: HttpResponseT, game: Game) -> HttpResponseT:
+    """Adds strong ETag of the game version to successful response and asks clients to revalidate before reusing it
+
+    :param response: Response object
+    :param game: Game object the response was built from
+    :return: Response object
+    """
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response["ETag"] = quote_etag(f"{game.id}-{game.version}")
+        response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(request: Request, game: Game) -> bool:
+    """Checks whether client already has current version of the game resource. ETags are compared weakly, as
+    If-None-Match requires, so ETags weakened by GZipMiddleware in compressed responses match too.
+
+    :param request: Request object
+    :param game: Game object with id and version
+    :return: True if response would not change
+    """
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    etag = quote_etag(f"{game.id}-{game.version}")
+    return any(tag.removeprefix("W/") == etag or tag == "*" for tag in if_none_match)
+
+
+def game_etag(view_method: Callable[..., Response]) -> Callable[..., Response]:
+    """Decorates GET method of a game resource with conditional GET. A request with current ETag is answered with 304
+    after a single version lookup, other requests are answered as before with ETag of the game they loaded.
+
+    :param view_method: GET method taking game_id and loading the game with get_game
+    :return: decorated method
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self: "BaseAPIView", request: Request, game_id: uuid.UUID, *args: Any, **kwargs: Any) -> Response:
+        if "If-None-Match" in request.headers:
+            game = self.get_game_version(request.user, game_id)
+            if not_modified(request, game):
+                return set_game_etag(Response(status=status.HTTP_304_NOT_MODIFIED), game)
+        response = view_method(self, request, game_id, *args, **kwargs)
+        return set_game_etag(response, self.game) if self.game is not None else response
+
+    return wrapper
+
+
+def authenticate_request(request: HttpRequest) -> auth_models.User:
+    """Authenticates plain request, used by views that are not API views, with authentication classes of the API
+
+    :param request: HttpRequest object
+    :return: User object
+    :raises NotAuthenticated: if request has no valid credentials
+    """
+    user = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]).user
+    if not user.is_authenticated:
+        raise NotAuthenticated()
+    assert isinstance(user, auth_models.User)
+    return user
+
+
+def get_stream_game_id(request: HttpRequest, game_id: str) -> uuid.UUID:
+    """Authenticates plain request and checks that the user owns the game
+
+    :param request: HttpRequest object
+    :param game_id: id of game
+    :return: id of game
+    :raises NotFound: if user has no such game
+    """
+    user = authenticate_request(request)
+    try:
+        return Game.objects.only("id").get(user=user, id=game_id).id
+    except Game.DoesNotExist as exc:
+        raise NotFound(detail=f"game {game_id} does not exist") from exc
+
+
+def load_stream_state(game_id: uuid.UUID) -> Tuple[int, bytes]:
+    with transaction.atomic():
+        game = Game.objects.select_related("current_round").get(id=game_id)
+        return game.version, FastJSONRenderer().render(get_game_state(game))
+
+
+def format_server_sent_event(event: str, data: bytes, event_id: Optional[int] = None) -> bytes:
+    return (
+        (f"id: {event_id}\n" if event_id is not None else "").encode()
+        + f"event: {event}\ndata: ".encode()
+        + data
+        + b"\n\n"
+    )
+
+
+async def stream_game_updates(game_id: uuid.UUID, last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+    """Streams game state followed by deltas of every committed mutation. Subscription starts before the state is
+    read, so no mutation is missed, and deltas already included in the state are skipped. Event id is the game
+    version, a client reconnecting with current version gets no state.
+
+    :param game_id: id of game
+    :param last_event_id: game version client already has
+    :yield: server-sent events
+    """
+    backend = get_backend()
+    subscription = backend.subscribe(game_id)
+    try:
+        version, state = await sync_to_async(load_stream_state)(game_id)
+        if last_event_id != str(version):
+            yield format_server_sent_event("state", state, version)
+        while True:
+            try:
+                update = await asyncio.wait_for(subscription.get(), settings.GAME_UPDATES_KEEPALIVE)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if update is None:
+                # listener fell behind, client reconnects and gets current state
+                yield format_server_sent_event("resync", b"{}")
+                return
+            if update.version > version:
+                yield format_server_sent_event("update", update.data.encode(), update.version)
+    finally:
+        backend.unsubscribe(subscription)
+
+
+async def game_events(request: HttpRequest, game_id: str) -> HttpResponseBase:
+    """Pushes live updates of the game as server-sent events, it has to be served by ASGI server. Listeners get
+    updates through the pub/sub backend and do not query the database after the state is sent.
+
+    :param request: HttpRequest object
+    :param game_id: id of game
+    :return: StreamingHttpResponse object or error response
+    """
+    try:
+        stream_game_id = await sync_to_async(get_stream_game_id)(request, game_id)
+    except APIException as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    return StreamingHttpResponse(
+        stream_game_updates(stream_game_id, request.headers.get("Last-Event-ID")),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class BaseAPIView(APIView):  # type: ignore[misc]
 
+    game: Optional[Game] = None
+
+    def get_game_version(self, user: Any, game_id: uuid.UUID) -> Game:
+        # always read, a version cached by this process may be older than one committed by another process
+        try:
+            return Game.objects.only("id", "version").get(user=user, id=game_id)
+        except Game.DoesNotExist as exc:
+            raise NotFound(detail=f"game {game_id} does not exist") from exc
+
     def get_game(self, user: Any, game_id: uuid.UUID) -> Game:
         try:
-            return Game.objects.get(user=user, id=game_id)
+            self.game = lookup_cache.get_or_load(
+                ("game", user.pk, game_id),
+                lambda: Game.objects.select_related("current_round").get(user=user, id=game_id),
+                lambda game: game.id,
+            )
         except Game.DoesNotExist as exc:
             raise NotFound(detail=f"game {game_id} does not exist") from exc
+        return self.game
 
-    def get_game_by_name(self, user: Any, game_name: str) -> Game:
+    def get_game_by_name(self, user: Any, game_name: str, fields: Optional[List[str]] = None) -> Game:
         try:
-            return Game.objects.get(user=user, name=game_name)
+            return GameSerializerGet.narrow(Game.objects.all(), fields, required=("version",)).get(
+                user=user, name=game_name
+            )
         except Game.DoesNotExist as exc:
             raise NotFound(detail=f"game {game_name} does not exist") from exc
 
     def get_player(self, user: Any, player_id: uuid.UUID) -> Player:
         try:
-            return Player.objects.get(user=user, id=player_id)
+            # players never change, so they are not invalidated
+            return lookup_cache.get_or_load(
+                ("player", user.pk, player_id), lambda: Player.objects.get(user=user, id=player_id)
+            )
         except Player.DoesNotExist as exc:
             raise NotFound(detail=f"player {player_id} does not exist") from exc
 
@@ -64,15 +259,19 @@ class BaseAPIView(APIView):  # type: ignore[misc]
 
     def get_player_hand(self, player_id: uuid.UUID, game: Game) -> PlayerHand:
         try:
-            return PlayerHand.objects.get(player__id=player_id, game=game)
+            return lookup_cache.get_or_load(
+                ("hand", game.id, player_id),
+                lambda: PlayerHand.objects.get(player__id=player_id, game=game),
+                lambda player_hand: player_hand.game_id,
+            )
         except PlayerHand.DoesNotExist as exc:
             raise ValidationError(detail=f"player {player_id} does not play in this game") from exc
 
     def get_card(self, card_id: uuid.UUID) -> Card:
-        try:
-            return Card.objects.get(id=card_id)
-        except Card.DoesNotExist as exc:
-            raise ValidationError(detail=f"card {card_id} does not exist") from exc
+        card = get_catalog().get(card_id)
+        if card is None:
+            raise ValidationError(detail=f"card {card_id} does not exist")
+        return card
 
 
 class RegisterAPIView(APIView):  # type: ignore[misc]
@@ -128,13 +327,18 @@ class PlayerAPIView(BaseAPIView):
     def get(self, request: Request) -> Response:
         assert isinstance(request.user, auth_models.User)
         nick = request.query_params.get("nick")
+        fields = PlayerSerializerGet.requested_fields(request.query_params)
         if nick:
             player = self.get_player_by_nick(request.user, nick)
-            serializer = PlayerSerializerGet(player)
-        else:
-            players = Player.objects.filter(user=request.user)
-            serializer = PlayerSerializerGet(players, many=True)
-        return Response(serializer.data)
+            return Response(PlayerSerializerGet(player, fields=fields).data)
+        pagination = KeysetPagination.from_params(request.query_params, Player, PLAYERS_KEYSET)
+        queryset = filter_created_time(Player.objects.filter(user=request.user), request.query_params)
+        players, next_cursor = pagination.page(
+            pagination.paginate(PlayerSerializerGet.narrow(queryset, fields, required=PLAYERS_KEYSET))
+        )
+        return set_next_link(
+            Response(PlayerSerializerGet(players, many=True, fields=fields).data), request, next_cursor
+        )
 
     def post(self, request: Request) -> Response:
         assert isinstance(request.user, auth_models.User)
@@ -155,16 +359,28 @@ class GameAPIView(BaseAPIView):
     def get(self, request: Request) -> Response:
         assert isinstance(request.user, auth_models.User)
         name = request.query_params.get("name")
+        fields = GameSerializerGet.requested_fields(request.query_params)
         if name:
-            game = self.get_game_by_name(request.user, name)
-            serializer = GameSerializerGet(game)
-        else:
-            games = Game.objects.filter(user=request.user)
-            serializer = GameSerializerGet(games, many=True)
-        return Response(serializer.data)
+            if "If-None-Match" in request.headers:
+                game_version = Game.objects.only("id", "version").filter(user=request.user, name=name).first()
+                if game_version is not None and not_modified(request, game_version):
+                    return set_game_etag(Response(status=status.HTTP_304_NOT_MODIFIED), game_version)
+            game = self.get_game_by_name(request.user, name, fields)
+            serializer = GameSerializerGet(game, fields=fields, context=card_format_context(request.query_params))
+            return set_game_etag(Response(serializer.data), game)
+        pagination = KeysetPagination.from_params(request.query_params, Game, GAMES_KEYSET)
+        queryset = filter_games(Game.objects.filter(user=request.user), request.query_params)
+        games, next_cursor = pagination.page(
+            pagination.paginate(GameSerializerGet.narrow(queryset, fields, required=GAMES_KEYSET))
+        )
+        serializer = GameSerializerGet(
+            games, many=True, fields=fields, context=card_format_context(request.query_params)
+        )
+        return set_next_link(Response(serializer.data), request, next_cursor)
 
     def post(self, request: Request) -> Response:
         assert isinstance(request.user, auth_models.User)
+        context = card_format_context(request.query_params)
         serializer = GameSerializerPost(data=request.data)
         if serializer.is_valid(raise_exception=True):
             if Game.objects.filter(name=serializer.validated_data["name"], user=request.user).exists():
@@ -180,67 +396,125 @@ class GameAPIView(BaseAPIView):
             with transaction.atomic():
                 game = serializer.save(user=request.user)
                 prepare_new_game(game)
-                return Response(GameSerializerGet(game).data, status=status.HTTP_201_CREATED)
+                return Response(GameSerializerGet(game, context=context).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class GameStateAPIView(BaseAPIView):
+    @game_etag
+    def get(self, request: Request, game_id: uuid.UUID) -> Response:
+        assert isinstance(request.user, auth_models.User)
+        game = self.get_game(request.user, game_id)
+        return Response(get_game_state(game, card_format_context(request.query_params)))
+
+
+class GameInferenceAPIView(BaseAPIView):
+    @game_etag
+    def get(self, request: Request, game_id: uuid.UUID) -> Response:
+        assert isinstance(request.user, auth_models.User)
+        game = self.get_game(request.user, game_id)
+        nicks = {str(player_id): nick for player_id, nick in game.players.values_list("id", "nick")}
+        return Response(represent_inference(get_hand_inference(game), nicks, card_format_context(request.query_params)))
+
+
 class GameRoundAPIView(BaseAPIView):
+    @game_etag
     def get(self, request: Request, game_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
-        game_rounds = GameRound.objects.filter(game=game)
-        serializer = GameRoundSerializerGet(game_rounds, many=True)
-        return Response(serializer.data)
+        fields = GameRoundSerializerGet.requested_fields(request.query_params)
+        pagination = KeysetPagination.from_params(request.query_params, GameRound, GAME_ROUNDS_KEYSET)
+        game_rounds, next_cursor = pagination.page(
+            pagination.paginate(
+                GameRoundSerializerGet.narrow(GameRound.objects.filter(game=game), fields, required=GAME_ROUNDS_KEYSET)
+            )
+        )
+        serializer = GameRoundSerializerGet(game_rounds, many=True, fields=fields)
+        return set_next_link(Response(serializer.data), request, next_cursor)
 
 
 class RoundCreateAPIView(BaseAPIView):
     def post(self, request: Request, game_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
-        latest_round = GameRound.objects.filter(game=game).order_by("-chapter", "-round").first()
+        latest_round = game.current_round
         assert latest_round is not None
-        player_hands = PlayerHand.objects.filter(game=game).all()
-        for player_hand in player_hands:
-            if (
-                player_hand.number_of_cards != 0
-                and not CardPlayedInRound.objects.filter(player=player_hand.player, game_round=latest_round).exists()
-            ):
-                return Response(
-                    {"detail": "not all players that have cards played in this round"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        game_round = GameRound.objects.create(game=game, chapter=latest_round.chapter, round=latest_round.round + 1)
-        game_round.save()
+        if (
+            PlayerHand.objects.filter(game=game)
+            .exclude(number_of_cards=0)
+            .exclude(player__cardplayedinround__game_round=latest_round)
+            .exists()
+        ):
+            return Response(
+                {"detail": "not all players that have cards played in this round"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        with transaction.atomic():
+            game_round = GameRound.objects.create(game=game, chapter=latest_round.chapter, round=latest_round.round + 1)
+            record_event(game, GameEventKind.ROUND_CREATED)
         serializer = GameRoundSerializerGet(game_round)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class RoundSubmitAPIView(BaseAPIView):
+    def post(self, request: Request, game_id: uuid.UUID) -> Response:
+        assert isinstance(request.user, auth_models.User)
+        game = self.get_game(request.user, game_id)
+        context = card_format_context(request.query_params)
+        serializer = RoundSubmitSerializerPost(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            with transaction.atomic():
+                game = lock_game(game.id)
+                submit_round(game, **serializer.validated_data)
+            return Response(get_game_state(game, context), status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class ChapterCreateAPIView(BaseAPIView):
     def post(self, request: Request, game_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
-        latest_round = GameRound.objects.filter(game=game).order_by("-chapter", "-round").first()
+        latest_round = game.current_round
         assert latest_round is not None
         player_hands = PlayerHand.objects.filter(game=game).all()
         for player_hand in player_hands:
             if player_hand.number_of_cards != 0:
                 return Response({"detail": "not all players have 0 cards"}, status=status.HTTP_400_BAD_REQUEST)
-        game_round = GameRound.objects.create(game=game, chapter=latest_round.chapter + 1, round=1)
-        game_round.save()
+        with transaction.atomic():
+            game_round = GameRound.objects.create(game=game, chapter=latest_round.chapter + 1, round=1)
+            record_event(game, GameEventKind.CHAPTER_CREATED)
         serializer = GameRoundSerializerGet(game_round)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class LatestChapterAPIView(BaseAPIView):
+    @game_etag
     def get(self, request: Request, game_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
-        latest_round = GameRound.objects.filter(game=game).order_by("-chapter", "-round").first()
+        latest_round = game.current_round
         assert latest_round is not None
         return Response({"chapter": latest_round.chapter, "round": latest_round.round})
 
 
+class ChapterHistoryAPIView(BaseAPIView):
+    @game_etag
+    def get(self, request: Request, game_id: uuid.UUID, chapter: int) -> Response:
+        assert isinstance(request.user, auth_models.User)
+        game = self.get_game(request.user, game_id)
+        history = get_chapter_history(game, chapter)
+        if not history:
+            raise NotFound(detail=f"chapter {chapter} does not exist")
+        return Response(
+            {
+                "chapter": chapter,
+                "rounds": [{"round": _round, "cards_played": cards_played} for _round, cards_played in history.items()],
+            }
+        )
+
+
 class CardPlayedInRoundAPIView(BaseAPIView):
+    @game_etag
     def get(self, request: Request, game_id: uuid.UUID, player_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
@@ -267,8 +541,13 @@ class CardPlayedInRoundAPIView(BaseAPIView):
                     {"detail": "round must be an integer"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-        cards_played_in_round = CardPlayedInRound.objects.filter(**filters)
-        serializer = CardPlayedInRoundSerializerGet(cards_played_in_round, many=True)
+        fields = CardPlayedInRoundSerializerGet.requested_fields(request.query_params)
+        cards_played_in_round = CardPlayedInRoundSerializerGet.narrow(
+            CardPlayedInRound.objects.filter(**filters), fields
+        )
+        serializer = CardPlayedInRoundSerializerGet(
+            cards_played_in_round, many=True, fields=fields, context=card_format_context(request.query_params)
+        )
         return Response(serializer.data)
 
     def post(self, request: Request, game_id: uuid.UUID, player_id: uuid.UUID) -> Response:
@@ -276,56 +555,61 @@ class CardPlayedInRoundAPIView(BaseAPIView):
         game = self.get_game(request.user, game_id)
         player = self.get_player(request.user, player_id)
         player_hand = self.get_player_hand(player_id, game)
-        serializer = CardPlayedInRoundSerializerPost(data=request.data)
+        serializer = CardPlayedInRoundSerializerPost(
+            data=request.data, context=card_format_context(request.query_params)
+        )
         if serializer.is_valid(raise_exception=True):
-            latest_round = GameRound.objects.filter(game=game).order_by("-chapter", "-round").first()
+            latest_round = game.current_round
             assert latest_round is not None
             if CardPlayedInRound.objects.filter(game_round=latest_round, player=player).exists():
                 return Response(
                     {"detail": f"player {player.nick} played card this round"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            card_face_up = serializer.validated_data.get("card_face_up")
+            if card_face_up and card_face_up not in get_cards_to_play(game, player_hand):
+                return Response(
+                    {"detail": f"card {card_face_up.id} was already played face up"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             with transaction.atomic():
                 card_played = serializer.save(player=player, game_round=latest_round)
                 assert isinstance(card_played, CardPlayedInRound)
                 if card_played.card_face_up:
-                    if card_played.card_face_up not in get_cards_to_play(game, player):
-                        return Response(
-                            {"detail": f"card {card_played.card_face_up.id} was already played face up"},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-                    player_hand.number_of_cards -= 1
-                    game.cards_not_played.remove(card_played.card_face_up)
-                    game.save()
-                player_hand.number_of_cards -= card_played.number_of_cards_face_down
-                player_hand.save()
+                    remove_card_from_not_played(game, card_played.card_face_up)
+                play_cards_from_hand(player_hand, card_played.card_face_up, card_played.number_of_cards_face_down)
+                record_event(
+                    game,
+                    GameEventKind.CARD_PLAYED,
+                    player_id=player.id,
+                    card=card_played.card_face_up,
+                    number_of_cards=card_played.number_of_cards_face_down,
+                )
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class CardsAbleToPlayInRoundAPIView(BaseAPIView):
+    @game_etag
     def get(self, request: Request, game_id: uuid.UUID, player_id: uuid.UUID) -> Response:
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
-        player = self.get_player(request.user, player_id)
-        serializer = CardSerializerGet(get_cards_to_play(game, player), many=True)
+        player_hand = self.get_player_hand(player_id, game)
+        serializer = CardSerializerGet(
+            get_cards_to_play(game, player_hand), many=True, context=card_format_context(request.query_params)
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class CardAPIView(APIView):  # type: ignore[misc]
     def get(self, request: Request) -> Response:
         assert isinstance(request.user, auth_models.User)
-        filters: Dict[str, Any] = {}
         suit = request.query_params.get("suit")
         number = request.query_params.get("number")
-        if suit:
-            filters["suit"] = suit
-        if number:
-            filters["number"] = number
-        cards = Card.objects.filter(**filters).order_by("suit", cards_number_order)
+        cards = get_catalog().filter(suit=suit or None, number=number or None)
         if len(cards) == 0:
             return Response({"detail": "no card found"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = CardSerializerGet(cards, many=True)
+        serializer = CardSerializerGet(cards, many=True, context=card_format_context(request.query_params))
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -334,19 +618,19 @@ class CardRetrievedSerializerAPIView(BaseAPIView):
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
         player_hand = self.get_player_hand(player_id, game)
-        serializer = CardSerializerPost(data=request.data)
+        serializer = CardSerializerPost(data=request.data, context=card_format_context(request.query_params))
         if serializer.is_valid(raise_exception=True):
             card: Card = serializer.validated_data["id"]
-            latest_round = GameRound.objects.filter(game=game).order_by("-chapter", "-round").first()
+            latest_round = game.current_round
             assert latest_round is not None
             if card not in get_cards_to_retrieve(game, latest_round.chapter, latest_round.round):
                 return Response(
                     {"detail": f"card {card.id} can not be retrieved"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            player_hand.number_of_cards += 1
-            player_hand.cards.add(card)
-            player_hand.save()
+            with transaction.atomic():
+                add_card_to_hand(player_hand, card, number_of_cards=1)
+                record_event(game, GameEventKind.CARD_RETRIEVED, player_id=player_hand.player_id, card=card)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -358,8 +642,14 @@ class NumberOfCardsAddedSerializerAPIView(BaseAPIView):
         player_hand = self.get_player_hand(player_id, game)
         serializer = NumberOfCardsAddedSerializerPost(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            player_hand.number_of_cards += serializer.validated_data["number_of_cards"]
-            player_hand.save()
+            with transaction.atomic():
+                change_number_of_cards(player_hand, serializer.validated_data["number_of_cards"])
+                record_event(
+                    game,
+                    GameEventKind.CARDS_ADDED,
+                    player_id=player_hand.player_id,
+                    number_of_cards=serializer.validated_data["number_of_cards"],
+                )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -369,7 +659,7 @@ class CardRevealedSerializerAPIView(BaseAPIView):
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
         player_hand = self.get_player_hand(player_id, game)
-        serializer = CardSerializerPost(data=request.data)
+        serializer = CardSerializerPost(data=request.data, context=card_format_context(request.query_params))
         if serializer.is_valid(raise_exception=True):
             card: Card = serializer.validated_data["id"]
             if card not in get_cards_to_reveal(game):
@@ -378,8 +668,9 @@ class CardRevealedSerializerAPIView(BaseAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             with transaction.atomic():
-                player_hand.cards.add(card)
-                game.cards_not_played.remove(card)
+                add_card_to_hand(player_hand, card)
+                remove_card_from_not_played(game, card)
+                record_event(game, GameEventKind.CARD_REVEALED, player_id=player_hand.player_id, card=card)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -389,16 +680,17 @@ class CardUnrevealedSerializerAPIView(BaseAPIView):
         assert isinstance(request.user, auth_models.User)
         game = self.get_game(request.user, game_id)
         player_hand = self.get_player_hand(player_id, game)
-        serializer = CardSerializerPost(data=request.data)
+        serializer = CardSerializerPost(data=request.data, context=card_format_context(request.query_params))
         if serializer.is_valid(raise_exception=True):
             card: Card = serializer.validated_data["id"]
-            if card not in player_hand.cards.all():
+            if not get_catalog().contains(player_hand.cards, card):
                 return Response(
                     {"detail": f"card {card.id} can not be unrevealed"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             with transaction.atomic():
-                player_hand.cards.remove(card)
-                game.cards_not_played.add(card)
+                remove_card_from_hand(player_hand, card)
+                add_card_to_not_played(game, card)
+                record_event(game, GameEventKind.CARD_UNREVEALED, player_id=player_hand.player_id, card=card)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
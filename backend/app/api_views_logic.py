@@ -1,4 +1,15 @@
-from .models import Game
+import uuid
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, List, Mapping, Optional
+
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+
+from .cards_catalog import ALL_CARDS_MASK, get_catalog
+from .game_events import record_events, start_event_log
+from .models import CardPlayedInRound, Game, GameEvent, GameEventKind, GameRound, PlayerHand
+from .serializers import CardSerializerGet, represent_card
 from .views_logic import assign_cards, create_initial_round, deal_initial_hands
 
 
@@ -6,3 +17,171 @@ def prepare_new_game(game: Game) -> None:
     assign_cards(game)
     create_initial_round(game)
     deal_initial_hands(game)
+    start_event_log(game)
+
+
+def get_game_state(game: Game, context: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Prepares snapshot of everything needed to render the game: players with their hands, cards not played, current
+    chapter and round and cards played in current round. Cards come from the catalog, so it costs two queries on top
+    of the game lookup whatever the game size.
+
+    :param game: Game object
+    :param context: serializer context choosing representation of cards, see serializers.card_format_context
+    :return: Dictionary with game state
+    """
+    context = context or {}
+    catalog = get_catalog()
+    player_hands = PlayerHand.objects.filter(game=game).select_related("player").order_by("player__nick")
+    latest_round = game.current_round
+    cards_played_in_round = (
+        CardPlayedInRound.objects.filter(game_round=latest_round)
+        .order_by("id")
+        .values("player", "card_face_up", "number_of_cards_face_down")
+        if latest_round is not None
+        else []
+    )
+    return {
+        "id": game.id,
+        "name": game.name,
+        "finished": game.finished,
+        "chapter": latest_round.chapter if latest_round is not None else None,
+        "round": latest_round.round if latest_round is not None else None,
+        "players": [
+            {
+                "id": player_hand.player.id,
+                "nick": player_hand.player.nick,
+                "number_of_cards": player_hand.number_of_cards,
+                "revealed_cards": CardSerializerGet(
+                    catalog.cards_in(player_hand.cards), many=True, context=context
+                ).data,
+            }
+            for player_hand in player_hands
+        ],
+        "cards_not_played": CardSerializerGet(catalog.cards_in(game.cards_not_played), many=True, context=context).data,
+        "cards_played_in_round": [
+            {
+                **card_played,
+                "card_face_up": (
+                    represent_card(card_played["card_face_up"], context) if card_played["card_face_up"] else None
+                ),
+            }
+            for card_played in cards_played_in_round
+        ],
+    }
+
+
+def lock_game(game_id: uuid.UUID) -> Game:
+    """Reads game with its current round in the running transaction and locks its row until the transaction ends.
+    The game is never taken from the lookup cache, so writes based on it do not overwrite changes committed since the
+    cached copy was read.
+
+    :param game_id: id of game
+    :return: Game object
+    """
+    return Game.objects.select_for_update(of=("self",)).select_related("current_round").get(id=game_id)
+
+
+def submit_round(  # pylint: disable=too-many-locals,too-many-statements
+    game: Game,
+    reveals: List[Dict[str, Any]],
+    plays: List[Dict[str, Any]],
+    retrieves: List[Dict[str, Any]],
+    advance: bool,
+) -> None:
+    """Applies reveals, plays and retrieves of the current round in this order and optionally starts the next round.
+    Everything is validated against hands and plays loaded once, with the same rules as the single action endpoints,
+    and written with bulk operations. Nothing is written if any action is invalid. It has to run in a transaction with
+    game read by it (see lock_game), hands are locked here and cards leave the deck with an update relative to the
+    stored value, so actions committed by other requests are not overwritten.
+
+    :param game: Game object with current round, read and locked in the running transaction
+    :param reveals: dictionaries with player id and card revealed to the player
+    :param plays: dictionaries with player id, card played face up and number of cards played face down
+    :param retrieves: dictionaries with player id and card played face up in this round given to the player
+    :param advance: whether to start next round
+    :raises ValidationError: if any action is invalid
+    """
+    catalog = get_catalog()
+    latest_round = game.current_round
+    assert latest_round is not None
+    hands: Dict[uuid.UUID, PlayerHand] = {
+        player_hand.player_id: player_hand
+        for player_hand in PlayerHand.objects.filter(game=game).select_related("player").select_for_update(of=("self",))
+    }
+    played_in_round: Dict[uuid.UUID, Optional[uuid.UUID]] = dict(
+        CardPlayedInRound.objects.filter(game_round=latest_round).values_list("player_id", "card_face_up_id")
+    )
+    played_face_up = catalog.mask_by_ids(played_in_round.values())
+    cards_not_played = game.cards_not_played
+    events: List[GameEvent] = []
+
+    def get_hand(player_id: uuid.UUID) -> PlayerHand:
+        if player_id not in hands:
+            raise ValidationError(detail=f"player {player_id} does not play in this game")
+        return hands[player_id]
+
+    for reveal in reveals:
+        player_hand, card = get_hand(reveal["player"]), reveal["card"]
+        if not catalog.contains(cards_not_played, card):
+            raise ValidationError(detail=f"card {card.id} can not be revealed")
+        player_hand.cards |= catalog.bit(card)
+        cards_not_played &= ALL_CARDS_MASK & ~catalog.bit(card)
+        events.append(GameEvent(kind=GameEventKind.CARD_REVEALED, player_id=player_hand.player_id, card=card))
+
+    new_plays = []
+    for play in plays:
+        player_hand, card = get_hand(play["player"]), play["card_face_up"]
+        if player_hand.player_id in played_in_round:
+            raise ValidationError(detail=f"player {player_hand.player.nick} played card this round")
+        if card is not None:
+            if not catalog.contains(player_hand.cards | cards_not_played, card):
+                raise ValidationError(detail=f"card {card.id} was already played face up")
+            player_hand.number_of_cards -= 1
+            player_hand.cards &= ALL_CARDS_MASK & ~catalog.bit(card)
+            cards_not_played &= ALL_CARDS_MASK & ~catalog.bit(card)
+            played_face_up |= catalog.bit(card)
+        player_hand.number_of_cards -= play["number_of_cards_face_down"]
+        played_in_round[player_hand.player_id] = card.id if card is not None else None
+        new_plays.append(
+            CardPlayedInRound(
+                player_id=player_hand.player_id,
+                game_round=latest_round,
+                card_face_up=card,
+                number_of_cards_face_down=play["number_of_cards_face_down"],
+            )
+        )
+        events.append(
+            GameEvent(
+                kind=GameEventKind.CARD_PLAYED,
+                player_id=player_hand.player_id,
+                card=card,
+                number_of_cards=play["number_of_cards_face_down"],
+            )
+        )
+
+    for retrieve in retrieves:
+        player_hand, card = get_hand(retrieve["player"]), retrieve["card"]
+        in_hands = reduce(or_, (hand.cards for hand in hands.values()), 0)
+        if not catalog.contains(played_face_up & ~in_hands, card):
+            raise ValidationError(detail=f"card {card.id} can not be retrieved")
+        player_hand.cards |= catalog.bit(card)
+        player_hand.number_of_cards += 1
+        events.append(GameEvent(kind=GameEventKind.CARD_RETRIEVED, player_id=player_hand.player_id, card=card))
+
+    if advance:
+        if any(
+            player_hand.number_of_cards != 0 and player_id not in played_in_round
+            for player_id, player_hand in hands.items()
+        ):
+            raise ValidationError(detail="not all players that have cards played in this round")
+        events.append(GameEvent(kind=GameEventKind.ROUND_CREATED))
+
+    PlayerHand.objects.bulk_update(hands.values(), ["cards", "number_of_cards"])
+    if cards_not_played != game.cards_not_played:
+        mask = ALL_CARDS_MASK & ~(game.cards_not_played & ~cards_not_played)
+        Game.objects.filter(id=game.id).update(cards_not_played=F("cards_not_played").bitand(mask))
+        game.cards_not_played = cards_not_played
+    CardPlayedInRound.objects.bulk_create(new_plays)
+    if advance:
+        GameRound.objects.create(game=game, chapter=latest_round.chapter, round=latest_round.round + 1)
+    record_events(game, events)
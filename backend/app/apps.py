@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):  # type: ignore
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self) -> None:
+        from . import authentication, cards_catalog  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,229 @@
+import functools
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, cast
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import models as auth_models
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.views import View
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+from .api_error_handler import custom_exception_handler
+from .api_views import authenticate_request, not_modified, set_game_etag
+from .cards_catalog import get_catalog
+from .models import CardPlayedInRound, Game, GameRound, Player, PlayerHand
+from .pagination import GAME_ROUNDS_KEYSET, GAMES_KEYSET, KeysetPagination, filter_games, set_next_link
+from .renderers import FastJSONRenderer
+from .serializers import (
+    CardPlayedInRoundSerializerGet,
+    CardSerializerGet,
+    GameRoundSerializerGet,
+    GameSerializerGet,
+    card_format_context,
+)
+from .views_logic import get_cards_to_play
+
+# serializing and rendering stays sync, it runs here so that the event loop is not blocked and at most this many
+# responses are rendered at the same time; it never touches the database, so every query goes through the async ORM
+RENDER_EXECUTOR = ThreadPoolExecutor(max_workers=settings.ASYNC_API_RENDER_WORKERS, thread_name_prefix="async-api")
+
+
+def render(data: Any) -> bytes:
+    rendered: bytes = FastJSONRenderer().render(data)
+    return rendered
+
+
+def serialize(
+    serializer_class: Type[serializers.BaseSerializer],
+    instance: Any,
+    many: bool = False,
+    fields: Optional[List[str]] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    kwargs: Dict[str, Any] = {"many": many, "context": context or {}}
+    if fields is not None:
+        kwargs["fields"] = fields
+    return render(serializer_class(instance, **kwargs).data)
+
+
+async def json_response(
+    sync_render: Callable[..., bytes], *args: Any, status_code: int = status.HTTP_200_OK
+) -> HttpResponse:
+    """Renders response body with sync function in bounded executor
+
+    :param sync_render: function returning rendered body, it must not touch the database
+    :param args: arguments of the function
+    :param status_code: response status
+    :return: HttpResponse object
+    """
+    content = await sync_to_async(sync_render, thread_sensitive=False, executor=RENDER_EXECUTOR)(*args)
+    # content is already rendered by the API renderer, JsonResponse would encode it again
+    return HttpResponse(  # pylint: disable=http-response-with-content-type-json
+        content, status=status_code, content_type="application/json"
+    )
+
+
+def prepare_request(request: HttpRequest) -> auth_models.User:
+    # serializers read cards from the catalog, it is loaded here so that rendering never touches the database
+    get_catalog()
+    return authenticate_request(request)
+
+
+def async_game_etag(
+    view_method: Callable[..., Awaitable[HttpResponseBase]],
+) -> Callable[..., Awaitable[HttpResponseBase]]:
+    """Async variant of game_etag
+
+    :param view_method: async GET method taking game_id and loading the game with get_game
+    :return: decorated method
+    """
+
+    @functools.wraps(view_method)
+    async def wrapper(
+        self: "AsyncBaseAPIView", request: HttpRequest, game_id: uuid.UUID, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        if "If-None-Match" in request.headers:
+            game = await self.get_game_version(game_id)
+            if not_modified(request, game):
+                return set_game_etag(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), game)
+        response = await view_method(self, request, game_id, *args, **kwargs)
+        return set_game_etag(response, self.game) if self.game is not None else response
+
+    return wrapper
+
+
+class AsyncBaseAPIView(View):
+    """Async variant of BaseAPIView for read endpoints served by ASGI server, so that waiting for the database does
+    not hold a thread. Request is authenticated with authentication classes of the API, database is read with async
+    ORM and responses are the same as responses of the sync views.
+    """
+
+    http_method_names = ["get", "options"]
+    user: auth_models.User
+    game: Optional[Game] = None
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        # handlers are async, so the view returns coroutine awaited by Django
+        return self.authenticate_and_dispatch(request, *args, **kwargs)
+
+    async def authenticate_and_dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        try:
+            self.user = await sync_to_async(prepare_request)(request)
+            response = await cast(Awaitable[HttpResponseBase], super().dispatch(request, *args, **kwargs))
+        except APIException as exc:
+            error = custom_exception_handler(exc, {"view": self, "request": request})
+            return await json_response(render, error.data, status_code=error.status_code)
+        return response
+
+    async def get_game_version(self, game_id: uuid.UUID) -> Game:
+        try:
+            return await Game.objects.only("id", "version").aget(user=self.user, id=game_id)
+        except Game.DoesNotExist as exc:
+            raise NotFound(detail=f"game {game_id} does not exist") from exc
+
+    async def get_game(self, game_id: uuid.UUID) -> Game:
+        try:
+            self.game = await Game.objects.select_related("current_round").aget(user=self.user, id=game_id)
+        except Game.DoesNotExist as exc:
+            raise NotFound(detail=f"game {game_id} does not exist") from exc
+        return self.game
+
+    async def get_player(self, player_id: uuid.UUID) -> Player:
+        try:
+            return await Player.objects.aget(user=self.user, id=player_id)
+        except Player.DoesNotExist as exc:
+            raise NotFound(detail=f"player {player_id} does not exist") from exc
+
+    async def get_player_hand(self, player_id: uuid.UUID, game: Game) -> PlayerHand:
+        try:
+            return await PlayerHand.objects.aget(player__id=player_id, game=game)
+        except PlayerHand.DoesNotExist as exc:
+            raise ValidationError(detail=f"player {player_id} does not play in this game") from exc
+
+
+class AsyncGameAPIView(AsyncBaseAPIView):
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        name = request.GET.get("name")
+        fields = GameSerializerGet.requested_fields(request.GET)
+        context = card_format_context(request.GET)
+        if name:
+            if "If-None-Match" in request.headers:
+                game_version = await Game.objects.only("id", "version").filter(user=self.user, name=name).afirst()
+                if game_version is not None and not_modified(request, game_version):
+                    return set_game_etag(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), game_version)
+            game = await GameSerializerGet.narrow(
+                Game.objects.filter(user=self.user, name=name), fields, required=("version",)
+            ).afirst()
+            if game is None:
+                raise NotFound(detail=f"game {name} does not exist")
+            return set_game_etag(await json_response(serialize, GameSerializerGet, game, False, fields, context), game)
+        pagination = KeysetPagination.from_params(request.GET, Game, GAMES_KEYSET)
+        queryset = GameSerializerGet.narrow(
+            filter_games(Game.objects.filter(user=self.user), request.GET), fields, required=GAMES_KEYSET
+        )
+        games, next_cursor = pagination.page([game async for game in pagination.paginate(queryset)])
+        return set_next_link(
+            await json_response(serialize, GameSerializerGet, games, True, fields, context), request, next_cursor
+        )
+
+
+class AsyncGameRoundAPIView(AsyncBaseAPIView):
+    @async_game_etag
+    async def get(self, request: HttpRequest, game_id: uuid.UUID) -> HttpResponseBase:
+        game = await self.get_game(game_id)
+        fields = GameRoundSerializerGet.requested_fields(request.GET)
+        pagination = KeysetPagination.from_params(request.GET, GameRound, GAME_ROUNDS_KEYSET)
+        queryset = GameRoundSerializerGet.narrow(
+            GameRound.objects.filter(game=game), fields, required=GAME_ROUNDS_KEYSET
+        )
+        game_rounds, next_cursor = pagination.page([game_round async for game_round in pagination.paginate(queryset)])
+        return set_next_link(
+            await json_response(serialize, GameRoundSerializerGet, game_rounds, True, fields), request, next_cursor
+        )
+
+
+class AsyncLatestChapterAPIView(AsyncBaseAPIView):
+    @async_game_etag
+    async def get(self, request: HttpRequest, game_id: uuid.UUID) -> HttpResponseBase:
+        game = await self.get_game(game_id)
+        latest_round = game.current_round
+        assert latest_round is not None
+        return await json_response(render, {"chapter": latest_round.chapter, "round": latest_round.round})
+
+
+class AsyncCardPlayedInRoundAPIView(AsyncBaseAPIView):
+    @async_game_etag
+    async def get(self, request: HttpRequest, game_id: uuid.UUID, player_id: uuid.UUID) -> HttpResponseBase:
+        game = await self.get_game(game_id)
+        player = await self.get_player(player_id)
+        await self.get_player_hand(player_id, game)
+        filters: Dict[str, Any] = {"game_round__game": game, "player": player}
+        for param in ("chapter", "round"):
+            if request.GET.get(param):
+                try:
+                    filters[f"game_round__{param}"] = int(request.GET[param])
+                except ValueError as exc:
+                    raise ValidationError(detail=f"{param} must be an integer") from exc
+        fields = CardPlayedInRoundSerializerGet.requested_fields(request.GET)
+        context = card_format_context(request.GET)
+        cards_played_in_round = [
+            card
+            async for card in CardPlayedInRoundSerializerGet.narrow(CardPlayedInRound.objects.filter(**filters), fields)
+        ]
+        return await json_response(
+            serialize, CardPlayedInRoundSerializerGet, cards_played_in_round, True, fields, context
+        )
+
+
+class AsyncCardsAbleToPlayInRoundAPIView(AsyncBaseAPIView):
+    @async_game_etag
+    async def get(self, request: HttpRequest, game_id: uuid.UUID, player_id: uuid.UUID) -> HttpResponseBase:
+        game = await self.get_game(game_id)
+        player_hand = await self.get_player_hand(player_id, game)
+        context = card_format_context(request.GET)
+        return await json_response(
+            serialize, CardSerializerGet, get_cards_to_play(game, player_hand), True, None, context
+        )
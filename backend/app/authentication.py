@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth import models as auth_models
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Field
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# fields of users built from tokens, in order of values passed to Model.from_db, other fields are deferred and read
+# from the database only when accessed
+TOKEN_USER_FIELDS = ("id", "username", "is_active")
+
+# user id -> (monotonic time the row is checked again, primary key, username, is_active, md5 of password hash)
+_checked_users: "OrderedDict[Any, Tuple[float, Any, str, bool, str]]" = OrderedDict()
+_checked_users_lock = threading.Lock()
+
+
+def check_user(user_id: Any) -> Tuple[Any, str, bool, str]:
+    """Returns revocation relevant fields of user, read from the database at most once per
+    ``API_AUTH_USER_CHECK_SECONDS``
+
+    :param user_id: id of user from token claims
+    :return: primary key, username, is_active and md5 of password hash
+    :raises InvalidToken: if user id is not valid
+    :raises AuthenticationFailed: if user does not exist
+    """
+    # claims hold ids as strings
+    user_id_field = get_user_model()._meta.get_field(api_settings.USER_ID_FIELD)
+    assert isinstance(user_id_field, Field)
+    try:
+        user_id = user_id_field.to_python(user_id)
+    except ValidationError as exc:
+        raise InvalidToken("Token contained no recognizable user identification") from exc
+    now = time.monotonic()
+    check_seconds = settings.API_AUTH_USER_CHECK_SECONDS
+    with _checked_users_lock:
+        checked = _checked_users.get(user_id)
+        if check_seconds > 0 and checked is not None and checked[0] > now:
+            return checked[1:]
+    try:
+        user = (
+            get_user_model()
+            .objects.only("id", "username", "is_active", "password")
+            .get(**{api_settings.USER_ID_FIELD: user_id})
+        )
+    except get_user_model().DoesNotExist as exc:
+        raise AuthenticationFailed("User not found", code="user_not_found") from exc
+    fields = (user.pk, user.username, user.is_active, get_md5_hash_password(user.password))
+    if check_seconds > 0:
+        with _checked_users_lock:
+            _checked_users.pop(user_id, None)
+            _checked_users[user_id] = (now + check_seconds, *fields)
+            # entries are added in order of their expiry, so expired ones are at the front
+            while _checked_users and next(iter(_checked_users.values()))[0] <= now:
+                _checked_users.popitem(last=False)
+    return fields
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that does not read the user row on every request. The user is built from the user id
+    claim of the verified token, while deletion, deactivation and, with ``CHECK_REVOKE_TOKEN``, password changes are
+    checked against a row read at most once per ``API_AUTH_USER_CHECK_SECONDS`` by this worker. Changes of users
+    saved by this worker are seen at once, other workers see them when their check expires.
+
+    The user is a User object with only ``TOKEN_USER_FIELDS`` loaded, so it can be used in queries like a user read
+    from the database.
+    """
+
+    def get_user(self, validated_token: Token) -> auth_models.User:  # type: ignore[override]
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
+        pk, username, is_active, password_hash = check_user(user_id)
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return get_user_model().from_db(DEFAULT_DB_ALIAS, TOKEN_USER_FIELDS, (pk, username, is_active))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_checked_user(instance: Optional[auth_models.User] = None, **kwargs: Any) -> None:
+    """Drops checked user when the user is changed or deleted, so this worker stops accepting tokens of deactivated
+    users at once
+
+    :param instance: changed user
+    :param kwargs: signal arguments
+    """
+    if instance is not None:
+        with _checked_users_lock:
+            _checked_users.pop(getattr(instance, api_settings.USER_ID_FIELD), None)
+
+
+def clear_checked_users() -> None:
+    with _checked_users_lock:
+        _checked_users.clear()
@@ -0,0 +1,675 @@
+import gzip
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth import models as auth_models
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import URLPattern, URLResolver, resolve
+from rest_framework.authentication import BaseAuthentication, SessionAuthentication
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import urls as app_urls
+from .api_views_logic import prepare_new_game
+from .authentication import CachedJWTAuthentication, clear_checked_users
+from .cards_catalog import get_catalog
+from .lookup_cache import lookup_cache
+from .models import CardPlayedInRound, CardsPlayedFaceDown, Game, GameRound, Player, PlayerHand
+from .renderers import FastJSONRenderer
+
+
+@dataclass(frozen=True)
+class BenchmarkSize:
+    number_of_players: int
+    chapters: int
+    rounds: int
+    games: int = 1
+
+
+SMALL = BenchmarkSize(number_of_players=2, chapters=1, rounds=2)
+LARGE = BenchmarkSize(number_of_players=4, chapters=10, rounds=15, games=5)
+
+
+@dataclass(frozen=True)
+class SeededGame:
+    user: auth_models.User
+    password: str
+    game: Game
+    players: List[Player]
+    size: BenchmarkSize
+
+
+@dataclass(frozen=True)
+class BenchmarkRoute:
+    """Request sent to one route during benchmark.
+
+    ``path`` is formatted with ``game``, ``player``, ``chapter`` and ``round`` of the seeded game. ``prepare`` brings
+    the seeded game to the state the request needs (it runs inside the same rolled back transaction) and returns the
+    request data. ``budget`` is the largest number of queries the request may run, including session and user lookups.
+    """
+
+    name: str
+    method: str
+    path: str
+    budget: int
+    prepare: Callable[[SeededGame], Dict[str, Any]] = field(default=lambda seeded: {})
+    # known N+1, query count is allowed to grow with data size
+    scales_with_data: bool = False
+    content_type: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RouteMeasurement:
+    route: BenchmarkRoute
+    size: BenchmarkSize
+    status_code: int
+    queries: int
+    sql_time: float
+    wall_time: float
+
+
+@dataclass(frozen=True)
+class RenderMeasurement:
+    route: BenchmarkRoute
+    size: BenchmarkSize
+    renderer: str
+    body_bytes: int
+    gzip_bytes: int
+    cpu_time: float
+
+
+@dataclass(frozen=True)
+class AuthMeasurement:
+    authenticator: str
+    # queries of the first request, before anything is cached
+    first_queries: int
+    # average of following requests
+    queries: float
+    wall_time: float
+
+
+@dataclass(frozen=True)
+class SessionMeasurement:
+    route: BenchmarkRoute
+    engine: str
+    save_every_request: bool
+    queries: int
+    session_queries: int
+    # whether the response sent the session cookie again
+    sets_cookie: bool
+
+
+@dataclass
+class QueryRecorder:
+    """Database execute wrapper counting queries and time spent in the database"""
+
+    queries: int = 0
+    sql_time: float = 0.0
+    session_queries: int = 0
+
+    def __call__(self, execute: Callable[..., Any], sql: str, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, *args)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            if "django_session" in sql:
+                self.session_queries += 1
+
+
+def seed_game(user: auth_models.User, password: str, size: BenchmarkSize) -> SeededGame:
+    """Creates games of given size for user. Every player played in every round of every chapter except the current
+    (last) round and has one revealed card. Only the last game is seeded with rounds, other games only grow games list.
+
+    :param user: owner of the games
+    :param password: password of the user, used by login routes
+    :param size: size of the seeded data
+    :return: SeededGame object
+    """
+    catalog = get_catalog()
+    players = [Player.objects.create(nick=f"player {number}", user=user) for number in range(size.number_of_players)]
+    for number in range(size.games):
+        with transaction.atomic():
+            game = Game.objects.create(name=f"game {number}", user=user)
+            game.players.set(players)
+            prepare_new_game(game)
+    deck = catalog.cards_in(game.cards_not_played)
+    rounds = size.rounds
+    plays = []
+    for chapter in range(1, size.chapters + 1):
+        for round_number in range(1, size.rounds + 1):
+            game_round = (
+                game.current_round
+                if (chapter, round_number) == (1, 1)
+                else GameRound.objects.create(game=game, chapter=chapter, round=round_number)
+            )
+            if (chapter, round_number) == (size.chapters, size.rounds):
+                break
+            plays.append(CardPlayedInRound(player=players[0], game_round=game_round, card_face_up=deck[round_number]))
+            plays.extend(
+                CardPlayedInRound(
+                    player=player, game_round=game_round, number_of_cards_face_down=CardsPlayedFaceDown.ONE
+                )
+                for player in players[1:]
+            )
+    CardPlayedInRound.objects.bulk_create(plays)
+    played_mask = catalog.mask(deck[1:rounds])
+    for number, player in enumerate(players):
+        PlayerHand.objects.filter(game=game, player=player).update(cards=catalog.bit(deck[-1 - number]))
+        played_mask |= catalog.bit(deck[-1 - number])
+    game.cards_not_played &= ~played_mask
+    game.save(update_fields=["cards_not_played"])
+    return SeededGame(user=user, password=password, game=game, players=players, size=size)
+
+
+def _not_played(seeded: SeededGame, index: int = 0) -> str:
+    game = Game.objects.get(id=seeded.game.id)
+    return str(get_catalog().cards_in(game.cards_not_played)[index].id)
+
+
+def _revealed(seeded: SeededGame) -> str:
+    player_hand = PlayerHand.objects.get(game=seeded.game, player=seeded.players[0])
+    return str(get_catalog().cards_in(player_hand.cards)[0].id)
+
+
+def _played_face_up_by_other_player(seeded: SeededGame) -> str:
+    card_id = _not_played(seeded)
+    game = Game.objects.get(id=seeded.game.id)
+    assert game.current_round is not None
+    CardPlayedInRound.objects.create(player=seeded.players[1], game_round=game.current_round, card_face_up_id=card_id)
+    return card_id
+
+
+def _play_current_round(seeded: SeededGame) -> Dict[str, Any]:
+    game = Game.objects.get(id=seeded.game.id)
+    CardPlayedInRound.objects.bulk_create(
+        CardPlayedInRound(
+            player=player, game_round=game.current_round, number_of_cards_face_down=CardsPlayedFaceDown.ONE
+        )
+        for player in seeded.players
+    )
+    return {}
+
+
+def _empty_hands(seeded: SeededGame) -> Dict[str, Any]:
+    PlayerHand.objects.filter(game=seeded.game).update(number_of_cards=0)
+    return _play_current_round(seeded)
+
+
+def _submit_round(seeded: SeededGame) -> Dict[str, Any]:
+    revealed, played = _not_played(seeded, 0), _not_played(seeded, 1)
+    players = [str(player.id) for player in seeded.players]
+    return {
+        "reveals": [{"player": players[0], "card": revealed}],
+        "plays": [{"player": players[0], "card_face_up": played}]
+        + [{"player": player, "number_of_cards_face_down": 1} for player in players[1:]],
+        "retrieves": [{"player": players[1], "card": played}],
+        "advance": True,
+    }
+
+
+def _credentials(seeded: SeededGame) -> Dict[str, Any]:
+    return {"username": seeded.user.username, "password": seeded.password}
+
+
+GAME = "/api/games/{game}"
+HAND = "/api/games/{game}/players/{player}/hand"
+ASYNC_GAME = "/api/async/games/{game}"
+ASYNC_HAND = "/api/async/games/{game}/players/{player}/hand"
+ACTION = "/game/{game}/{chapter}/{round}/{player}"
+
+ROUTES: Sequence[BenchmarkRoute] = (
+    BenchmarkRoute("api csrf", "get", "/api/csrf/", 0),
+    BenchmarkRoute(
+        "api register", "post", "/api/register/", 12, lambda seeded: {"username": "new", "password": "new password"}
+    ),
+    BenchmarkRoute("api login", "post", "/api/login/", 7, _credentials),
+    BenchmarkRoute("api logout", "post", "/api/logout/", 4),
+    BenchmarkRoute("api me", "get", "/api/me/", 2),
+    BenchmarkRoute("api token", "post", "/api/token/", 1, _credentials),
+    BenchmarkRoute(
+        "api token refresh",
+        "post",
+        "/api/token/refresh/",
+        1,
+        lambda seeded: {"refresh": str(RefreshToken.for_user(seeded.user))},
+    ),
+    BenchmarkRoute("api cards", "get", "/api/cards/", 2),
+    BenchmarkRoute("api players", "get", "/api/players/", 3),
+    BenchmarkRoute("api player create", "post", "/api/players/", 4, lambda seeded: {"nick": "new"}),
+    BenchmarkRoute("api games", "get", "/api/games/", 4),
+    BenchmarkRoute(
+        "api game create",
+        "post",
+        "/api/games/",
+        22,
+        lambda seeded: {"name": "new", "players": [str(player.id) for player in seeded.players]},
+        # every player id in the request is validated with a separate query
+        scales_with_data=True,
+    ),
+    BenchmarkRoute("api game state", "get", GAME + "/state", 5),
+    BenchmarkRoute("api game inference", "get", GAME + "/inference", 6),
+    # state is read when the stream is consumed, the request only checks the game
+    BenchmarkRoute("api game events", "get", GAME + "/events", 3),
+    BenchmarkRoute("api game rounds", "get", GAME + "/game_rounds", 4),
+    BenchmarkRoute("api round create", "post", GAME + "/rounds/create", 11, _play_current_round),
+    BenchmarkRoute(
+        "api round submit", "post", GAME + "/rounds/submit", 18, _submit_round, content_type="application/json"
+    ),
+    BenchmarkRoute("api chapter create", "post", GAME + "/chapters/create", 11, _empty_hands),
+    BenchmarkRoute("api latest chapter", "get", GAME + "/chapters/latest", 3),
+    BenchmarkRoute("api chapter history", "get", GAME + "/chapters/{chapter}/history", 4),
+    BenchmarkRoute("api cards played", "get", HAND + "/play", 6),
+    BenchmarkRoute("api play card", "post", HAND + "/play", 14, lambda seeded: {"card_face_up": _not_played(seeded)}),
+    BenchmarkRoute("api cards able to play", "get", HAND + "/play/cards", 4),
+    BenchmarkRoute("api add cards", "post", HAND + "/add", 10, lambda seeded: {"number_of_cards": 1}),
+    BenchmarkRoute(
+        "api retrieve card",
+        "post",
+        HAND + "/retrieve",
+        13,
+        lambda seeded: {"id": _played_face_up_by_other_player(seeded)},
+    ),
+    BenchmarkRoute("api reveal card", "post", HAND + "/reveal", 11, lambda seeded: {"id": _not_played(seeded)}),
+    BenchmarkRoute("api unreveal card", "post", HAND + "/unreveal", 11, lambda seeded: {"id": _revealed(seeded)}),
+    BenchmarkRoute("api async games", "get", "/api/async/games/", 4),
+    BenchmarkRoute("api async game rounds", "get", ASYNC_GAME + "/game_rounds", 4),
+    BenchmarkRoute("api async latest chapter", "get", ASYNC_GAME + "/chapters/latest", 3),
+    BenchmarkRoute("api async cards played", "get", ASYNC_HAND + "/play", 6),
+    BenchmarkRoute("api async cards able to play", "get", ASYNC_HAND + "/play/cards", 4),
+    BenchmarkRoute("menu", "get", "/", 0),
+    BenchmarkRoute("register", "get", "/register/", 0),
+    BenchmarkRoute("login", "get", "/login/", 0),
+    BenchmarkRoute("logout", "get", "/logout/", 4),
+    BenchmarkRoute("user menu", "get", "/user_menu/", 2),
+    BenchmarkRoute("new game", "get", "/new_game/", 3),
+    BenchmarkRoute(
+        "new game create",
+        "post",
+        "/new_game/",
+        17,
+        lambda seeded: {"name": "new", "players": [str(player.id) for player in seeded.players]},
+    ),
+    BenchmarkRoute("new player", "get", "/new_player/", 2),
+    BenchmarkRoute("new player create", "post", "/new_player/", 4, lambda seeded: {"nick": "new"}),
+    BenchmarkRoute("players", "get", "/players/", 3),
+    BenchmarkRoute("games", "get", "/games/", 4),
+    BenchmarkRoute("current game", "get", "/game/{game}/{chapter}/{round}", 11),
+    BenchmarkRoute(
+        "current game new round",
+        "post",
+        "/game/{game}/{chapter}/{round}",
+        14,
+        lambda seeded: {"submit_type": "new_round", **_play_current_round(seeded)},
+    ),
+    BenchmarkRoute(
+        "current game new chapter",
+        "post",
+        "/game/{game}/{chapter}/{round}",
+        17,
+        lambda seeded: {"submit_type": "new_chapter", **_play_current_round(seeded)},
+    ),
+    BenchmarkRoute(
+        "current game new action",
+        "post",
+        "/game/{game}/{chapter}/{round}",
+        8,
+        lambda seeded: {"submit_type": "new_action", "player": str(seeded.players[0].id)},
+    ),
+    BenchmarkRoute("new action", "get", ACTION, 10),
+    BenchmarkRoute(
+        "new action play card",
+        "post",
+        ACTION,
+        20,
+        lambda seeded: {
+            "submit_type": "card_played",
+            "card_face_up": _not_played(seeded),
+            "number_of_cards_face_down": 0,
+        },
+    ),
+    BenchmarkRoute(
+        "new action retrieve card",
+        "post",
+        ACTION,
+        21,
+        lambda seeded: {"submit_type": "card_retrieved", "card": _played_face_up_by_other_player(seeded)},
+    ),
+    BenchmarkRoute(
+        "new action add cards",
+        "post",
+        ACTION,
+        17,
+        lambda seeded: {"submit_type": "number_of_cards_added", "number_of_cards": 1},
+    ),
+    BenchmarkRoute(
+        "new action reveal card",
+        "post",
+        ACTION,
+        18,
+        lambda seeded: {"submit_type": "reveal_card", "card": _not_played(seeded)},
+    ),
+    BenchmarkRoute(
+        "new action unreveal card",
+        "post",
+        ACTION,
+        18,
+        lambda seeded: {"submit_type": "unreveal_card", "card": _revealed(seeded)},
+    ),
+)
+
+
+def measure_route(client: Client, route: BenchmarkRoute, seeded: SeededGame) -> RouteMeasurement:
+    """Sends route request for seeded game and measures it with cold lookup cache. All changes made by the request
+    are rolled back.
+
+    :param client: test client
+    :param route: BenchmarkRoute object
+    :param seeded: SeededGame object
+    :return: RouteMeasurement object
+    """
+    lookup_cache.clear()
+    with transaction.atomic():
+        client.force_login(seeded.user)
+        data = route.prepare(seeded)
+        path = route.path.format(
+            game=seeded.game.id, player=seeded.players[0].id, chapter=seeded.size.chapters, round=seeded.size.rounds
+        )
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            start = time.perf_counter()
+            if route.method == "get":
+                response = client.get(path, data)
+            elif route.content_type is not None:
+                response = client.post(path, data, content_type=route.content_type)
+            else:
+                response = client.post(path, data)
+            wall_time = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return RouteMeasurement(
+        route=route,
+        size=seeded.size,
+        status_code=response.status_code,
+        queries=recorder.queries,
+        sql_time=recorder.sql_time,
+        wall_time=wall_time,
+    )
+
+
+def measure_routes(
+    client: Client, seeded: SeededGame, routes: Optional[Sequence[BenchmarkRoute]] = None
+) -> List[RouteMeasurement]:
+    """Measures every benchmark route for seeded game
+
+    :param client: test client
+    :param seeded: SeededGame object
+    :param routes: routes to measure, all routes if not given
+    :return: List of RouteMeasurement objects
+    """
+    return [measure_route(client, route, seeded) for route in (routes if routes is not None else ROUTES)]
+
+
+RENDERERS: Dict[str, type[BaseRenderer]] = {"drf json": JSONRenderer, "fast json": FastJSONRenderer}
+# routes with the largest bodies, rendering is measured for them
+RENDER_ROUTES: Sequence[str] = ("api games", "api game state", "api cards played", "api cards able to play")
+
+
+def measure_rendering(
+    client: Client, seeded: SeededGame, route_names: Sequence[str] = RENDER_ROUTES, repeat: int = 20
+) -> List[RenderMeasurement]:
+    """Renders response data of routes with every renderer and measures size of body, size of gzipped body and CPU
+    time of rendering one response
+
+    :param client: test client
+    :param seeded: SeededGame object
+    :param route_names: names of GET routes of DRF views
+    :param repeat: times every body is rendered, CPU time is averaged
+    :return: List of RenderMeasurement objects
+    """
+    measurements = []
+    for route in (route for route in ROUTES if route.name in route_names):
+        client.force_login(seeded.user)
+        path = route.path.format(
+            game=seeded.game.id, player=seeded.players[0].id, chapter=seeded.size.chapters, round=seeded.size.rounds
+        )
+        response = client.get(path)
+        assert isinstance(response, Response)
+        data = response.data
+        for renderer_name, renderer_class in RENDERERS.items():
+            renderer = renderer_class()
+            start = time.process_time()
+            for _ in range(repeat):
+                body = renderer.render(data, "application/json", {})
+            cpu_time = (time.process_time() - start) / repeat
+            measurements.append(
+                RenderMeasurement(
+                    route=route,
+                    size=seeded.size,
+                    renderer=renderer_name,
+                    body_bytes=len(body),
+                    gzip_bytes=len(gzip.compress(body)),
+                    cpu_time=cpu_time,
+                )
+            )
+    return measurements
+
+
+AUTHENTICATORS: Dict[str, type[BaseAuthentication]] = {
+    "session": SessionAuthentication,
+    "jwt": JWTAuthentication,
+    "cached jwt": CachedJWTAuthentication,
+}
+
+
+def authenticated_request(seeded: SeededGame) -> Callable[[], HttpRequest]:
+    """Returns factory of requests carrying both a session cookie and an access token of the seeded user, each
+    authentication class reads its own credentials
+
+    :param seeded: SeededGame object
+    :return: function creating new request with session and lazy user set up by middlewares
+    """
+    client = Client()
+    client.force_login(seeded.user)
+    session_key = client.cookies[settings.SESSION_COOKIE_NAME].value
+    token = str(RefreshToken.for_user(seeded.user).access_token)
+    factory = RequestFactory()
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    def create() -> HttpRequest:
+        request = factory.get("/api/games/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+        SessionMiddleware(get_response).process_request(request)
+        AuthenticationMiddleware(get_response).process_request(request)
+        return request
+
+    return create
+
+
+def measure_authentication(seeded: SeededGame, repeat: int = 20) -> List[AuthMeasurement]:
+    """Authenticates requests of seeded user with every authentication class and measures queries and time it adds to
+    one request
+
+    :param seeded: SeededGame object
+    :param repeat: requests authenticated after the first one, queries and time are averaged
+    :return: List of AuthMeasurement objects
+    """
+    create_request = authenticated_request(seeded)
+    measurements = []
+    for name, authentication_class in AUTHENTICATORS.items():
+        clear_checked_users()
+        recorders = []
+        wall_time = 0.0
+        for number in range(repeat + 1):
+            request = create_request()
+            recorder = QueryRecorder()
+            start = time.perf_counter()
+            with connection.execute_wrapper(recorder):
+                user = Request(request, authenticators=[authentication_class()]).user
+            if number:
+                wall_time += time.perf_counter() - start
+            assert user.pk == seeded.user.pk
+            recorders.append(recorder)
+        measurements.append(
+            AuthMeasurement(
+                authenticator=name,
+                first_queries=recorders[0].queries,
+                queries=sum(recorder.queries for recorder in recorders[1:]) / repeat,
+                wall_time=wall_time / repeat,
+            )
+        )
+    return measurements
+
+
+# session authenticated routes of the API and pages of the web UI, session cost is measured for them
+SESSION_ROUTES: Sequence[str] = ("api me", "api games", "current game")
+
+
+def measure_sessions(
+    seeded: SeededGame, route_names: Sequence[str] = SESSION_ROUTES, save_every_request: bool = False
+) -> List[SessionMeasurement]:
+    """Sends routes with a logged in session kept by every engine of ``SESSION_ENGINES`` and counts queries, queries
+    of the session table and session cookies sent back. Every route is requested twice and the second request is
+    measured, so cached sessions are warm.
+
+    :param seeded: SeededGame object
+    :param route_names: names of GET routes
+    :param save_every_request: value of SESSION_SAVE_EVERY_REQUEST
+    :return: List of SessionMeasurement objects
+    """
+    measurements = []
+    for engine_name, engine in settings.SESSION_ENGINES.items():
+        with override_settings(SESSION_ENGINE=engine, SESSION_SAVE_EVERY_REQUEST=save_every_request):
+            client = Client()
+            client.force_login(seeded.user)
+            for route in (route for route in ROUTES if route.name in route_names):
+                lookup_cache.clear()
+                path = route.path.format(
+                    game=seeded.game.id,
+                    player=seeded.players[0].id,
+                    chapter=seeded.size.chapters,
+                    round=seeded.size.rounds,
+                )
+                client.get(path)
+                recorder = QueryRecorder()
+                with connection.execute_wrapper(recorder):
+                    response = client.get(path)
+                assert response.status_code == 200, (route.name, engine_name, response.status_code)
+                measurements.append(
+                    SessionMeasurement(
+                        route=route,
+                        engine=engine_name,
+                        save_every_request=save_every_request,
+                        queries=recorder.queries,
+                        session_queries=recorder.session_queries,
+                        sets_cookie=settings.SESSION_COOKIE_NAME in response.cookies,
+                    )
+                )
+    return measurements
+
+
+def app_routes() -> List[str]:
+    """Returns patterns of every route of the app, the same way they are reported by ``resolve(path).route``
+
+    :return: List of route patterns
+    """
+
+    def collect(patterns: Sequence[Any], prefix: str) -> List[str]:
+        routes = []
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                routes.extend(collect(pattern.url_patterns, prefix + str(pattern.pattern)))
+            elif isinstance(pattern, URLPattern):
+                routes.append(prefix + str(pattern.pattern))
+        return routes
+
+    return collect(app_urls.urlpatterns, "")
+
+
+def covered_routes(seeded: SeededGame) -> List[str]:
+    """Returns patterns of routes requested by benchmark
+
+    :param seeded: SeededGame object
+    :return: List of route patterns
+    """
+    return [
+        resolve(route.path.format(game=seeded.game.id, player=seeded.players[0].id, chapter=1, round=1)).route
+        for route in ROUTES
+    ]
+
+
+def format_report(measurements: Sequence[RouteMeasurement]) -> str:
+    """Formats measurements as a table
+
+    :param measurements: RouteMeasurement objects
+    :return: report
+    """
+    lines = [f"{'route':<30} {'size':<12} {'status':>6} {'queries':>7} {'budget':>6} {'sql ms':>8} {'wall ms':>8}"]
+    for measurement in measurements:
+        size = measurement.size
+        lines.append(
+            f"{measurement.route.name:<30} "
+            f"{f'{size.number_of_players}p {size.chapters}x{size.rounds}':<12} "
+            f"{measurement.status_code:>6} {measurement.queries:>7} {measurement.route.budget:>6} "
+            f"{measurement.sql_time * 1000:>8.2f} {measurement.wall_time * 1000:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_rendering_report(measurements: Sequence[RenderMeasurement]) -> str:
+    """Formats rendering measurements as a table
+
+    :param measurements: RenderMeasurement objects
+    :return: report
+    """
+    lines = [f"{'route':<30} {'size':<12} {'renderer':<10} {'bytes':>8} {'gzip':>8} {'cpu us':>8}"]
+    for measurement in measurements:
+        size = measurement.size
+        lines.append(
+            f"{measurement.route.name:<30} "
+            f"{f'{size.number_of_players}p {size.chapters}x{size.rounds}':<12} "
+            f"{measurement.renderer:<10} {measurement.body_bytes:>8} {measurement.gzip_bytes:>8} "
+            f"{measurement.cpu_time * 1_000_000:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_authentication_report(measurements: Sequence[AuthMeasurement]) -> str:
+    """Formats authentication measurements as a table
+
+    :param measurements: AuthMeasurement objects
+    :return: report
+    """
+    lines = [f"{'authentication':<16} {'first queries':>13} {'queries':>7} {'us':>8}"]
+    for measurement in measurements:
+        lines.append(
+            f"{measurement.authenticator:<16} {measurement.first_queries:>13} {measurement.queries:>7.1f} "
+            f"{measurement.wall_time * 1_000_000:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_sessions_report(measurements: Sequence[SessionMeasurement]) -> str:
+    """Formats session measurements as a table
+
+    :param measurements: SessionMeasurement objects
+    :return: report
+    """
+    lines = [f"{'route':<30} {'engine':<16} {'save every':>10} {'queries':>7} {'session':>7} {'cookie':>6}"]
+    for measurement in measurements:
+        lines.append(
+            f"{measurement.route.name:<30} {measurement.engine:<16} {str(measurement.save_every_request):>10} "
+            f"{measurement.queries:>7} {measurement.session_queries:>7} {str(measurement.sets_cookie):>6}"
+        )
+    return "\n".join(lines)
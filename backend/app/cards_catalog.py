@@ -0,0 +1,227 @@
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Card, CardNumber, CardSuit
+
+CARD_NUMBER_RANKS: Mapping[str, int] = MappingProxyType(
+    {number: rank for rank, number in enumerate(CardNumber.values, start=1)}
+)
+CARD_SUIT_INDEXES: Mapping[str, int] = MappingProxyType({suit: index for index, suit in enumerate(CardSuit.values)})
+ALL_CARDS_MASK = (1 << (len(CardSuit.values) * len(CardNumber.values))) - 1
+CARD_CODE_SUIT_LENGTH = 3
+
+
+def card_position(suit: str, number: str) -> int:
+    """Returns stable position of a card in the suit and number order, used as its bit in card sets
+
+    :param suit: card suit
+    :param number: card number
+    :return: position from 0 to 27
+    """
+    return CARD_SUIT_INDEXES[suit] * len(CARD_NUMBER_RANKS) + CARD_NUMBER_RANKS[number] - 1
+
+
+def card_code(suit: str, number: str) -> str:
+    """Returns compact code of a card sent instead of its id when clients ask for it, made of the first letters of the
+    suit and the rank of the number, e.g. ``AGG5`` for the five of aggression
+
+    :param suit: card suit
+    :param number: card number
+    :return: four characters code
+    """
+    return f"{suit[:CARD_CODE_SUIT_LENGTH]}{CARD_NUMBER_RANKS[number]}"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    card: Card
+    rank: int
+    image: str
+    bit: int
+    code: str
+
+
+class CardCatalog:
+    """Immutable, in-memory view of the card table.
+
+    Cards never change after the initial data is loaded, so one catalog is built per worker and every card lookup,
+    validation and ordering is answered from it instead of the database. Sets of cards (deck, hands) are stored as
+    integers with one bit per card, see ``mask``, ``cards_in`` and ``contains``.
+    """
+
+    def __init__(self, cards: Iterable[Card]) -> None:
+        entries = sorted(
+            (
+                CatalogEntry(
+                    card=card,
+                    rank=CARD_NUMBER_RANKS[card.number],
+                    image=f"{card.suit}/{card.number}.jpg",
+                    bit=1 << card_position(card.suit, card.number),
+                    code=card_code(card.suit, card.number),
+                )
+                for card in cards
+            ),
+            key=lambda entry: entry.bit,
+        )
+        self._entries: Tuple[CatalogEntry, ...] = tuple(entries)
+        self._by_id: Mapping[uuid.UUID, CatalogEntry] = MappingProxyType({entry.card.id: entry for entry in entries})
+        self._by_suit_number: Mapping[Tuple[str, str], CatalogEntry] = MappingProxyType(
+            {(entry.card.suit, entry.card.number): entry for entry in entries}
+        )
+        self._by_code: Mapping[str, CatalogEntry] = MappingProxyType({entry.code: entry for entry in entries})
+
+    @property
+    def cards(self) -> List[Card]:
+        return [entry.card for entry in self._entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, card_id: Any) -> Optional[Card]:
+        """Returns card with given id or code or None if there is no such card
+
+        :param card_id: card id as UUID or string, or card code
+        :return: Card object or None
+        """
+        entry = self._by_code.get(card_id) if isinstance(card_id, str) else None
+        if entry is None:
+            card_uuid = self._to_uuid(card_id)
+            entry = self._by_id.get(card_uuid) if card_uuid is not None else None
+        return entry.card if entry is not None else None
+
+    def get_by_suit_number(self, suit: str, number: str) -> Optional[Card]:
+        """Returns card with given suit and number or None if there is no such card
+
+        :param suit: card suit
+        :param number: card number
+        :return: Card object or None
+        """
+        entry = self._by_suit_number.get((suit, number))
+        return entry.card if entry is not None else None
+
+    def rank(self, card: Card) -> int:
+        return self._by_id[card.id].rank
+
+    def image(self, card: Card) -> str:
+        return self._by_id[card.id].image
+
+    def image_by_id(self, card_id: uuid.UUID) -> str:
+        return self._by_id[card_id].image
+
+    def code(self, card: Card) -> str:
+        return self._by_id[card.id].code
+
+    def code_by_id(self, card_id: uuid.UUID) -> str:
+        return self._by_id[card_id].code
+
+    def filter(self, suit: Optional[str] = None, number: Optional[str] = None) -> List[Card]:
+        """Returns cards matching given suit and number ordered by suit and number
+
+        :param suit: card suit, all suits if not given
+        :param number: card number, all numbers if not given
+        :return: List of cards
+        """
+        return [
+            entry.card
+            for entry in self._entries
+            if (suit is None or entry.card.suit == suit) and (number is None or entry.card.number == number)
+        ]
+
+    def sorted(self, cards: Iterable[Card]) -> List[Card]:
+        """Orders cards by suit and number
+
+        :param cards: cards to order
+        :return: List of cards
+        """
+        return sorted(cards, key=lambda card: self._by_id[card.id].bit)
+
+    def sorted_by_ids(self, card_ids: Iterable[Optional[uuid.UUID]]) -> List[Card]:
+        """Maps card ids to cards ordered by suit and number, skipping empty and duplicated ids
+
+        :param card_ids: card ids
+        :return: List of cards
+        """
+        return self.cards_in(self.mask_by_ids(card_ids))
+
+    def bit(self, card: Card) -> int:
+        return self._by_id[card.id].bit
+
+    def bit_by_id(self, card_id: uuid.UUID) -> int:
+        return self._by_id[card_id].bit
+
+    def mask(self, cards: Iterable[Card]) -> int:
+        """Returns set of cards as bit mask
+
+        :param cards: cards in set
+        :return: bit mask
+        """
+        return self.mask_by_ids(card.id for card in cards)
+
+    def mask_by_ids(self, card_ids: Iterable[Optional[uuid.UUID]]) -> int:
+        """Returns set of cards with given ids as bit mask, skipping empty ids
+
+        :param card_ids: card ids
+        :return: bit mask
+        """
+        mask = 0
+        for card_id in card_ids:
+            if card_id is not None:
+                mask |= self._by_id[card_id].bit
+        return mask
+
+    def cards_in(self, mask: int) -> List[Card]:
+        """Returns cards from bit mask ordered by suit and number
+
+        :param mask: bit mask
+        :return: List of cards
+        """
+        return [entry.card for entry in self._entries if mask & entry.bit]
+
+    def deck_mask(self, number_of_players: int) -> int:
+        """Returns cards used in a game with given number of players as bit mask (ones and sevens are used only by
+        four players)
+
+        :param number_of_players: number of players in game
+        :return: bit mask
+        """
+        cards = self.cards
+        if number_of_players < 4:
+            cards = [card for card in cards if card.number not in (CardNumber.ONE, CardNumber.SEVEN)]
+        return self.mask(cards)
+
+    def contains(self, mask: int, card: Card) -> bool:
+        return bool(mask & self._by_id[card.id].bit)
+
+    @staticmethod
+    def _to_uuid(card_id: Any) -> Optional[uuid.UUID]:
+        if isinstance(card_id, uuid.UUID):
+            return card_id
+        try:
+            return uuid.UUID(str(card_id))
+        except ValueError:
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> CardCatalog:
+    """Returns card catalog of this worker, loading it from the database on first use
+
+    :return: CardCatalog object
+    """
+    return CardCatalog(Card.objects.all())
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def invalidate_catalog(**kwargs: Any) -> None:
+    """Drops cached catalog when card table is changed (e.g. by loaddata)
+
+    :param kwargs: signal arguments
+    """
+    get_catalog.cache_clear()
@@ -1,13 +1,42 @@
-from typing import Optional
+from typing import Any, Iterable, Optional, Set
 
 from django import forms
 from django.contrib.auth import models as auth_models
 from django.core.exceptions import ValidationError
 from django.db.models.query import QuerySet
 
+from .cards_catalog import get_catalog
 from .models import Card, CardPlayedInRound, Game, Player
 
 
+class CardChoiceField(forms.ChoiceField):
+    """Choice between given cards, resolved through the in-memory card catalog instead of a queryset."""
+
+    def __init__(self, *args: Any, cards: Iterable[Card] = (), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cards = cards
+
+    @property
+    def cards(self) -> Iterable[Card]:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: Iterable[Card]) -> None:
+        self._cards = list(cards)
+        self.choices = [("", "---------")] + [(str(card.id), str(card)) for card in self._cards]
+
+    def to_python(self, value: Any) -> Optional[Card]:
+        if value in self.empty_values:
+            return None
+        card = get_catalog().get(value)
+        if card is None:
+            raise ValidationError(self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value})
+        return card
+
+    def valid_value(self, value: Any) -> bool:
+        return value in self._cards
+
+
 class GameForm(forms.ModelForm):  # type: ignore[type-arg]
     class Meta:
         model = Game
@@ -34,25 +63,32 @@ class PlayerForm(forms.ModelForm):  # type: ignore[type-arg]
 
 
 class CardPlayedInRoundForm(forms.ModelForm):  # type: ignore[type-arg]
+    card_face_up = CardChoiceField(required=False)
+
     class Meta:
         model = CardPlayedInRound
         fields = ["card_face_up", "number_of_cards_face_down"]
 
-    def __init__(self, *args, cards: Optional[QuerySet[Card]] = None, **kwargs):  # type: ignore[no-untyped-def]
+    def __init__(self, *args, cards: Optional[Iterable[Card]] = None, **kwargs):  # type: ignore[no-untyped-def]
         super().__init__(*args, **kwargs)
 
         if cards is not None:
-            self.fields["card_face_up"].queryset = cards  # type: ignore[attr-defined]
+            self.fields["card_face_up"].cards = cards  # type: ignore[attr-defined]
+
+    def _get_validation_exclusions(self) -> Set[str]:
+        # card is already checked against the catalog, model validation would look it up in the database again
+        exclusions: Set[str] = super()._get_validation_exclusions()  # type: ignore[misc]
+        return exclusions | {"card_face_up"}
 
 
 class PlayerCardForm(forms.Form):
-    card = forms.ModelChoiceField(queryset=Card.objects.none())
+    card = CardChoiceField()
 
-    def __init__(self, *args, cards: Optional[QuerySet[Card]] = None, **kwargs):  # type: ignore[no-untyped-def]
+    def __init__(self, *args, cards: Optional[Iterable[Card]] = None, **kwargs):  # type: ignore[no-untyped-def]
         super().__init__(*args, **kwargs)
 
         if cards is not None:
-            self.fields["card"].queryset = cards  # type: ignore[attr-defined]
+            self.fields["card"].cards = cards  # type: ignore[attr-defined]
 
 
 class NumberOfCardsAddedForm(forms.Form):
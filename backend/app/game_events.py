@@ -0,0 +1,199 @@
+import copy
+import functools
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from .cards_catalog import ALL_CARDS_MASK, get_catalog
+from .game_updates import publish_events
+from .lookup_cache import lookup_cache
+from .models import Card, CardPlayedInRound, Game, GameEvent, GameEventKind, GameSnapshot, PlayerHand
+
+# every SNAPSHOT_INTERVAL events folded state is stored, so replay never needs more than this many events
+SNAPSHOT_INTERVAL = 32
+CACHED_STATES = 256
+
+GameState = Dict[str, Any]
+
+_cached_states: "OrderedDict[uuid.UUID, Tuple[int, GameState]]" = OrderedDict()
+_cached_states_lock = threading.Lock()
+
+
+def build_game_state(game: Game) -> GameState:
+    """Reads current game state from game tables. It is used as the first snapshot of the event log.
+
+    :param game: Game object
+    :return: Dictionary with game state
+    """
+    latest_round = game.current_round
+    assert latest_round is not None
+    return {
+        "chapter": latest_round.chapter,
+        "round": latest_round.round,
+        "cards_not_played": game.cards_not_played,
+        "hands": {
+            str(player_id): {"cards": cards, "number_of_cards": number_of_cards}
+            for player_id, cards, number_of_cards in PlayerHand.objects.filter(game=game).values_list(
+                "player_id", "cards", "number_of_cards"
+            )
+        },
+        "cards_played_in_round": [
+            {
+                "player": str(player_id),
+                "card_face_up": str(card_face_up_id) if card_face_up_id is not None else None,
+                "number_of_cards_face_down": number_of_cards_face_down,
+            }
+            for player_id, card_face_up_id, number_of_cards_face_down in CardPlayedInRound.objects.filter(
+                game_round=latest_round
+            ).values_list("player_id", "card_face_up_id", "number_of_cards_face_down")
+        ],
+    }
+
+
+def start_event_log(game: Game) -> None:
+    """Stores initial snapshot of new game, events recorded later are replayed on top of it
+
+    :param game: Game object
+    """
+    GameSnapshot.objects.create(game=game, sequence=0, state=build_game_state(game))
+
+
+def record_event(
+    game: Game,
+    kind: GameEventKind,
+    player_id: Optional[uuid.UUID] = None,
+    card: Optional[Card] = None,
+    number_of_cards: int = 0,
+) -> GameEvent:
+    """Appends event to game event log and stores snapshot of folded state every SNAPSHOT_INTERVAL events
+
+    :param game: Game object
+    :param kind: kind of event
+    :param player_id: id of player that made the action
+    :param card: card played, revealed, unrevealed or retrieved
+    :param number_of_cards: cards played face down, cards added or cards dealt
+    :return: GameEvent object
+    """
+    return record_events(game, [GameEvent(kind=kind, player_id=player_id, card=card, number_of_cards=number_of_cards)])[
+        0
+    ]
+
+
+def record_events(game: Game, events: List[GameEvent]) -> List[GameEvent]:
+    """Appends events to game event log with one insert and bumps game version. Every change of game state is
+    recorded here, so the version changes whenever any game resource does and cached lookups of the game are
+    dropped. The version counts recorded events and sequences of new events are taken from it: it is bumped first
+    with an update relative to the stored value, which locks the game row until the transaction ends, so concurrent
+    changes of the game get consecutive sequences instead of racing for the same one. Snapshot of folded state is
+    stored when events pass a multiple of SNAPSHOT_INTERVAL. Events are published to listeners of the game once the
+    transaction commits.
+
+    :param game: Game object
+    :param events: unsaved GameEvent objects in order they happened, game and sequence are set here
+    :return: List of saved GameEvent objects
+    """
+    if not events:
+        return events
+    Game.objects.filter(id=game.id).update(version=F("version") + len(events))
+    game.version = Game.objects.values_list("version", flat=True).get(id=game.id)
+    last_sequence = game.version - len(events)
+    for sequence, event in enumerate(events, start=last_sequence + 1):
+        event.game = game
+        event.sequence = sequence
+    GameEvent.objects.bulk_create(events)
+    # dropped right away for later lookups in this transaction and again on commit for lookups that read the game
+    # before the commit
+    lookup_cache.invalidate_game(game.id)
+    transaction.on_commit(functools.partial(_events_committed, game.id, game.version, events))
+    if (last_sequence + len(events)) // SNAPSHOT_INTERVAL > last_sequence // SNAPSHOT_INTERVAL:
+        GameSnapshot.objects.create(
+            game=game, sequence=last_sequence + len(events), state=load_game_state(game, use_cache=False)
+        )
+    return events
+
+
+def _events_committed(game_id: uuid.UUID, version: int, events: List[GameEvent]) -> None:
+    lookup_cache.invalidate_game(game_id)
+    publish_events(game_id, version, events)
+
+
+def fold_event(state: GameState, event: GameEvent) -> None:
+    """Applies event to game state
+
+    :param state: game state, changed in place
+    :param event: GameEvent object
+    """
+    catalog = get_catalog()
+    bit = catalog.bit_by_id(event.card_id) if event.card_id is not None else 0
+    hand = state["hands"].get(str(event.player_id))
+    if event.kind == GameEventKind.CARD_PLAYED:
+        state["cards_not_played"] &= ALL_CARDS_MASK & ~bit
+        hand["cards"] &= ALL_CARDS_MASK & ~bit
+        hand["number_of_cards"] -= event.number_of_cards + (1 if bit else 0)
+        state["cards_played_in_round"].append(
+            {
+                "player": str(event.player_id),
+                "card_face_up": str(event.card_id) if event.card_id is not None else None,
+                "number_of_cards_face_down": event.number_of_cards,
+            }
+        )
+    elif event.kind == GameEventKind.CARD_REVEALED:
+        hand["cards"] |= bit
+        state["cards_not_played"] &= ALL_CARDS_MASK & ~bit
+    elif event.kind == GameEventKind.CARD_UNREVEALED:
+        hand["cards"] &= ALL_CARDS_MASK & ~bit
+        state["cards_not_played"] |= bit
+    elif event.kind == GameEventKind.CARD_RETRIEVED:
+        hand["cards"] |= bit
+        hand["number_of_cards"] += 1
+        state["cards_not_played"] &= ALL_CARDS_MASK & ~bit
+    elif event.kind == GameEventKind.CARDS_ADDED:
+        hand["number_of_cards"] += event.number_of_cards
+    elif event.kind == GameEventKind.CARDS_DEALT:
+        state["cards_not_played"] = catalog.deck_mask(len(state["hands"]))
+        for dealt_hand in state["hands"].values():
+            dealt_hand["cards"] = 0
+            dealt_hand["number_of_cards"] = event.number_of_cards
+    elif event.kind == GameEventKind.ROUND_CREATED:
+        state["round"] += 1
+        state["cards_played_in_round"] = []
+    elif event.kind == GameEventKind.CHAPTER_CREATED:
+        state["chapter"] += 1
+        state["round"] = 1
+        state["cards_played_in_round"] = []
+
+
+def load_game_state(game: Game, use_cache: bool = True) -> GameState:
+    """Rebuilds current game state from cached or latest stored snapshot and events recorded after it. States folded
+    inside a transaction may be rolled back, so they are not cached.
+
+    :param game: Game object
+    :param use_cache: whether to use and update folded states cached by this worker
+    :return: Dictionary with game state
+    :raises DoesNotExist: if event log of game was not started
+    """
+    cached = None
+    if use_cache:
+        with _cached_states_lock:
+            cached = _cached_states.get(game.id)
+    if cached is not None:
+        sequence, state = cached[0], copy.deepcopy(cached[1])
+    else:
+        snapshot = GameSnapshot.objects.filter(game=game).order_by("-sequence").first()
+        if snapshot is None:
+            raise GameSnapshot.DoesNotExist(f"event log of game {game.id} was not started")
+        sequence, state = snapshot.sequence, snapshot.state
+    for event in GameEvent.objects.filter(game=game, sequence__gt=sequence).order_by("sequence"):
+        fold_event(state, event)
+        sequence = event.sequence
+    if use_cache and not connection.in_atomic_block:
+        with _cached_states_lock:
+            _cached_states[game.id] = (sequence, copy.deepcopy(state))
+            _cached_states.move_to_end(game.id)
+            while len(_cached_states) > CACHED_STATES:
+                _cached_states.popitem(last=False)
+    return state
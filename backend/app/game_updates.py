@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import GameEvent
+
+# updates a listener may fall behind by before it is dropped and has to reload the state
+SUBSCRIPTION_QUEUE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class GameUpdate:
+    """Events of one committed mutation. Data is encoded once when published and sent as is to every listener."""
+
+    version: int
+    data: str
+
+
+class Subscription:
+    """Updates of one game delivered to one listener. It lives on the event loop of the listener, updates may be
+    published from any thread.
+    """
+
+    def __init__(self, game_id: uuid.UUID, loop: asyncio.AbstractEventLoop) -> None:
+        self.game_id = game_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[GameUpdate]]" = asyncio.Queue(SUBSCRIPTION_QUEUE_SIZE)
+        self.lagged = False
+
+    def put(self, update: GameUpdate) -> None:
+        """Queues update, must be called on the loop of the subscription. Listener that fell too far behind gets
+        None instead of pending updates.
+
+        :param update: GameUpdate object
+        """
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[GameUpdate]:
+        """Waits for next update
+
+        :return: GameUpdate object or None if listener fell behind and has to reload the state
+        """
+        return await self.queue.get()
+
+
+class GameUpdateBackend(ABC):
+    """Fans out updates of games to their subscribers. The default backend delivers updates within the process,
+    a backend built on a message broker can be set with ``GAME_UPDATES_BACKEND`` to reach listeners served by other
+    processes. Subscriptions are delivered to the event loop running when they are made.
+    """
+
+    @abstractmethod
+    def publish(self, game_id: uuid.UUID, update: GameUpdate) -> None:
+        """Delivers update to every subscription of the game, it may be called from any thread
+
+        :param game_id: id of game
+        :param update: GameUpdate object
+        """
+
+    @abstractmethod
+    def subscribe(self, game_id: uuid.UUID) -> Subscription:
+        """Subscribes to updates of the game, it must be called on the event loop of the listener
+
+        :param game_id: id of game
+        :return: Subscription object
+        """
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stops delivering updates to subscription
+
+        :param subscription: Subscription object
+        """
+
+
+class InProcessBackend(GameUpdateBackend):
+    def __init__(self) -> None:
+        self.subscriptions: Dict[uuid.UUID, Set[Subscription]] = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, game_id: uuid.UUID, update: GameUpdate) -> None:
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(game_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, update)
+            except RuntimeError:
+                # loop of the listener was closed without unsubscribing
+                self.unsubscribe(subscription)
+
+    def subscribe(self, game_id: uuid.UUID) -> Subscription:
+        subscription = Subscription(game_id, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions[game_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.game_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.game_id]
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> GameUpdateBackend:
+    backend: GameUpdateBackend = import_string(settings.GAME_UPDATES_BACKEND)()
+    return backend
+
+
+def event_delta(event: GameEvent) -> Dict[str, Any]:
+    """Encodes event as delta that can be applied to game state the same way the event log folds it
+
+    :param event: GameEvent object
+    :return: Dictionary with kind and only the fields the event uses
+    """
+    delta: Dict[str, Any] = {"kind": event.kind}
+    if event.player_id is not None:
+        delta["player"] = str(event.player_id)
+    if event.card_id is not None:
+        delta["card"] = str(event.card_id)
+    if event.number_of_cards:
+        delta["number_of_cards"] = event.number_of_cards
+    return delta
+
+
+def publish_events(game_id: uuid.UUID, version: int, events: List[GameEvent]) -> None:
+    """Publishes events of committed mutation to listeners of the game
+
+    :param game_id: id of game
+    :param version: game version after the mutation
+    :param events: GameEvent objects recorded by the mutation
+    """
+    data = json.dumps({"version": version, "events": [event_delta(event) for event in events]}, separators=(",", ":"))
+    get_backend().publish(game_id, GameUpdate(version=version, data=data))
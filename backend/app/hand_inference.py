@@ -0,0 +1,222 @@
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+from django.db import connection
+
+from .cards_catalog import CARD_NUMBER_RANKS, CARD_SUIT_INDEXES, get_catalog
+from .game_events import CACHED_STATES, GameState, load_game_state
+from .models import CardSuit, Game
+from .serializers import represent_card
+from .simulation import ChapterSetup, SimulationTotals
+
+# decimal places of probabilities sent to clients
+PROBABILITY_DIGITS = 4
+
+
+@dataclass(frozen=True)
+class HandInference:
+    """Probabilities of cards being in hands of players, rows follow ``player_ids`` and columns follow ``card_ids``
+    (catalog order)
+    """
+
+    version: int
+    chapter: int
+    round: int
+    player_ids: Tuple[str, ...]
+    number_of_cards: Tuple[int, ...]
+    card_ids: Tuple[uuid.UUID, ...]
+    probabilities: npt.NDArray[np.float64]
+
+    @property
+    def not_in_hands(self) -> npt.NDArray[np.float64]:
+        """Probabilities of cards being out of every hand: played face down or not dealt
+
+        :return: array with a probability per card
+        """
+        return np.clip(1.0 - self.probabilities.sum(axis=0), 0.0, 1.0)  # type: ignore[no-any-return]
+
+
+_cached_inferences: "OrderedDict[uuid.UUID, HandInference]" = OrderedDict()
+_cached_inferences_lock = threading.Lock()
+
+
+def infer_hands(state: GameState, card_bits: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+    """Computes probability of every card being in every hand from folded game state.
+
+    Cards revealed or retrieved are known to be in their hand. Every other card not played (``cards_not_played``) is
+    somewhere unknown: in a hidden slot of some hand (cards the hand holds beyond its known ones), among cards played
+    face down or not dealt. Nothing recorded tells unknown cards apart, so every assignment of them to hidden slots is
+    equally likely and each one is in a hand with probability of hidden slots of the hand divided by unknown cards.
+    Play history enters through the folded state: face up plays take cards out of the unknown ones and face down plays
+    and added cards change hidden slots.
+
+    :param state: game state folded by game_events
+    :param card_bits: bits of cards (see cards_catalog.card_position), one per column
+    :return: array of probabilities with a row per hand (in order of state hands) and a column per card
+    """
+    hands = list(state["hands"].values())
+    hand_cards = np.array([hand["cards"] for hand in hands], dtype=np.int64)
+    number_of_cards = np.array([hand["number_of_cards"] for hand in hands], dtype=np.float64)
+    known = (hand_cards[:, np.newaxis] & card_bits[np.newaxis, :]) != 0
+    unknown = (state["cards_not_played"] & card_bits) != 0
+    hidden_slots = np.maximum(number_of_cards - known.sum(axis=1), 0.0)
+    unknown_cards = unknown.sum()
+    # counts typed in by hand may claim more hidden cards than there are unknown cards, hands share them then
+    share = hidden_slots / max(unknown_cards, hidden_slots.sum(), 1)
+    return known + np.outer(share, unknown)  # type: ignore[no-any-return]
+
+
+def get_hand_inference(game: Game) -> HandInference:
+    """Returns hand inference of current version of game. Inferences are cached by this worker per game and a newer
+    version is inferred from the cached folded state of the game, so only events recorded since are read.
+
+    :param game: Game object with current version
+    :return: HandInference object
+    """
+    with _cached_inferences_lock:
+        cached = _cached_inferences.get(game.id)
+    if cached is not None and cached.version == game.version:
+        return cached
+    # states read inside transaction may be rolled back, they are not cached
+    use_cache = not connection.in_atomic_block
+    state = load_game_state(game, use_cache=use_cache)
+    catalog = get_catalog()
+    cards = catalog.cards
+    inference = HandInference(
+        version=game.version,
+        chapter=state["chapter"],
+        round=state["round"],
+        player_ids=tuple(state["hands"]),
+        number_of_cards=tuple(hand["number_of_cards"] for hand in state["hands"].values()),
+        card_ids=tuple(card.id for card in cards),
+        probabilities=infer_hands(state, np.array([catalog.bit(card) for card in cards], dtype=np.int64)),
+    )
+    if use_cache:
+        with _cached_inferences_lock:
+            _cached_inferences[game.id] = inference
+            _cached_inferences.move_to_end(game.id)
+            while len(_cached_inferences) > CACHED_STATES:
+                _cached_inferences.popitem(last=False)
+    return inference
+
+
+def represent_inference(
+    inference: HandInference, nicks: Mapping[str, str], context: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
+    """Prepares hand inference for response. Cards a hand can not hold are left out of its cards.
+
+    :param inference: HandInference object
+    :param nicks: nicks of players by their ids
+    :param context: serializer context choosing representation of cards, see serializers.card_format_context
+    :return: Dictionary with probabilities of cards by players ordered by nick
+    """
+    context = context or {}
+    card_keys = [str(represent_card(card_id, context)) for card_id in inference.card_ids]
+    probabilities = np.round(inference.probabilities, PROBABILITY_DIGITS)
+
+    def cards(row: npt.NDArray[np.float64]) -> Dict[str, float]:
+        return {card_keys[column]: float(row[column]) for column in np.flatnonzero(row)}
+
+    players: List[Dict[str, Any]] = [
+        {
+            "id": player_id,
+            "nick": nicks[player_id],
+            "number_of_cards": inference.number_of_cards[index],
+            "cards": cards(probabilities[index]),
+        }
+        for index, player_id in enumerate(inference.player_ids)
+    ]
+    return {
+        "chapter": inference.chapter,
+        "round": inference.round,
+        "players": sorted(players, key=lambda player: player["nick"]),
+        "not_in_hands": cards(np.round(inference.not_in_hands, PROBABILITY_DIGITS)),
+    }
+
+
+def chapter_setup(state: GameState) -> ChapterSetup:
+    """Prepares simulation of the rest of the chapter from folded game state. Cards follow catalog order and players
+    follow state hands.
+
+    :param state: game state folded by game_events
+    :return: ChapterSetup object
+    """
+    catalog = get_catalog()
+    cards = catalog.cards
+    bits = [catalog.bit(card) for card in cards]
+    columns = {card.id: column for column, card in enumerate(cards)}
+    rows = {player_id: row for row, player_id in enumerate(state["hands"])}
+    known_cards = tuple(
+        tuple(column for column, bit in enumerate(bits) if hand["cards"] & bit) for hand in state["hands"].values()
+    )
+    return ChapterSetup(
+        number_of_suits=len(CardSuit.values),
+        card_suits=tuple(CARD_SUIT_INDEXES[card.suit] for card in cards),
+        card_ranks=tuple(CARD_NUMBER_RANKS[card.number] for card in cards),
+        known_cards=known_cards,
+        hidden_slots=tuple(
+            max(hand["number_of_cards"] - len(known), 0) for hand, known in zip(state["hands"].values(), known_cards)
+        ),
+        unknown_cards=tuple(column for column, bit in enumerate(bits) if state["cards_not_played"] & bit),
+        round_plays=tuple(
+            (
+                rows[play["player"]],
+                columns[uuid.UUID(play["card_face_up"])] if play["card_face_up"] is not None else None,
+            )
+            for play in state["cards_played_in_round"]
+        ),
+    )
+
+
+def represent_simulation(
+    totals: SimulationTotals,
+    player_ids: Tuple[str, ...],
+    nicks: Mapping[str, str],
+    context: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Prepares outcome statistics of simulation. Means are per sample, cards never played face up are left out.
+
+    :param totals: SimulationTotals object of ChapterSetup made by chapter_setup
+    :param player_ids: ids of players in order of state hands
+    :param nicks: nicks of players by their ids
+    :param context: serializer context choosing representation of cards, see serializers.card_format_context
+    :return: Dictionary with statistics of cards, suits and players ordered by nick
+    """
+    context = context or {}
+    samples = max(totals.samples, 1)
+
+    def mean(count: Any) -> float:
+        return round(float(count) / samples, PROBABILITY_DIGITS)
+
+    cards = get_catalog().cards
+    return {
+        "samples": totals.samples,
+        "cards": {
+            str(represent_card(cards[column].id, context)): {
+                "played": mean(totals.card_played[column]),
+                "wins": mean(totals.card_wins[column]),
+            }
+            for column in np.flatnonzero(totals.card_played)
+        },
+        "suits": {suit: {"leads": mean(totals.suit_leads[index])} for suit, index in CARD_SUIT_INDEXES.items()},
+        "players": sorted(
+            (
+                {
+                    "id": player_id,
+                    "nick": nicks[player_id],
+                    "rounds_won": mean(totals.suit_wins[:, row].sum()),
+                    "wins_by_suit": {
+                        suit: mean(totals.suit_wins[index, row]) for suit, index in CARD_SUIT_INDEXES.items()
+                    },
+                    "initiative": mean(totals.initiative[row]),
+                }
+                for row, player_id in enumerate(player_ids)
+            ),
+            key=lambda player: player["nick"],
+        ),
+    }
@@ -0,0 +1,310 @@
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# SQLite reports contention as OperationalError("database is locked"), which reaches the client as a server error.
+# Only debug error pages (DEBUG=True) carry the message, other servers' lock errors are counted as server errors alone.
+LOCK_ERROR = "database is locked"
+
+
+@dataclass(frozen=True)
+class RequestResult:
+    endpoint: str
+    status: int
+    latency: float
+    locked: bool = False
+
+
+@dataclass
+class LoadTestReport:
+    elapsed: float
+    results: List[RequestResult] = field(default_factory=list)
+    failed_games: List[str] = field(default_factory=list)
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        """Formats requests per second and latency percentiles of every endpoint as a table. Errors are responses with
+        status 400 or higher, 5xx ones are server errors and locked ones are server errors recognised as database is
+        locked, which needs a server with DEBUG=True.
+
+        :return: report
+        """
+        by_endpoint: Dict[str, List[RequestResult]] = defaultdict(list)
+        for result in self.results:
+            by_endpoint[result.endpoint].append(result)
+        lines = [
+            f"{'endpoint':<14} {'requests':>8} {'errors':>6} {'5xx':>6} {'locked':>6} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        ]
+        for endpoint, results in sorted(by_endpoint.items()):
+            latencies = sorted(result.latency for result in results)
+            lines.append(
+                f"{endpoint:<14} {len(results):>8} {sum(result.status >= 400 for result in results):>6} "
+                f"{sum(result.status >= 500 for result in results):>6} {sum(result.locked for result in results):>6} "
+                + " ".join(f"{percentile(latencies, q) * 1000:>8.1f}" for q in (50, 95, 99))
+            )
+        lines.append(
+            f"{len(self.results)} requests in {self.elapsed:.2f}s, {self.requests_per_second:.1f} requests/s, "
+            f"{sum(result.status >= 500 for result in self.results)} server errors "
+            f"({sum(result.locked for result in self.results)} database is locked, recognised with DEBUG=True only), "
+            f"{len(self.failed_games)} failed games"
+        )
+        lines.extend(self.failed_games)
+        return "\n".join(lines)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Returns nearest-rank percentile
+
+    :param sorted_values: values in ascending order
+    :param q: percentile from 0 to 100
+    :return: percentile value, 0 when there are no values
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+class LoadTestError(Exception):
+    pass
+
+
+class ApiClient:  # pylint: disable=too-few-public-methods
+    """Minimal JSON client of the API, recording status and latency of every request"""
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token: Optional[str] = None
+        self.results: List[RequestResult] = []
+
+    def request(self, endpoint: str, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        """Sends request and returns decoded response
+
+        :param endpoint: endpoint name used in report
+        :param method: HTTP method
+        :param path: path starting with /api/
+        :param data: JSON body
+        :return: decoded JSON response
+        :raises LoadTestError: if server responds with an error
+        """
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers=headers,
+            method=method,
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            status, body = exc.code, exc.read()
+        latency = time.perf_counter() - start
+        locked = status >= 500 and LOCK_ERROR.encode() in body
+        self.results.append(RequestResult(endpoint=endpoint, status=status, latency=latency, locked=locked))
+        if status >= 400:
+            raise LoadTestError(f"{method} {path} returned {status}{' (database is locked)' if locked else ''}")
+        return json.loads(body) if body else None
+
+
+class SimulatedGame:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Plays one game through the API with random legal moves. Every round some player may reveal a card, every
+    player with cards plays face up or face down and some player may retrieve a card played face up. When all hands
+    are empty a new chapter starts and every player is given six cards. With ``batch`` all actions of a round are sent
+    in one request to the round submit endpoint. After the rounds the game is polled ``polls`` times the way a client
+    refreshing its screen would, through the async variants of read endpoints with ``async_api``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: ApiClient,
+        number_of_players: int,
+        rounds: int,
+        seed: int,
+        *,
+        batch: bool = False,
+        polls: int = 0,
+        async_api: bool = False,
+    ) -> None:
+        self.client = client
+        self.batch = batch
+        self.polls = polls
+        self.read_prefix = "/api/async" if async_api else "/api"
+        self.number_of_players = number_of_players
+        self.rounds = rounds
+        self.random = random.Random(seed)
+        self.game_id = ""
+
+    def run(self) -> None:
+        name = f"load-{uuid.uuid4().hex[:12]}"
+        self.client.request("register", "POST", "/api/register/", {"username": name, "password": name})
+        self.client.token = self.client.request("token", "POST", "/api/token/", {"username": name, "password": name})[
+            "access"
+        ]
+        for number in range(self.number_of_players):
+            self.client.request("create player", "POST", "/api/players/", {"nick": f"player {number}"})
+        players = [player["id"] for player in self.client.request("players", "GET", "/api/players/")]
+        game = self.client.request("create game", "POST", "/api/games/", {"name": name, "players": players})
+        self.game_id = game["id"]
+        for _ in range(self.rounds):
+            self._play_round()
+        player_id = players[0]
+        for _ in range(self.polls):
+            self._poll(name, player_id)
+
+    def _hand_path(self, player_id: str, action: str) -> str:
+        return f"/api/games/{self.game_id}/players/{player_id}/hand/{action}"
+
+    def _poll(self, name: str, player_id: str) -> None:
+        game_path = f"{self.read_prefix}/games/{self.game_id}"
+        hand_path = f"{game_path}/players/{player_id}/hand"
+        self.client.request("poll game", "GET", f"{self.read_prefix}/games/?name={name}")
+        self.client.request("poll chapter", "GET", f"{game_path}/chapters/latest")
+        self.client.request("poll rounds", "GET", f"{game_path}/game_rounds")
+        self.client.request("poll played", "GET", f"{hand_path}/play")
+        self.client.request("poll playable", "GET", f"{hand_path}/play/cards")
+
+    def _play_round(self) -> None:
+        state = self.client.request("state", "GET", f"/api/games/{self.game_id}/state")
+        reveals, plays, retrieves, hands = self._choose_round(state)
+        advance = any(hands.values())
+        if self.batch:
+            self.client.request(
+                "submit round",
+                "POST",
+                f"/api/games/{self.game_id}/rounds/submit",
+                {"reveals": reveals, "plays": plays, "retrieves": retrieves, "advance": advance},
+            )
+        else:
+            for reveal in reveals:
+                self.client.request(
+                    "reveal", "POST", self._hand_path(reveal["player"], "reveal"), {"id": reveal["card"]}
+                )
+            for play in plays:
+                face_up, face_down = play["card_face_up"], play["number_of_cards_face_down"]
+                self.client.request(
+                    "play",
+                    "POST",
+                    self._hand_path(play["player"], "play"),
+                    {"card_face_up": face_up, "number_of_cards_face_down": face_down},
+                )
+            for retrieve in retrieves:
+                self.client.request(
+                    "retrieve", "POST", self._hand_path(retrieve["player"], "retrieve"), {"id": retrieve["card"]}
+                )
+            if advance:
+                self.client.request("new round", "POST", f"/api/games/{self.game_id}/rounds/create")
+        if not advance:
+            self.client.request("new chapter", "POST", f"/api/games/{self.game_id}/chapters/create")
+            for player_id in hands:
+                self.client.request("add", "POST", self._hand_path(player_id, "add"), {"number_of_cards": 6})
+
+    def _choose_round(  # pylint: disable=too-many-locals
+        self, state: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+        """Chooses reveals, plays and retrieves of the round
+
+        :param state: game state returned by the API
+        :return: reveals, plays, retrieves and number of cards in hands after the round
+        """
+        not_played = [card["id"] for card in state["cards_not_played"]]
+        hands = {player["id"]: player["number_of_cards"] for player in state["players"]}
+        revealed = {player["id"]: [card["id"] for card in player["revealed_cards"]] for player in state["players"]}
+        reveals, plays, retrieves = [], [], []
+        if not_played and self.random.random() < 0.3:
+            player_id = self.random.choice(list(hands))
+            card_id = not_played.pop(self.random.randrange(len(not_played)))
+            reveals.append({"player": player_id, "card": card_id})
+            revealed[player_id].append(card_id)
+        retrievable = []
+        played = [player_id for player_id, number_of_cards in hands.items() if number_of_cards > 0]
+        for player_id in played:
+            face_up, face_down = self._choose_play(hands[player_id], not_played + revealed[player_id])
+            if face_up in not_played:
+                not_played.remove(face_up)
+                retrievable.append((player_id, face_up))
+            elif face_up is not None:
+                revealed[player_id].remove(face_up)
+            plays.append({"player": player_id, "card_face_up": face_up, "number_of_cards_face_down": face_down})
+            hands[player_id] -= face_down + (1 if face_up is not None else 0)
+        if retrievable and self.random.random() < 0.2:
+            played_by, card_id = self.random.choice(retrievable)
+            # only players that played in this round can be given a card, the round could not be finished otherwise
+            candidates = [player_id for player_id in played if player_id != played_by]
+            if candidates:
+                player_id = self.random.choice(candidates)
+                retrieves.append({"player": player_id, "card": card_id})
+                hands[player_id] += 1
+        return reveals, plays, retrieves, hands
+
+    def _choose_play(self, number_of_cards: int, playable: List[str]) -> Tuple[Optional[str], int]:
+        if playable and self.random.random() < 0.6:
+            return self.random.choice(playable), self.random.randint(0, min(1, number_of_cards - 1))
+        return None, self.random.randint(1, min(2, number_of_cards))
+
+
+def run_load_test(  # pylint: disable=too-many-arguments,too-many-locals
+    base_url: str,
+    *,
+    games: int,
+    number_of_players: int,
+    rounds: int,
+    seed: int = 0,
+    timeout: float = 30.0,
+    batch: bool = False,
+    polls: int = 0,
+    async_api: bool = False,
+) -> LoadTestReport:
+    """Plays given number of games at the same time, each game in its own thread and with its own user. Running it
+    with polls against the same app served by WSGI and ASGI server compares throughput of sync and async read views.
+
+    :param base_url: address of running server
+    :param games: number of concurrent games
+    :param number_of_players: players in every game, from 2 to 4
+    :param rounds: rounds played in every game
+    :param seed: seed of random moves
+    :param timeout: timeout of single request in seconds
+    :param batch: whether to send every round as one request
+    :param polls: times every game is polled after its rounds
+    :param async_api: whether to poll async variants of read endpoints
+    :return: LoadTestReport object
+    """
+    clients = [ApiClient(base_url, timeout) for _ in range(games)]
+    failed_games: List[str] = []
+    failed_games_lock = threading.Lock()
+
+    def play(number: int) -> None:
+        try:
+            SimulatedGame(
+                clients[number], number_of_players, rounds, seed + number, batch=batch, polls=polls, async_api=async_api
+            ).run()
+        except (LoadTestError, OSError) as exc:
+            with failed_games_lock:
+                failed_games.append(f"game {number}: {exc}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=games) as executor:
+        list(executor.map(play, range(games)))
+    elapsed = time.perf_counter() - start
+    return LoadTestReport(
+        elapsed=elapsed,
+        results=[result for client in clients for result in client.results],
+        failed_games=failed_games,
+    )
@@ -0,0 +1,77 @@
+import copy
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from django.conf import settings
+from django.db import connection
+
+T = TypeVar("T")
+
+
+class LookupCache:
+    """Bounded LRU cache of rows looked up by game scoped endpoints (games, players and hands), keyed so that a row is
+    only found again by the user it was loaded for. Every change of a game goes through game_events.record_events,
+    which drops cached rows of the game right away and again once the transaction commits. Only rows read outside of
+    transactions are stored, so uncommitted rows are never cached, and a load that overlaps an invalidation is not
+    stored, so a row read before a commit never outlives it.
+
+    Rows are copied in and out, callers may change them freely. The cache belongs to one worker process: writes made
+    by other processes do not invalidate it, so it is off unless ``API_LOOKUP_CACHE_SIZE`` is set, which only a single
+    process serving the database may do. Conditional GETs never answer from it.
+    """
+
+    def __init__(self) -> None:
+        self._rows: "OrderedDict[Hashable, Tuple[Optional[uuid.UUID], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(
+        self, key: Hashable, load: Callable[[], T], game_of: Optional[Callable[[T], uuid.UUID]] = None
+    ) -> T:
+        """Returns copy of cached row or loads it and caches it
+
+        :param key: key of the row, including the user or game it is scoped to
+        :param load: function loading the row, exceptions are not cached
+        :param game_of: function returning id of game whose changes invalidate the row, the row is never invalidated
+            if not given
+        :return: row
+        """
+        with self._lock:
+            cached = self._rows.get(key)
+            if cached is not None:
+                self._rows.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(cached[1])  # type: ignore[no-any-return]
+            self.misses += 1
+            generation = self._generation
+        row = load()
+        max_size = settings.API_LOOKUP_CACHE_SIZE
+        with self._lock:
+            if max_size and not connection.in_atomic_block and generation == self._generation:
+                self._rows[key] = (game_of(row) if game_of else None, copy.deepcopy(row))
+                while len(self._rows) > max_size:
+                    self._rows.popitem(last=False)
+        return row
+
+    def invalidate_game(self, game_id: uuid.UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (row_game_id, _) in self._rows.items() if row_game_id == game_id]:
+                del self._rows[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._rows.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._rows), "hits": self.hits, "misses": self.misses}
+
+
+lookup_cache = LookupCache()
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...load_test import run_load_test
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays many games at the same time through the API of a running server (e.g. `manage.py runserver`) and "
+        "reports requests per second, latency percentiles per endpoint and server errors (database is locked ones are "
+        "recognised when the server runs with DEBUG=True). To compare WSGI "
+        "and ASGI, poll the same app served by `manage.py runserver` and by an ASGI server (e.g. `uvicorn "
+        "ArcTracker.asgi:application`), the latter with --async-api."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="address of running server")
+        parser.add_argument("--games", type=int, default=10, help="number of concurrent games")
+        parser.add_argument("--players", type=int, default=3, help="players in every game, from 2 to 4")
+        parser.add_argument("--rounds", type=int, default=20, help="rounds played in every game")
+        parser.add_argument("--seed", type=int, default=0, help="seed of random moves")
+        parser.add_argument("--batch", action="store_true", help="send every round as one request")
+        parser.add_argument("--polls", type=int, default=0, help="times every game is polled after its rounds")
+        parser.add_argument("--async-api", action="store_true", help="poll async variants of read endpoints")
+        parser.add_argument("--timeout", type=float, default=30.0, help="timeout of single request in seconds")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not 2 <= options["players"] <= 4:
+            raise CommandError("game has to have from 2 to 4 players")
+        if options["games"] < 1:
+            raise CommandError("at least one game has to be played")
+        report = run_load_test(
+            options["url"],
+            games=options["games"],
+            number_of_players=options["players"],
+            rounds=options["rounds"],
+            seed=options["seed"],
+            timeout=options["timeout"],
+            batch=options["batch"],
+            polls=options["polls"],
+            async_api=options["async_api"],
+        )
+        self.stdout.write(report.format())
+        if report.failed_games:
+            raise CommandError(f"{len(report.failed_games)} of {options['games']} games failed")
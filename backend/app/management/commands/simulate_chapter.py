@@ -0,0 +1,57 @@
+import json
+import os
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...game_events import load_game_state
+from ...hand_inference import chapter_setup, represent_simulation
+from ...models import Game
+from ...serializers import CARD_FORMATS, card_format_context
+from ...simulation import format_scaling, measure_scaling, run_simulation
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays out the rest of the current chapter of a game many times from random deals of cards the tracker does "
+        "not know, across a pool of processes, and prints how often every card is played and wins a round, how often "
+        "every suit leads and how many rounds every player wins. With --benchmark it prints throughput of the same "
+        "simulation run by 1, 2, 4, ... processes instead."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("game_id", help="id of tracked game")
+        parser.add_argument("--samples", type=int, default=10_000, help="number of simulated chapters")
+        parser.add_argument("--seed", type=int, default=0, help="seed of random deals and moves")
+        parser.add_argument("--workers", type=int, help="number of processes, all CPUs if not given")
+        parser.add_argument("--time-limit", type=float, help="seconds after which no more chapters are simulated")
+        parser.add_argument(
+            "--card-format", choices=CARD_FORMATS, default=CARD_FORMATS[0], help="representation of cards"
+        )
+        parser.add_argument("--benchmark", action="store_true", help="measure throughput by number of processes")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["samples"] < 1:
+            raise CommandError("at least one sample has to be simulated")
+        try:
+            game = Game.objects.get(id=options["game_id"])
+        except (Game.DoesNotExist, ValidationError) as exc:
+            raise CommandError(f"game {options['game_id']} does not exist") from exc
+        state = load_game_state(game)
+        setup = chapter_setup(state)
+        workers = options["workers"] or os.cpu_count() or 1
+        if options["benchmark"]:
+            worker_counts = [1]
+            while worker_counts[-1] * 2 <= workers:
+                worker_counts.append(worker_counts[-1] * 2)
+            self.stdout.write(
+                format_scaling(measure_scaling(setup, options["samples"], worker_counts, options["seed"]))
+            )
+            return
+        totals = run_simulation(
+            setup, samples=options["samples"], seed=options["seed"], workers=workers, time_limit=options["time_limit"]
+        )
+        nicks = {str(player_id): nick for player_id, nick in game.players.values_list("id", "nick")}
+        context = card_format_context({"card_format": options["card_format"]})
+        self.stdout.write(json.dumps(represent_simulation(totals, tuple(state["hands"]), nicks, context), indent=2))
@@ -0,0 +1,31 @@
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...sqlite_benchmark import SQLITE_PROFILES, format_write_benchmark, run_write_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays cards from many connections at the same time in a scratch SQLite database, once with the default "
+        "connection options and once with the production profile (ARCTRACKER_DATABASE_PROFILE=production), and "
+        "reports commits per second, database is locked errors and commit latency of each."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--threads", type=int, default=8, help="number of concurrent connections")
+        parser.add_argument("--transactions", type=int, default=200, help="transactions run by every connection")
+        parser.add_argument("--directory", help="directory of scratch database files, temporary if not given")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["threads"] < 1 or options["transactions"] < 1:
+            raise CommandError("at least one thread and one transaction are needed")
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = Path(options["directory"] or temporary_directory)
+            results = [
+                run_write_benchmark(directory, profile, options["threads"], options["transactions"])
+                for profile in SQLITE_PROFILES
+            ]
+        self.stdout.write(format_write_benchmark(results))
@@ -1,4 +1,5 @@
 import uuid
+from typing import Any
 
 from django.contrib.auth import models as auth_models
 from django.core.exceptions import ValidationError
@@ -53,6 +54,8 @@ class Player(models.Model):
 
     class Meta:
         unique_together = ("user", "nick")
+        # keyset pagination of players list (see pagination.PLAYERS_KEYSET)
+        indexes = [models.Index(fields=["user", "created_time", "id"])]
 
 
 class Game(models.Model):
@@ -61,21 +64,29 @@ class Game(models.Model):
     name = models.CharField(max_length=256, null=False, blank=False)
     created_time = models.DateTimeField(auto_now_add=True)
     players = models.ManyToManyField(Player)
-    cards_not_played = models.ManyToManyField(Card)
+    # bit mask of cards, one bit per card (see cards_catalog.card_position)
+    cards_not_played = models.IntegerField(default=0)
     finished = models.BooleanField(default=False)
+    # bumped on every change of the game state (see game_events.record_events), used as ETag of game resources
+    version = models.IntegerField(default=0)
+    # latest round of the game, kept up to date by GameRound.save
+    current_round = models.ForeignKey("GameRound", null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
 
     def __str__(self) -> str:
         return "Name: " + str(self.name) + " Players: " + str([player.nick for player in self.players.all()])
 
     class Meta:
         unique_together = ("user", "name")
+        # keyset pagination of games list (see pagination.GAMES_KEYSET)
+        indexes = [models.Index(fields=["user", "created_time", "id"])]
 
 
 class PlayerHand(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     game = models.ForeignKey(Game, on_delete=models.CASCADE)
-    cards = models.ManyToManyField(Card)
+    # bit mask of revealed cards, one bit per card (see cards_catalog.card_position)
+    cards = models.IntegerField(default=0)
     number_of_cards = models.IntegerField()
 
 
@@ -88,6 +99,28 @@ class GameRound(models.Model):
     class Meta:
         unique_together = ("game", "chapter", "round")
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            self.advance_current_round()
+
+    def advance_current_round(self) -> None:
+        """Makes this round current round of its game, unless game already points to a later round. The check and
+        the update are a single statement, so concurrent inserts can not move the pointer backwards.
+        """
+        updated = (
+            Game.objects.filter(id=self.game_id)
+            .filter(
+                models.Q(current_round__isnull=True)
+                | models.Q(current_round__chapter__lt=self.chapter)
+                | models.Q(current_round__chapter=self.chapter, current_round__round__lt=self.round)
+            )
+            .update(current_round=self)
+        )
+        if updated and GameRound.game.is_cached(self):
+            self.game.current_round = self
+
 
 class CardPlayedInRound(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -106,3 +139,38 @@ class CardPlayedInRound(models.Model):
             raise ValidationError("with played card face up you can only play up to one card face down")
         if self.card_face_up is None and self.number_of_cards_face_down == CardsPlayedFaceDown.ZERO:
             raise ValidationError("you have to play atleast one card")
+
+
+class GameEventKind(models.TextChoices):
+    CARD_PLAYED = "CARD_PLAYED"
+    CARD_REVEALED = "CARD_REVEALED"
+    CARD_UNREVEALED = "CARD_UNREVEALED"
+    CARD_RETRIEVED = "CARD_RETRIEVED"
+    CARDS_ADDED = "CARDS_ADDED"
+    CARDS_DEALT = "CARDS_DEALT"
+    ROUND_CREATED = "ROUND_CREATED"
+    CHAPTER_CREATED = "CHAPTER_CREATED"
+
+
+class GameEvent(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE)
+    sequence = models.IntegerField()
+    kind = models.CharField(max_length=20, choices=GameEventKind.choices)
+    player = models.ForeignKey(Player, null=True, blank=True, on_delete=models.CASCADE)
+    card = models.ForeignKey(Card, null=True, blank=True, on_delete=models.SET_NULL)
+    number_of_cards = models.IntegerField(default=0)
+    created_time = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("game", "sequence")
+
+
+class GameSnapshot(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE)
+    sequence = models.IntegerField()
+    state = models.JSONField()
+
+    class Meta:
+        unique_together = ("game", "sequence")
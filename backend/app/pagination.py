@@ -0,0 +1,191 @@
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.http import HttpRequest, HttpResponseBase
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+# columns lists are ordered by, the last one is unique within the list, every list has an index starting with them
+GAMES_KEYSET = ("created_time", "id")
+PLAYERS_KEYSET = ("created_time", "id")
+GAME_ROUNDS_KEYSET = ("chapter", "round")
+
+QuerySetT = TypeVar("QuerySetT", bound=models.QuerySet[Any])
+HttpResponseT = TypeVar("HttpResponseT", bound=HttpResponseBase)
+
+
+@dataclass(frozen=True)
+class KeysetPagination:
+    """Cursor pagination that continues after the key of the last row of the previous page instead of skipping rows,
+    so every page is read from the index with the same cost whatever its position. Cursor is an opaque token with
+    values of the key columns. Lists are paged only when a client asks for it with ``limit`` or ``cursor``, clients
+    that do not follow links get every row.
+    """
+
+    keys: Tuple[str, ...]
+    limit: Optional[int]
+    after: Optional[Tuple[Any, ...]] = None
+
+    @classmethod
+    def from_params(
+        cls, params: Mapping[str, str], model: type[models.Model], keys: Tuple[str, ...]
+    ) -> "KeysetPagination":
+        """Reads page size from ``limit`` and position from ``cursor`` query parameters, a cursor without limit reads
+        ``API_PAGE_SIZE`` rows and no parameters read every row
+
+        :param params: query parameters
+        :param model: model of listed rows
+        :param keys: columns rows are ordered by
+        :return: KeysetPagination object
+        :raises ValidationError: if limit or cursor is invalid
+        """
+        if not params.get("limit") and not params.get("cursor"):
+            return cls(keys=keys, limit=None)
+        limit = settings.API_PAGE_SIZE
+        if params.get("limit"):
+            try:
+                limit = int(params["limit"])
+            except ValueError as exc:
+                raise ValidationError(detail="limit must be an integer") from exc
+            if not 0 < limit <= settings.API_MAX_PAGE_SIZE:
+                raise ValidationError(detail=f"limit must be from 1 to {settings.API_MAX_PAGE_SIZE}")
+        after = decode_cursor(params["cursor"], model, keys) if params.get("cursor") else None
+        return cls(keys=keys, limit=limit, after=after)
+
+    def paginate(self, queryset: QuerySetT) -> QuerySetT:
+        """Orders queryset by keys and limits it to rows after the cursor, one row more than the page size is read to
+        know whether there is a next page. Queryset is only ordered when the list is not paged.
+
+        :param queryset: QuerySet object
+        :return: QuerySet object
+        """
+        queryset = queryset.order_by(*self.keys)
+        if self.after is not None:
+            after = models.Q()
+            for position, key in enumerate(self.keys):
+                equal = {previous: self.after[index] for index, previous in enumerate(self.keys[:position])}
+                after |= models.Q(**equal, **{f"{key}__gt": self.after[position]})
+            queryset = queryset.filter(after)
+        return queryset[: self.limit + 1] if self.limit is not None else queryset
+
+    def page(self, rows: Iterable[Any]) -> Tuple[List[Any], Optional[str]]:
+        """Splits rows read from paginated queryset into page and cursor of the next page
+
+        :param rows: rows of paginated queryset
+        :return: rows of the page and cursor of the next page, None if this is the last page
+        """
+        rows = list(rows)
+        if self.limit is None or len(rows) <= self.limit:
+            return rows, None
+        last = rows[self.limit - 1]
+        return rows[: self.limit], encode_cursor([getattr(last, key) for key in self.keys])
+
+
+def encode_cursor_value(value: Any) -> str:
+    # full precision, JSON encoder of Django drops microseconds past milliseconds which would break the ordering
+    return value.isoformat() if isinstance(value, datetime.datetime) else str(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values), default=encode_cursor_value).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, model: type[models.Model], keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+    """Decodes cursor and converts its values to values of key columns
+
+    :param cursor: cursor returned with previous page
+    :param model: model of listed rows
+    :param keys: columns rows are ordered by
+    :return: values of key columns
+    :raises ValidationError: if cursor was not returned for this list
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error) as exc:
+        raise ValidationError(detail="invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValidationError(detail="invalid cursor")
+    fields = [model._meta.get_field(key) for key in keys]
+    try:
+        return tuple(field.to_python(value) for field, value in zip(fields, values) if isinstance(field, models.Field))
+    # values of forged cursors may be of any JSON type, some fields fail on them with TypeError or ValueError
+    except (DjangoValidationError, TypeError, ValueError) as exc:
+        raise ValidationError(detail="invalid cursor") from exc
+
+
+def parse_time_param(params: Mapping[str, str], name: str) -> Optional[datetime.datetime]:
+    """Reads date or datetime query parameter, date means its midnight and naive values are in current time zone
+
+    :param params: query parameters
+    :param name: name of parameter
+    :return: aware datetime or None if parameter is not given
+    :raises ValidationError: if parameter is not a date or datetime
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            parsed = datetime.datetime.combine(date, datetime.time()) if date is not None else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError(detail=f"{name} must be a date or datetime")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def filter_created_time(queryset: QuerySetT, params: Mapping[str, str]) -> QuerySetT:
+    """Filters rows created from ``created_after`` (inclusive) to ``created_before`` (exclusive)
+
+    :param queryset: QuerySet object of model with created_time
+    :param params: query parameters
+    :return: QuerySet object
+    """
+    created_after = parse_time_param(params, "created_after")
+    created_before = parse_time_param(params, "created_before")
+    if created_after is not None:
+        queryset = queryset.filter(created_time__gte=created_after)
+    if created_before is not None:
+        queryset = queryset.filter(created_time__lt=created_before)
+    return queryset
+
+
+def filter_games(queryset: QuerySetT, params: Mapping[str, str]) -> QuerySetT:
+    """Filters games by ``finished`` and creation time
+
+    :param queryset: QuerySet object of Game
+    :param params: query parameters
+    :return: QuerySet object
+    :raises ValidationError: if finished is not a boolean
+    """
+    finished = params.get("finished")
+    if finished:
+        if finished.lower() not in ("true", "false", "1", "0"):
+            raise ValidationError(detail="finished must be true or false")
+        queryset = queryset.filter(finished=finished.lower() in ("true", "1"))
+    return filter_created_time(queryset, params)
+
+
+def set_next_link(response: HttpResponseT, request: HttpRequest, cursor: Optional[str]) -> HttpResponseT:
+    """Adds link to the next page with the same parameters to the response, body of the response stays a list
+
+    :param response: HttpResponseBase object
+    :param request: HttpRequest object of the page
+    :param cursor: cursor of the next page, None if there is no next page
+    :return: HttpResponseBase object
+    """
+    if cursor is not None:
+        params = request.GET.copy()
+        params["cursor"] = cursor
+        response["Link"] = f'<{request.build_absolute_uri(request.path + "?" + params.urlencode())}>; rel="next"'
+    return response
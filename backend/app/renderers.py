@@ -0,0 +1,78 @@
+import codecs
+from typing import Any, Mapping, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.middleware.gzip import GZipMiddleware
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# separators which are valid JSON but end lines of JavaScript, DRF escapes them and so does the fast path
+LINE_SEPARATORS = (("\u2028".encode(), b"\\u2028"), ("\u2029".encode(), b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):  # type: ignore[misc]
+    """JSON renderer encoding with orjson when it is installed and with the standard library (as JSONRenderer of DRF)
+    otherwise. Output is the same as output of JSONRenderer: values orjson does not know (dates, decimals, lazy
+    strings) are converted by the encoder of DRF, and indented output asked for by clients is left to JSONRenderer.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            rendered: bytes = super().render(data, accepted_media_type, renderer_context)
+            return rendered
+        try:
+            content = orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # e.g. integers larger than 64 bits, which the standard library encodes
+            rendered = super().render(data, accepted_media_type, renderer_context)
+            return rendered
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
+
+
+class FastJSONParser(JSONParser):  # type: ignore[misc]  # pylint: disable=too-few-public-methods
+    """JSON parser decoding with orjson when it is installed and with the standard library (as JSONParser of DRF)
+    otherwise
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+        self, stream: Any, media_type: Optional[str] = None, parser_context: Optional[Mapping[str, Any]] = None
+    ) -> Any:
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
+
+
+class LargeResponseGZipMiddleware(GZipMiddleware):  # pylint: disable=too-few-public-methods
+    """Compresses response bodies of at least ``API_GZIP_MIN_LENGTH`` bytes for clients accepting gzip, smaller ones
+    are not worth the CPU. Event streams are never compressed, so that every event reaches clients when it is sent.
+    Setting ``API_GZIP_MIN_LENGTH`` to None turns compression off.
+    """
+
+    def process_response(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+        min_length = settings.API_GZIP_MIN_LENGTH
+        if min_length is None or response.streaming or len(getattr(response, "content", b"")) < min_length:
+            return response
+        compressed: HttpResponseBase = super().process_response(request, response)
+        return compressed
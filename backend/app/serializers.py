@@ -1,12 +1,131 @@
-from typing import Any
+import uuid
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TypeVar
 
 from django.contrib.auth import get_user_model
+from django.db import models
 from rest_framework import serializers
 
-from .models import Card, CardPlayedInRound, Game, GameRound, Player
+from .cards_catalog import get_catalog
+from .models import Card, CardPlayedInRound, CardsPlayedFaceDown, Game, GameRound, Player
 
 User = get_user_model()
 
+QuerySetT = TypeVar("QuerySetT", bound=models.QuerySet[Any])
+
+# cards are sent as ids unless clients ask for codes such as AGG5 (see cards_catalog.card_code)
+CARD_FORMATS = ("id", "code")
+
+
+def card_format_context(params: Mapping[str, str]) -> Dict[str, str]:
+    """Reads representation of cards chosen with ``card_format`` query parameter, the result is passed to serializers
+    as their context
+
+    :param params: query parameters
+    :return: serializer context
+    :raises ValidationError: if card format is unknown
+    """
+    card_format = params.get("card_format") or CARD_FORMATS[0]
+    if card_format not in CARD_FORMATS:
+        raise serializers.ValidationError(f"card_format must be one of: {', '.join(CARD_FORMATS)}")
+    return {"card_format": card_format}
+
+
+def represent_card(card_id: uuid.UUID, context: Mapping[str, Any]) -> Any:
+    return get_catalog().code_by_id(card_id) if context.get("card_format") == "code" else card_id
+
+
+class SparseModelSerializer(serializers.ModelSerializer):  # type: ignore[misc]
+    """Model serializer that can be limited to some of its fields. Fields are chosen by clients with ``fields`` and
+    ``exclude`` query parameters (comma separated names) and the queryset is narrowed to match, so columns and
+    relations that are not sent are not read either.
+    """
+
+    def __init__(self, *args: Any, fields: Optional[Iterable[str]] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, params: Mapping[str, str]) -> Optional[List[str]]:
+        """Reads fields chosen with ``fields`` and ``exclude`` query parameters
+
+        :param params: query parameters
+        :return: names of chosen fields or None if client did not choose
+        :raises ValidationError: if a name is not a field of the serializer
+        """
+        available: List[str] = list(cls.Meta.fields)
+        chosen = {}
+        for param in ("fields", "exclude"):
+            if params.get(param):
+                names = [name.strip() for name in params[param].split(",") if name.strip()]
+                unknown = [name for name in names if name not in available]
+                if unknown:
+                    raise serializers.ValidationError(f"unknown fields: {', '.join(unknown)}")
+                chosen[param] = names
+        if not chosen:
+            return None
+        return [name for name in chosen.get("fields", available) if name not in chosen.get("exclude", [])]
+
+    @classmethod
+    def narrow(cls, queryset: QuerySetT, fields: Optional[Iterable[str]], required: Iterable[str] = ()) -> QuerySetT:
+        """Reads only columns of chosen fields and prefetches only chosen many to many relations
+
+        :param queryset: QuerySet object of serializer model
+        :param fields: names of chosen fields, all fields of the serializer if None
+        :param required: columns read whatever fields are chosen, e.g. keys of pagination
+        :return: QuerySet object
+        """
+        model_fields = {field.name: field for field in queryset.model._meta.get_fields()}
+        columns, relations = list(required), []
+        for name in fields if fields is not None else cls.Meta.fields:
+            field = model_fields.get(name)
+            if field is None:
+                continue
+            if field.many_to_many:
+                relations.append(name)
+            elif field.concrete:
+                columns.append(name)
+        return queryset.only(queryset.model._meta.pk.name, *columns).prefetch_related(*relations)
+
+
+class CatalogCardField(serializers.Field):  # type: ignore[misc]
+    """Card referenced by its id or code, validated against the in-memory card catalog instead of the database."""
+
+    default_error_messages = {
+        "does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+    }
+
+    def run_validation(self, data: Any = serializers.empty) -> Any:
+        if data == "":
+            data = None
+        return super().run_validation(data)
+
+    def to_internal_value(self, data: Any) -> Card:
+        card = get_catalog().get(data)
+        if card is None:
+            self.fail("does_not_exist", pk_value=data)
+        assert card is not None
+        return card
+
+    def to_representation(self, value: Any) -> Any:
+        # value is a card or, with card id as source, only its id so that the card is not loaded
+        return represent_card(value.pk if isinstance(value, Card) else value, self.context)
+
+
+class CardSetField(serializers.Field):  # type: ignore[misc]
+    """Set of cards stored as bit mask, represented as list of card ids or codes ordered by suit and number."""
+
+    def to_internal_value(self, data: Any) -> int:
+        catalog = get_catalog()
+        cards = [catalog.get(card_id) for card_id in data]
+        if None in cards:
+            raise serializers.ValidationError("Invalid card id.")
+        return catalog.mask(card for card in cards if card is not None)
+
+    def to_representation(self, value: int) -> Any:
+        return [represent_card(card.pk, self.context) for card in get_catalog().cards_in(value)]
+
 
 class RegisterSerializer(serializers.ModelSerializer):  # type: ignore[misc]
     password = serializers.CharField(write_only=True, required=True, style={"input_type": "password"}, min_length=2)
@@ -20,7 +139,7 @@ class RegisterSerializer(serializers.ModelSerializer):  # type: ignore[misc]
         return user
 
 
-class PlayerSerializerGet(serializers.ModelSerializer):  # type: ignore[misc]
+class PlayerSerializerGet(SparseModelSerializer):
     class Meta:
         model = Player
         fields = ["nick", "id"]
@@ -32,7 +151,9 @@ class PlayerSerializerPost(serializers.ModelSerializer):  # type: ignore[misc]
         fields = ["nick"]
 
 
-class GameSerializerGet(serializers.ModelSerializer):  # type: ignore[misc]
+class GameSerializerGet(SparseModelSerializer):
+    cards_not_played = CardSetField(read_only=True)
+
     class Meta:
         model = Game
         fields = ["id", "name", "players", "cards_not_played", "finished"]
@@ -44,13 +165,15 @@ class GameSerializerPost(serializers.ModelSerializer):  # type: ignore[misc]
         fields = ["name", "players"]
 
 
-class GameRoundSerializerGet(serializers.ModelSerializer):  # type: ignore[misc]
+class GameRoundSerializerGet(SparseModelSerializer):
     class Meta:
         model = GameRound
         fields = ["id", "game", "chapter", "round"]
 
 
 class CardPlayedInRoundSerializerPost(serializers.ModelSerializer):  # type: ignore[misc]
+    card_face_up = CatalogCardField(required=False, allow_null=True)
+
     class Meta:
         model = CardPlayedInRound
         fields = ["card_face_up", "number_of_cards_face_down"]
@@ -61,7 +184,9 @@ class CardPlayedInRoundSerializerPost(serializers.ModelSerializer):  # type: ign
         return attrs
 
 
-class CardPlayedInRoundSerializerGet(serializers.ModelSerializer):  # type: ignore[misc]
+class CardPlayedInRoundSerializerGet(SparseModelSerializer):
+    card_face_up = CatalogCardField(source="card_face_up_id", read_only=True)
+
     class Meta:
         model = CardPlayedInRound
         fields = ["id", "player", "game_round", "card_face_up", "number_of_cards_face_down"]
@@ -72,9 +197,15 @@ class CardSerializerGet(serializers.ModelSerializer):  # type: ignore[misc]
         model = Card
         fields = ["id", "suit", "number"]
 
+    def to_representation(self, instance: Card) -> Any:
+        # code alone names the card, so the compact representation is not an object
+        if self.context.get("card_format") == "code":
+            return get_catalog().code(instance)
+        return super().to_representation(instance)
+
 
 class CardSerializerPost(serializers.Serializer):  # type: ignore[misc]
-    id = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all())
+    id = CatalogCardField()
 
     def update(self, instance: Any, validated_data: Any) -> Any:
         raise NotImplementedError("Update is not supported.")
@@ -91,3 +222,47 @@ class NumberOfCardsAddedSerializerPost(serializers.Serializer):  # type: ignore[
 
     def create(self, validated_data: Any) -> Any:
         raise NotImplementedError("Create is not supported.")
+
+
+class PlayerCardSerializerPost(serializers.Serializer):  # type: ignore[misc]
+    player = serializers.UUIDField()
+    card = CatalogCardField()
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise NotImplementedError("Update is not supported.")
+
+    def create(self, validated_data: Any) -> Any:
+        raise NotImplementedError("Create is not supported.")
+
+
+class RoundPlaySerializerPost(serializers.Serializer):  # type: ignore[misc]
+    player = serializers.UUIDField()
+    card_face_up = CatalogCardField(required=False, allow_null=True, default=None)
+    number_of_cards_face_down = serializers.ChoiceField(
+        choices=CardsPlayedFaceDown.choices, default=CardsPlayedFaceDown.ZERO
+    )
+
+    def validate(self, attrs):  # type: ignore[no-untyped-def]
+        CardPlayedInRound(
+            card_face_up=attrs["card_face_up"], number_of_cards_face_down=attrs["number_of_cards_face_down"]
+        ).clean()
+        return attrs
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise NotImplementedError("Update is not supported.")
+
+    def create(self, validated_data: Any) -> Any:
+        raise NotImplementedError("Create is not supported.")
+
+
+class RoundSubmitSerializerPost(serializers.Serializer):  # type: ignore[misc]
+    reveals = PlayerCardSerializerPost(many=True, required=False, default=list)
+    plays = RoundPlaySerializerPost(many=True, required=False, default=list)
+    retrieves = PlayerCardSerializerPost(many=True, required=False, default=list)
+    advance = serializers.BooleanField(required=False, default=False)
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise NotImplementedError("Update is not supported.")
+
+    def create(self, validated_data: Any) -> Any:
+        raise NotImplementedError("Create is not supported.")
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ReadOnlyAPISessionMiddleware(SessionMiddleware):
+    """Session middleware that never saves the session after safe requests to ``READ_ONLY_SESSION_PATHS``. API reads
+    only use the session to find the user, so saving it (always with SESSION_SAVE_EVERY_REQUEST, or a new cookie with
+    signed cookie sessions) is a wasted write. Other requests are handled by SessionMiddleware.
+    """
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if request.method not in SAFE_METHODS or not request.path_info.startswith(settings.READ_ONLY_SESSION_PATHS):
+            return super().process_response(request, response)
+        # set by process_request unless a middleware before this one answered the request
+        session = getattr(request, "session", None)
+        if session is not None and session.accessed:
+            patch_vary_headers(response, ("Cookie",))
+        return response
@@ -0,0 +1,263 @@
+# Monte Carlo play out of the rest of a chapter. The module does not use Django, so processes of the pool import it
+# as it is, set up of a simulation from a tracked game is in hand_inference.chapter_setup.
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+# samples played by one task of the pool, tasks are seeded from the seed in order, so results do not depend on the
+# number of processes
+CHUNK_SAMPLES = 500
+
+
+@dataclass(frozen=True)
+class ChapterSetup:
+    """Tracked state of a chapter, cards and players are indexes.
+
+    Every sample deals ``unknown_cards`` at random: ``hidden_slots[player]`` of them join cards known to be in the
+    hand, the rest stay out of hands (played face down or not dealt). Then the current round is finished and rounds
+    are played until hands are empty. A round is led with a random card face up, the others surpass with a random
+    higher card of the lead suit when they hold one and play a random card face down otherwise. The highest card of
+    the lead suit wins the round and its player leads the next one. Who holds the initiative is not tracked, so when
+    nobody played in the current round a random player leads it.
+    """
+
+    number_of_suits: int
+    card_suits: Tuple[int, ...]
+    card_ranks: Tuple[int, ...]
+    known_cards: Tuple[Tuple[int, ...], ...]
+    hidden_slots: Tuple[int, ...]
+    unknown_cards: Tuple[int, ...]
+    # (player, card played face up or None) in order of plays of the current round
+    round_plays: Tuple[Tuple[int, Optional[int]], ...] = ()
+
+    @property
+    def number_of_players(self) -> int:
+        return len(self.known_cards)
+
+
+@dataclass
+class SimulationTotals:
+    """Counts summed over samples, means are counts divided by ``samples``"""
+
+    samples: int
+    # per card: samples in which the card was played face up / won a round
+    card_played: npt.NDArray[np.int64]
+    card_wins: npt.NDArray[np.int64]
+    # per suit: rounds led with the suit, per suit and player: rounds won
+    suit_leads: npt.NDArray[np.int64]
+    suit_wins: npt.NDArray[np.int64]
+    # per player: samples in which the player holds the initiative when the chapter ends
+    initiative: npt.NDArray[np.int64]
+    elapsed: float = 0.0
+
+    @classmethod
+    def empty(cls, setup: ChapterSetup) -> "SimulationTotals":
+        number_of_cards = len(setup.card_suits)
+        return cls(
+            samples=0,
+            card_played=np.zeros(number_of_cards, dtype=np.int64),
+            card_wins=np.zeros(number_of_cards, dtype=np.int64),
+            suit_leads=np.zeros(setup.number_of_suits, dtype=np.int64),
+            suit_wins=np.zeros((setup.number_of_suits, setup.number_of_players), dtype=np.int64),
+            initiative=np.zeros(setup.number_of_players, dtype=np.int64),
+        )
+
+    def add(self, other: "SimulationTotals") -> None:
+        self.samples += other.samples
+        self.card_played += other.card_played
+        self.card_wins += other.card_wins
+        self.suit_leads += other.suit_leads
+        self.suit_wins += other.suit_wins
+        self.initiative += other.initiative
+
+
+@dataclass
+class _Round:
+    lead_suit: int = -1
+    best_rank: int = 0
+    winner: int = -1
+    winning_card: int = -1
+    played: List[bool] = field(default_factory=list)
+
+
+def _deal(setup: ChapterSetup, rng: np.random.Generator) -> List[List[int]]:
+    unknown = rng.permutation(np.array(setup.unknown_cards, dtype=np.int64)).tolist()
+    hands = []
+    for known, slots in zip(setup.known_cards, setup.hidden_slots):
+        # counts typed in by hand may claim more hidden cards than there are unknown cards
+        hands.append(list(known) + unknown[:slots])
+        unknown = unknown[slots:]
+    return hands
+
+
+def _play(setup: ChapterSetup, totals: SimulationTotals, hands: List[List[int]], rng: np.random.Generator) -> None:
+    def play_face_up(current: _Round, player: int, card: int) -> None:
+        totals.card_played[card] += 1
+        if current.lead_suit < 0:
+            current.lead_suit = setup.card_suits[card]
+            totals.suit_leads[current.lead_suit] += 1
+        if setup.card_suits[card] == current.lead_suit and setup.card_ranks[card] > current.best_rank:
+            current.best_rank, current.winner, current.winning_card = setup.card_ranks[card], player, card
+
+    def finish(current: _Round, leader: int) -> int:
+        for offset in range(1, setup.number_of_players):
+            player = (leader + offset) % setup.number_of_players
+            hand = hands[player]
+            if current.played[player] or not hand:
+                continue
+            surpassing = [
+                card
+                for card in hand
+                if setup.card_suits[card] == current.lead_suit and setup.card_ranks[card] > current.best_rank
+            ]
+            card = surpassing[rng.integers(len(surpassing))] if surpassing else hand[rng.integers(len(hand))]
+            hand.remove(card)
+            if surpassing:
+                play_face_up(current, player, card)
+        if current.winner < 0:
+            return leader
+        totals.card_wins[current.winning_card] += 1
+        totals.suit_wins[current.lead_suit, current.winner] += 1
+        return current.winner
+
+    current = _Round(played=[False] * setup.number_of_players)
+    for player, card in setup.round_plays:
+        current.played[player] = True
+        if card is not None:
+            play_face_up(current, player, card)
+    if setup.round_plays:
+        leader = setup.round_plays[0][0]
+    else:
+        with_cards = [player for player, hand in enumerate(hands) if hand]
+        if not with_cards:
+            return
+        leader = with_cards[rng.integers(len(with_cards))]
+        current.played[leader] = True
+        card = hands[leader].pop(rng.integers(len(hands[leader])))
+        play_face_up(current, leader, card)
+    leader = finish(current, leader)
+    while any(hands):
+        if not hands[leader]:
+            # the leader has no cards left, the next player with cards leads
+            leader = next(
+                (leader + offset) % setup.number_of_players
+                for offset in range(1, setup.number_of_players)
+                if hands[(leader + offset) % setup.number_of_players]
+            )
+        current = _Round(played=[player == leader for player in range(setup.number_of_players)])
+        play_face_up(current, leader, hands[leader].pop(rng.integers(len(hands[leader]))))
+        leader = finish(current, leader)
+    totals.initiative[leader] += 1
+
+
+def simulate_chunk(
+    setup: ChapterSetup, seed: np.random.SeedSequence, samples: int, deadline: Optional[float] = None
+) -> SimulationTotals:
+    """Plays out samples of the chapter with generator seeded by seed
+
+    :param setup: ChapterSetup object
+    :param seed: seed sequence of this chunk
+    :param samples: number of samples
+    :param deadline: time (time.time) after which no more samples are started
+    :return: SimulationTotals object
+    """
+    rng = np.random.default_rng(seed)
+    totals = SimulationTotals.empty(setup)
+    start = time.perf_counter()
+    for _ in range(samples):
+        if deadline is not None and time.time() >= deadline:
+            break
+        _play(setup, totals, _deal(setup, rng), rng)
+        totals.samples += 1
+    totals.elapsed = time.perf_counter() - start
+    return totals
+
+
+def run_simulation(
+    setup: ChapterSetup,
+    samples: int = 10_000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    time_limit: Optional[float] = None,
+) -> SimulationTotals:
+    """Plays out the chapter ``samples`` times across a pool of processes. The same seed and number of samples give
+    the same totals whatever the number of processes, unless the time limit stops the simulation earlier.
+
+    :param setup: ChapterSetup object
+    :param samples: sample budget
+    :param seed: seed of the simulation
+    :param workers: number of processes, all CPUs if not given, 1 runs in this process as do daemonic processes
+    :param time_limit: seconds after which no more samples are started
+    :return: SimulationTotals object, ``elapsed`` is wall time of the whole simulation
+    """
+    start = time.perf_counter()
+    deadline = time.time() + time_limit if time_limit is not None else None
+    chunks = [min(CHUNK_SAMPLES, samples - offset) for offset in range(0, samples, CHUNK_SAMPLES)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    workers = workers or os.cpu_count() or 1
+    totals = SimulationTotals.empty(setup)
+    # daemonic processes (e.g. of other pools) can not start processes, they simulate by themselves
+    if workers == 1 or multiprocessing.current_process().daemon:
+        results: Sequence[SimulationTotals] = [
+            simulate_chunk(setup, chunk_seed, chunk, deadline) for chunk_seed, chunk in zip(seeds, chunks)
+        ]
+    else:
+        # processes are spawned, forking a server with threads and open connections is not safe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(simulate_chunk, [setup] * len(chunks), seeds, chunks, [deadline] * len(chunks)))
+    for result in results:
+        totals.add(result)
+    totals.elapsed = time.perf_counter() - start
+    return totals
+
+
+@dataclass(frozen=True)
+class ScalingMeasurement:
+    workers: int
+    samples: int
+    elapsed: float
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.elapsed if self.elapsed else 0.0
+
+
+def measure_scaling(
+    setup: ChapterSetup, samples: int, worker_counts: Sequence[int], seed: int = 0
+) -> List[ScalingMeasurement]:
+    """Runs the same simulation with different numbers of processes and measures throughput
+
+    :param setup: ChapterSetup object
+    :param samples: sample budget of every run
+    :param worker_counts: numbers of processes
+    :param seed: seed of every run
+    :return: List of ScalingMeasurement objects
+    """
+    measurements = []
+    for workers in worker_counts:
+        totals = run_simulation(setup, samples=samples, seed=seed, workers=workers)
+        measurements.append(ScalingMeasurement(workers=workers, samples=totals.samples, elapsed=totals.elapsed))
+    return measurements
+
+
+def format_scaling(measurements: Sequence[ScalingMeasurement]) -> str:
+    """Formats throughput measurements as a table, speedup is relative to the first measurement
+
+    :param measurements: ScalingMeasurement objects
+    :return: report
+    """
+    base = measurements[0].samples_per_second if measurements else 0.0
+    lines = [f"{'workers':>7} {'samples':>8} {'seconds':>8} {'samples/s':>10} {'speedup':>7}"]
+    for measurement in measurements:
+        speedup = measurement.samples_per_second / base if base else 0.0
+        lines.append(
+            f"{measurement.workers:>7} {measurement.samples:>8} {measurement.elapsed:>8.2f} "
+            f"{measurement.samples_per_second:>10.0f} {speedup:>7.2f}"
+        )
+    return "\n".join(lines)
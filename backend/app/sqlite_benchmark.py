@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Mapping, Sequence
+
+from django.conf import settings
+
+from .load_test import LOCK_ERROR, percentile
+
+# options of DATABASES["default"] compared by the benchmark, the default one is what Django uses without OPTIONS
+SQLITE_PROFILES: Mapping[str, Mapping[str, Any]] = {
+    "default": {},
+    "production": settings.SQLITE_PRODUCTION_OPTIONS,
+}
+
+SCHEMA = (
+    "CREATE TABLE hand (id INTEGER PRIMARY KEY, number_of_cards INTEGER NOT NULL)",
+    "CREATE TABLE play (id INTEGER PRIMARY KEY, hand_id INTEGER NOT NULL, card INTEGER NOT NULL)",
+)
+
+
+@dataclass
+class WriteBenchmarkResult:
+    profile: str
+    threads: int
+    elapsed: float = 0.0
+    committed: int = 0
+    locked: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def commits_per_second(self) -> float:
+        return self.committed / self.elapsed if self.elapsed else 0.0
+
+
+def connect(path: Path, options: Mapping[str, Any]) -> sqlite3.Connection:
+    """Opens connection the way the SQLite backend of Django does with given OPTIONS: timeout and init_command are
+    applied on connection, transaction_mode is used by ``begin``
+
+    :param path: database file
+    :param options: OPTIONS of database settings
+    :return: connection in autocommit mode, transactions are started explicitly
+    """
+    connection = sqlite3.connect(path, timeout=options.get("timeout", 5.0), isolation_level=None)
+    for command in options.get("init_command", "").split(";"):
+        if command.strip():
+            connection.execute(command)
+    return connection
+
+
+def begin(connection: sqlite3.Connection, options: Mapping[str, Any]) -> None:
+    transaction_mode = options.get("transaction_mode")
+    connection.execute(f"BEGIN {transaction_mode}" if transaction_mode else "BEGIN")
+
+
+@dataclass
+class WriteBenchmark:
+    """Connections of one profile playing cards at the same time, each from its own hand"""
+
+    path: Path
+    options: Mapping[str, Any]
+    transactions: int
+    result: WriteBenchmarkResult
+    start: threading.Barrier
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def play_cards(self, hand_id: int) -> None:
+        """Plays cards in separate transactions shaped like playing a card through the API: the hand is read first
+        and then the play is inserted and the hand updated
+
+        :param hand_id: id of hand played from
+        :raises sqlite3.OperationalError: if a transaction fails for other reason than a locked database
+        """
+        connection = connect(self.path, self.options)
+        self.start.wait()
+        for card in range(self.transactions):
+            start = time.perf_counter()
+            try:
+                begin(connection, self.options)
+                (number_of_cards,) = connection.execute(
+                    "SELECT number_of_cards FROM hand WHERE id = ?", (hand_id,)
+                ).fetchone()
+                connection.execute("INSERT INTO play (hand_id, card) VALUES (?, ?)", (hand_id, card))
+                connection.execute("UPDATE hand SET number_of_cards = ? WHERE id = ?", (number_of_cards - 1, hand_id))
+                connection.execute("COMMIT")
+            except sqlite3.OperationalError as exc:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                if LOCK_ERROR not in str(exc):
+                    raise
+                with self.lock:
+                    self.result.locked += 1
+                continue
+            with self.lock:
+                self.result.committed += 1
+                self.result.latencies.append(time.perf_counter() - start)
+        connection.close()
+
+
+def run_write_benchmark(
+    directory: Path, profile: str, threads: int = 8, transactions: int = 200
+) -> WriteBenchmarkResult:
+    """Plays cards from many threads at the same time in a new database file with connections configured by profile
+
+    :param directory: directory for database file
+    :param profile: name of profile from SQLITE_PROFILES
+    :param threads: number of concurrent connections
+    :param transactions: transactions run by every connection
+    :return: WriteBenchmarkResult object
+    """
+    options = SQLITE_PROFILES[profile]
+    path = directory / f"sqlite_benchmark_{profile}.sqlite3"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    connection = connect(path, options)
+    for statement in SCHEMA:
+        connection.execute(statement)
+    connection.executemany(
+        "INSERT INTO hand (id, number_of_cards) VALUES (?, ?)", [(hand_id, 0) for hand_id in range(threads)]
+    )
+    connection.close()
+    benchmark = WriteBenchmark(
+        path=path,
+        options=options,
+        transactions=transactions,
+        result=WriteBenchmarkResult(profile=profile, threads=threads),
+        start=threading.Barrier(threads + 1),
+    )
+    workers = [threading.Thread(target=benchmark.play_cards, args=(hand_id,)) for hand_id in range(threads)]
+    for worker in workers:
+        worker.start()
+    benchmark.start.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    benchmark.result.elapsed = time.perf_counter() - start
+    return benchmark.result
+
+
+def format_write_benchmark(results: Sequence[WriteBenchmarkResult]) -> str:
+    """Formats results of profiles as a table
+
+    :param results: WriteBenchmarkResult objects
+    :return: report
+    """
+    lines = [
+        f"{'profile':<12} {'threads':>7} {'commits':>7} {'locked':>6} {'commits/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    ]
+    for result in results:
+        latencies = sorted(result.latencies)
+        lines.append(
+            f"{result.profile:<12} {result.threads:>7} {result.committed:>7} {result.locked:>6} "
+            f"{result.commits_per_second:>9.1f} "
+            + " ".join(f"{percentile(latencies, q) * 1000:>8.2f}" for q in (50, 99))
+        )
+    return "\n".join(lines)
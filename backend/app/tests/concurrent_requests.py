@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from django.db import OperationalError, connection
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# shared in-memory test database fails instead of waiting for locks (database table is locked), such requests are
+# sent again after RETRY_DELAY seconds as a client would do, at most MAX_RETRIES times and only for this error
+MAX_RETRIES = 100
+RETRY_DELAY = 0.01
+
+
+def is_table_locked(response: Any) -> bool:
+    exc_info = getattr(response, "exc_info", None)
+    return (
+        response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        and exc_info is not None
+        and isinstance(exc_info[1], OperationalError)
+        and "locked" in str(exc_info[1])
+    )
+
+
+def post_concurrently(
+    user: Any, requests: Sequence[Sequence[Tuple[str, Dict[str, Any]]]]
+) -> Tuple[List[int], List[int]]:
+    """Posts requests from a thread per sequence, requests of one thread are sent in order and all threads start at
+    once. Requests failed because the test database table was locked are sent again.
+
+    :param user: user the requests are authenticated as
+    :param requests: urls and data posted by every thread
+    :return: status codes of responses and numbers of times each request was sent again
+    """
+    statuses: List[int] = []
+    retries: List[int] = []
+    start = threading.Barrier(len(requests))
+
+    def post(thread_requests: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        # errors are reported as responses, the client would raise exceptions of requests sent by other threads
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(user=user)
+        start.wait()
+        try:
+            for url, data in thread_requests:
+                response = client.post(url, data)
+                sent_again = 0
+                while is_table_locked(response) and sent_again < MAX_RETRIES:
+                    time.sleep(RETRY_DELAY)
+                    response = client.post(url, data)
+                    sent_again += 1
+                statuses.append(response.status_code)
+                retries.append(sent_again)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=post, args=(thread_requests,)) for thread_requests in requests]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return statuses, retries
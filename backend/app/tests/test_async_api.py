@@ -0,0 +1,114 @@
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..models import CardPlayedInRound, Game, GameRound, Player
+
+User = get_user_model()
+
+
+class AsyncAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_url_pairs(self, game_id: uuid.UUID, player_id: uuid.UUID) -> list[tuple[str, str]]:
+        game_kwargs = {"game_id": str(game_id)}
+        player_kwargs = {"game_id": str(game_id), "player_id": str(player_id)}
+        return [
+            (reverse("games"), reverse("async-games")),
+            (reverse("games") + "?name=a", reverse("async-games") + "?name=a"),
+            (reverse("game-rounds", kwargs=game_kwargs), reverse("async-game-rounds", kwargs=game_kwargs)),
+            (reverse("latest-chapter", kwargs=game_kwargs), reverse("async-latest-chapter", kwargs=game_kwargs)),
+            (reverse("play-card", kwargs=player_kwargs), reverse("async-play-card", kwargs=player_kwargs)),
+            (
+                reverse("play-card", kwargs=player_kwargs) + "?chapter=1&round=1",
+                reverse("async-play-card", kwargs=player_kwargs) + "?chapter=1&round=1",
+            ),
+            (
+                reverse("cards-able-to-play", kwargs=player_kwargs),
+                reverse("async-cards-able-to-play", kwargs=player_kwargs),
+            ),
+        ]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+        CardPlayedInRound.objects.create(
+            player=players[0],
+            game_round=GameRound.objects.get(game=self.game),
+            card_face_up=get_catalog().cards_in(self.game.cards_not_played)[0],
+        )
+
+    def test_async_api_same_as_sync(self) -> None:
+        for sync_url, async_url in self.get_url_pairs(self.game.id, self.players[0].id):
+            with self.subTest(url=async_url):
+                sync_response = self.client.get(sync_url)
+                async_response = self.client.get(async_url)
+                self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+                self.assertEqual(async_response["Content-Type"], "application/json")
+                self.assertEqual(json.loads(async_response.content), json.loads(sync_response.content))
+                self.assertEqual(async_response.get("ETag"), sync_response.get("ETag"))
+
+    def test_async_api_not_modified(self) -> None:
+        for _, async_url in self.get_url_pairs(self.game.id, self.players[0].id)[1:]:
+            with self.subTest(url=async_url):
+                etag = self.client.get(async_url)["ETag"]
+                response = self.client.get(async_url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response["ETag"], etag)
+
+    def test_async_api_jwt(self) -> None:
+        client = APIClient()
+        token = client.post(reverse("token-obtain-pair"), {"username": "testuser", "password": "12345"}).data["access"]
+        response = client.get(reverse("async-games"), HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([game["id"] for game in json.loads(response.content)], [str(self.game.id)])
+
+    def test_async_api_not_authenticated(self) -> None:
+        response = APIClient().get(reverse("async-games"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(json.loads(response.content)["detail"], "Authentication credentials were not provided.")
+
+    def test_async_api_game_not_exists(self) -> None:
+        game = Game.objects.create(name="b", user=self.user_two)
+        response = self.client.get(reverse("async-latest-chapter", kwargs={"game_id": str(game.id)}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content)["detail"], f"game {game.id} does not exist")
+        response = self.client.get(reverse("async-games") + "?name=b")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content)["detail"], "game b does not exist")
+
+    def test_async_api_player_not_in_game(self) -> None:
+        player = Player.objects.create(nick="c", user=self.user)
+        response = self.client.get(
+            reverse("async-cards-able-to-play", kwargs={"game_id": str(self.game.id), "player_id": str(player.id)})
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content)["detail"], f"player {player.id} does not play in this game")
+
+    def test_async_api_invalid_chapter(self) -> None:
+        url = reverse("async-play-card", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)})
+        response = self.client.get(url + "?chapter=a")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content)["detail"], "chapter must be an integer")
+
+    def test_async_api_post_not_allowed(self) -> None:
+        response = self.client.post(reverse("async-games"), {"name": "c"})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
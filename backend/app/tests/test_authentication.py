@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..benchmark import SMALL, format_authentication_report, measure_authentication, seed_game
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        token = self.client.post(reverse("token-obtain-pair"), {"username": "testuser", "password": "12345"}).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+
+    def get_games(self) -> int:
+        return self.client.get(reverse("games")).status_code  # type: ignore[no-any-return]
+
+    def test_cached_jwt_user_not_read_on_every_request(self) -> None:
+        self.assertEqual(self.get_games(), status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_games(), status.HTTP_200_OK)
+        self.assertEqual([query["sql"] for query in queries if 'FROM "auth_user"' in query["sql"]], [])
+
+    def test_cached_jwt_user_usable_in_views(self) -> None:
+        response = self.client.post(reverse("players"), {"nick": "a"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(reverse("me")).data, {"username": "testuser"})
+
+    def test_cached_jwt_deactivated_user_rejected(self) -> None:
+        self.get_games()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_games(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_jwt_deleted_user_rejected(self) -> None:
+        self.get_games()
+        self.user.delete()
+        self.assertEqual(self.get_games(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_jwt_change_without_signal_seen_after_check_expires(self) -> None:
+        self.get_games()
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(self.get_games(), status.HTTP_200_OK)
+        with self.settings(API_AUTH_USER_CHECK_SECONDS=0):
+            self.assertEqual(self.get_games(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_jwt_benchmark(self) -> None:
+        seeded = seed_game(User.objects.create_user(username="small", password="12345"), "12345", SMALL)
+        measurements = {measurement.authenticator: measurement for measurement in measure_authentication(seeded, 5)}
+        report = format_authentication_report(list(measurements.values()))
+        self.assertEqual(measurements["cached jwt"].first_queries, 1, report)
+        self.assertEqual(measurements["cached jwt"].queries, 0, report)
+        self.assertEqual(measurements["jwt"].queries, 1, report)
+        self.assertEqual(measurements["session"].queries, 2, report)
@@ -0,0 +1,87 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..models import Card, CardNumber, CardSuit, Game, Player, PlayerHand
+
+User = get_user_model()
+
+
+class CardCodesAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.client.force_authenticate(user=self.user)
+        self.players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(self.players)
+            prepare_new_game(self.game)
+        self.player_kwargs = {"game_id": str(self.game.id), "player_id": str(self.players[0].id)}
+
+    def test_card_codes_are_unique_and_short(self) -> None:
+        catalog = get_catalog()
+        codes = [catalog.code(card) for card in catalog.cards]
+        self.assertEqual(len(set(codes)), len(catalog))
+        self.assertTrue(all(len(code) == 4 for code in codes))
+        card = Card.objects.get(suit=CardSuit.AGGRESSION, number=CardNumber.FIVE)
+        self.assertEqual(catalog.code(card), "AGG5")
+        self.assertEqual(catalog.get("AGG5"), card)
+        self.assertEqual(catalog.get(str(card.id)), card)
+
+    def test_card_codes_output(self) -> None:
+        catalog = get_catalog()
+        card = catalog.cards_in(self.game.cards_not_played)[0]
+        response = self.client.get(reverse("cards"), {"suit": card.suit, "number": card.number, "card_format": "code"})
+        self.assertEqual(response.data, [catalog.code(card)])
+        response = self.client.get(reverse("games"), {"name": "a", "card_format": "code"})
+        self.assertEqual(
+            response.data["cards_not_played"],
+            [catalog.code(card) for card in catalog.cards_in(self.game.cards_not_played)],
+        )
+        compact = self.client.get(reverse("game-state", kwargs={"game_id": str(self.game.id)}), {"card_format": "code"})
+        full = self.client.get(reverse("game-state", kwargs={"game_id": str(self.game.id)}))
+        self.assertLess(len(compact.content), len(full.content) / 4)
+        for url_name in ("cards-able-to-play", "async-cards-able-to-play"):
+            with self.subTest(url_name=url_name):
+                response = self.client.get(reverse(url_name, kwargs=self.player_kwargs), {"card_format": "code"})
+                self.assertTrue(all(isinstance(code, str) and len(code) == 4 for code in response.json()))
+
+    def test_card_codes_input(self) -> None:
+        catalog = get_catalog()
+        card = catalog.cards_in(self.game.cards_not_played)[0]
+        PlayerHand.objects.filter(game=self.game, player=self.players[0]).update(number_of_cards=3)
+        response = self.client.post(
+            reverse("play-card", kwargs=self.player_kwargs) + "?card_format=code",
+            {"card_face_up": catalog.code(card), "number_of_cards_face_down": 0},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["card_face_up"], catalog.code(card))
+        for url_name in ("play-card", "async-play-card"):
+            with self.subTest(url_name=url_name):
+                response = self.client.get(reverse(url_name, kwargs=self.player_kwargs), {"card_format": "code"})
+                self.assertEqual(json.loads(response.content)[0]["card_face_up"], catalog.code(card))
+                response = self.client.get(reverse(url_name, kwargs=self.player_kwargs))
+                self.assertEqual(json.loads(response.content)[0]["card_face_up"], str(card.id))
+        response = self.client.get(
+            reverse("game-state", kwargs={"game_id": str(self.game.id)}), {"card_format": "code"}
+        )
+        self.assertEqual(response.data["cards_played_in_round"][0]["card_face_up"], catalog.code(card))
+
+    def test_card_codes_invalid(self) -> None:
+        response = self.client.get(reverse("cards"), {"card_format": "short"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], "card_format must be one of: id, code")
+        response = self.client.post(
+            reverse("play-card", kwargs=self.player_kwargs), {"card_face_up": "AGG9", "number_of_cards_face_down": 0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
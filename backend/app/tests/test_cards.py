@@ -3,6 +3,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from ..cards_catalog import get_catalog
+
 User = get_user_model()
 
 
@@ -31,3 +33,17 @@ class CardsAPITests(APITestCase):  # type: ignore[misc]
         response = self.client.get(self.url, data)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data["detail"], "no card found")
+
+    def test_cards_get_ordered_by_suit_and_number(self) -> None:
+        response = self.client.get(self.url, {"suit": "AGGRESSION"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [card["number"] for card in response.data], ["ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN"]
+        )
+
+    def test_cards_get_does_not_query_cards(self) -> None:
+        get_catalog()
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
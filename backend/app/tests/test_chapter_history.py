@@ -0,0 +1,84 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..models import CardPlayedInRound, Game, GameRound, Player
+from ..views_logic import get_cards_played_by_round
+
+User = get_user_model()
+
+
+class ChapterHistoryAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_chapter_history_url(self, game_id: uuid.UUID, chapter: int) -> str:
+        return reverse("chapter-history", kwargs={"game_id": str(game_id), "chapter": chapter})
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b", "c", "d"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+
+    def play_rounds(self, first_round: int, last_round: int) -> None:
+        cards = get_catalog().cards_in(self.game.cards_not_played)
+        for _round in range(first_round, last_round + 1):
+            game_round, _ = GameRound.objects.get_or_create(game=self.game, chapter=1, round=_round)
+            for player in self.players:
+                CardPlayedInRound.objects.create(
+                    player=player, game_round=game_round, card_face_up=cards.pop(), number_of_cards_face_down=1
+                )
+
+    def test_chapter_history_get(self) -> None:
+        self.play_rounds(1, 2)
+        GameRound.objects.create(game=self.game, chapter=1, round=3)
+        response = self.client.get(self.get_chapter_history_url(self.game.id, 1))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["chapter"], 1)
+        self.assertEqual([_round["round"] for _round in response.data["rounds"]], [1, 2, 3])
+        self.assertEqual(len(response.data["rounds"][0]["cards_played"]), 4)
+        self.assertEqual(response.data["rounds"][0]["cards_played"][0]["number_of_cards_face_down"], 1)
+        self.assertEqual(response.data["rounds"][2]["cards_played"], [])
+
+    def test_chapter_history_get_constant_number_of_queries(self) -> None:
+        self.play_rounds(1, 1)
+        with self.assertNumQueries(2):
+            self.client.get(self.get_chapter_history_url(self.game.id, 1))
+        self.play_rounds(2, 6)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.get_chapter_history_url(self.game.id, 1))
+        self.assertEqual(len(response.data["rounds"]), 6)
+
+    def test_chapter_history_get_chapter_not_exists(self) -> None:
+        response = self.client.get(self.get_chapter_history_url(self.game.id, 2))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], "chapter 2 does not exist")
+
+    def test_chapter_history_get_game_not_exists(self) -> None:
+        game = Game.objects.create(name="a", user=self.user_two)
+        response = self.client.get(self.get_chapter_history_url(game.id, 1))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], f"game {game.id} does not exist")
+
+    def test_cards_played_by_round_constant_number_of_queries(self) -> None:
+        self.play_rounds(1, 5)
+        with self.assertNumQueries(2):
+            cards_played = get_cards_played_by_round(self.game, 1, 4)
+        self.assertEqual(len(cards_played["a"]), 4)
+        self.assertEqual(len(cards_played["a"][0]), 2)
+        self.assertEqual(cards_played["a"][0][1], "back.png")
@@ -0,0 +1,99 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..models import Game, Player
+
+User = get_user_model()
+
+
+class ConditionalGetAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_game_urls(self, game_id: uuid.UUID, player_id: uuid.UUID) -> list[str]:
+        game_kwargs = {"game_id": str(game_id)}
+        player_kwargs = {"game_id": str(game_id), "player_id": str(player_id)}
+        return [
+            reverse("game-state", kwargs=game_kwargs),
+            reverse("game-rounds", kwargs=game_kwargs),
+            reverse("latest-chapter", kwargs=game_kwargs),
+            reverse("chapter-history", kwargs={**game_kwargs, "chapter": 1}),
+            reverse("play-card", kwargs=player_kwargs),
+            reverse("cards-able-to-play", kwargs=player_kwargs),
+            "/api/games/?name=a",
+        ]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+
+    def test_conditional_get_not_modified(self) -> None:
+        get_catalog()
+        for url in self.get_game_urls(self.game.id, self.players[0].id):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response["ETag"], f'"{self.game.id}-0"')
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response["ETag"], f'"{self.game.id}-0"')
+
+    def test_conditional_get_gzipped_response(self) -> None:
+        url = reverse("game-state", kwargs={"game_id": str(self.game.id)})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        # GZipMiddleware weakens strong ETags of compressed bodies
+        self.assertEqual(response["ETag"], f'W/"{self.game.id}-0"')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'W/"{self.game.id}-1", "other"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conditional_get_modified(self) -> None:
+        url = reverse("game-state", kwargs={"game_id": str(self.game.id)})
+        etag = self.client.get(url)["ETag"]
+        card = get_catalog().cards_in(self.game.cards_not_played)[0]
+        self.client.post(
+            reverse("reveal-card", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)}),
+            {"id": card.id},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"{self.game.id}-1"')
+        self.assertEqual(response.data["players"][0]["revealed_cards"][0]["id"], str(card.id))
+
+    def test_conditional_get_version_bumped_by_web_actions(self) -> None:
+        self.client.force_login(self.user)
+        card = get_catalog().cards_in(self.game.cards_not_played)[0]
+        self.client.post(
+            f"/game/{self.game.id}/1/1/{self.players[0].id}", {"submit_type": "reveal_card", "card": str(card.id)}
+        )
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.version, 1)
+
+    def test_conditional_get_game_not_exists(self) -> None:
+        game = Game.objects.create(name="b", user=self.user_two)
+        response = self.client.get(
+            reverse("game-state", kwargs={"game_id": str(game.id)}), HTTP_IF_NONE_MATCH=f'"{game.id}-0"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], f"game {game.id} does not exist")
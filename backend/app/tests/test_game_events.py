@@ -0,0 +1,193 @@
+import uuid
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..game_events import SNAPSHOT_INTERVAL, build_game_state, load_game_state, record_event
+from ..models import Game, GameEvent, GameEventKind, GameSnapshot, Player, PlayerHand
+from ..views_logic import change_number_of_cards
+from .concurrent_requests import MAX_RETRIES, post_concurrently
+
+User = get_user_model()
+
+
+class GameEventsAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_hand_url(self, name: str, game_id: uuid.UUID, player_id: uuid.UUID) -> str:
+        return reverse(name, kwargs={"game_id": str(game_id), "player_id": str(player_id)})
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b", "c"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+
+    def test_game_events_replay_matches_tables(self) -> None:
+        cards = get_catalog().cards_in(self.game.cards_not_played)
+        a, b, c = self.players[0], self.players[1], self.players[2]
+        requests = [
+            ("play-card", a, {"card_face_up": cards[0].id, "number_of_cards_face_down": 1}),
+            ("retrieve-card", b, {"id": cards[0].id}),
+            ("reveal-card", c, {"id": cards[1].id}),
+            ("reveal-card", c, {"id": cards[2].id}),
+            ("unreveal-card", c, {"id": cards[1].id}),
+            ("add-card", a, {"number_of_cards": 3}),
+            ("play-card", b, {"number_of_cards_face_down": 2}),
+            ("play-card", c, {"card_face_up": cards[4].id}),
+        ]
+        for name, player, data in requests:
+            response = self.client.post(self.get_hand_url(name, self.game.id, player.id), data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse("create-round", kwargs={"game_id": str(self.game.id)}))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(self.get_hand_url("play-card", self.game.id, b.id), {"card_face_up": cards[3].id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.game.refresh_from_db()
+        self.assertEqual(
+            list(GameEvent.objects.filter(game=self.game).order_by("sequence").values_list("kind", flat=True)),
+            [
+                GameEventKind.CARD_PLAYED,
+                GameEventKind.CARD_RETRIEVED,
+                GameEventKind.CARD_REVEALED,
+                GameEventKind.CARD_REVEALED,
+                GameEventKind.CARD_UNREVEALED,
+                GameEventKind.CARDS_ADDED,
+                GameEventKind.CARD_PLAYED,
+                GameEventKind.CARD_PLAYED,
+                GameEventKind.ROUND_CREATED,
+                GameEventKind.CARD_PLAYED,
+            ],
+        )
+        self.assertEqual(load_game_state(self.game, use_cache=False), build_game_state(self.game))
+        self.assertEqual(load_game_state(self.game), build_game_state(self.game))
+
+    def test_game_events_sequence_after_concurrent_action(self) -> None:
+        card = get_catalog().cards_in(self.game.cards_not_played)[0]
+        player_id = self.players[1].id
+        bulk_create = GameEvent.objects.bulk_create
+
+        def bulk_create_after_concurrent_action(events: List[GameEvent], **kwargs: Any) -> List[GameEvent]:
+            # another action on the game is recorded after the reveal took its sequence and before it is inserted
+            if events[0].kind == GameEventKind.CARD_REVEALED:
+                game = Game.objects.get(id=self.game.id)
+                change_number_of_cards(PlayerHand.objects.get(game=game, player_id=player_id), 1)
+                record_event(game, GameEventKind.CARDS_ADDED, player_id=player_id, number_of_cards=1)
+            return bulk_create(events, **kwargs)
+
+        with mock.patch.object(GameEvent.objects, "bulk_create", side_effect=bulk_create_after_concurrent_action):
+            response = self.client.post(
+                self.get_hand_url("reveal-card", self.game.id, self.players[0].id), {"id": card.id}
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(GameEvent.objects.filter(game=self.game).order_by("sequence").values_list("sequence", "kind")),
+            [(1, GameEventKind.CARD_REVEALED), (2, GameEventKind.CARDS_ADDED)],
+        )
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.version, 2)
+        self.assertEqual(load_game_state(self.game, use_cache=False), build_game_state(self.game))
+
+    def test_game_events_rejected_action_not_recorded(self) -> None:
+        card = get_catalog().cards_in(self.game.cards_not_played)[0]
+        url = self.get_hand_url("play-card", self.game.id, self.players[0].id)
+        self.client.post(url, {"card_face_up": card.id})
+        response = self.client.post(url, {"card_face_up": card.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(GameEvent.objects.filter(game=self.game).count(), 1)
+        self.game.refresh_from_db()
+        self.assertEqual(load_game_state(self.game, use_cache=False), build_game_state(self.game))
+
+    def test_game_events_snapshot(self) -> None:
+        url = self.get_hand_url("add-card", self.game.id, self.players[0].id)
+        for _ in range(SNAPSHOT_INTERVAL + 3):
+            self.client.post(url, {"number_of_cards": 1})
+        self.assertEqual(
+            list(GameSnapshot.objects.filter(game=self.game).order_by("sequence").values_list("sequence", flat=True)),
+            [0, SNAPSHOT_INTERVAL],
+        )
+        snapshot = GameSnapshot.objects.get(game=self.game, sequence=SNAPSHOT_INTERVAL)
+        self.assertEqual(snapshot.state["hands"][str(self.players[0].id)]["number_of_cards"], 6 + SNAPSHOT_INTERVAL)
+        with self.assertNumQueries(2):
+            state = load_game_state(self.game, use_cache=False)
+        self.assertEqual(state["hands"][str(self.players[0].id)]["number_of_cards"], 6 + SNAPSHOT_INTERVAL + 3)
+        self.assertEqual(state, build_game_state(self.game))
+
+
+class GameStateCacheTests(TransactionTestCase):
+    """Folded states are cached only outside of transactions, so the wrapping transaction of TestCase can not be used"""
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def test_game_state_folded_in_rolled_back_transaction_not_cached(self) -> None:
+        user = User.objects.create_user(username="testuser", password="12345")
+        player = Player.objects.create(nick="a", user=user)
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=user)
+            game.players.set([player])
+            prepare_new_game(game)
+        with transaction.atomic():
+            record_event(game, GameEventKind.CARDS_ADDED, player_id=player.id, number_of_cards=2)
+            self.assertEqual(load_game_state(game)["hands"][str(player.id)]["number_of_cards"], 8)
+            transaction.set_rollback(True)
+        game.refresh_from_db()
+        self.assertEqual(load_game_state(game), build_game_state(game))
+
+
+class GameEventsConcurrencyTests(TransactionTestCase):
+
+    fixtures = ["app/initial_data/initial_data.json"]
+    threads_per_action = 3
+    requests_per_thread = 10
+
+    def test_game_events_concurrent_actions_get_consecutive_sequences(self) -> None:
+        user = User.objects.create_user(username="testuser", password="12345")
+        players = [Player.objects.create(nick=nick, user=user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=user)
+            game.players.set(players)
+            prepare_new_game(game)
+        cards = get_catalog().cards_in(game.cards_not_played)
+
+        def url(name: str, player: Player) -> str:
+            return reverse(name, kwargs={"game_id": str(game.id), "player_id": str(player.id)})
+
+        adds: List[Tuple[str, Dict[str, Any]]] = [
+            (url("add-card", players[0]), {"number_of_cards": 1})
+        ] * self.requests_per_thread
+        # every thread reveals and unreveals its own card
+        reveals: List[List[Tuple[str, Dict[str, Any]]]] = [
+            [
+                (url(name, players[1]), {"id": cards[thread].id})
+                for _ in range(self.requests_per_thread // 2)
+                for name in ["reveal-card", "unreveal-card"]
+            ]
+            for thread in range(self.threads_per_action)
+        ]
+        statuses, retries = post_concurrently(user, [adds] * self.threads_per_action + reveals)
+        number_of_requests = 2 * self.threads_per_action * self.requests_per_thread
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * number_of_requests)
+        self.assertLess(max(retries), MAX_RETRIES)
+        game.refresh_from_db()
+        self.assertEqual(game.version, number_of_requests)
+        self.assertEqual(
+            list(GameEvent.objects.filter(game=game).order_by("sequence").values_list("sequence", flat=True)),
+            list(range(1, number_of_requests + 1)),
+        )
+        self.assertEqual(load_game_state(game, use_cache=False), build_game_state(game))
@@ -0,0 +1,65 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..models import CardPlayedInRound, Game, GameRound, Player, PlayerHand
+
+User = get_user_model()
+
+
+class GameStateAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_game_state_url(self, game_id: uuid.UUID) -> str:
+        return reverse("game-state", kwargs={"game_id": str(game_id)})
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b", "c"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+
+    def test_game_state_get(self) -> None:
+        cards = get_catalog().cards_in(self.game.cards_not_played)
+        game_round = GameRound.objects.get(game=self.game)
+        CardPlayedInRound.objects.create(player=self.players[0], game_round=game_round, card_face_up=cards[0])
+        player_hand = PlayerHand.objects.get(game=self.game, player=self.players[1])
+        player_hand.cards = get_catalog().bit(cards[1])
+        player_hand.save()
+        response = self.client.get(self.get_game_state_url(self.game.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "a")
+        self.assertEqual(response.data["chapter"], 1)
+        self.assertEqual(response.data["round"], 1)
+        self.assertEqual([player["nick"] for player in response.data["players"]], ["a", "b", "c"])
+        self.assertEqual([player["number_of_cards"] for player in response.data["players"]], [6, 6, 6])
+        self.assertEqual(response.data["players"][1]["revealed_cards"][0]["id"], str(cards[1].id))
+        self.assertEqual(len(response.data["cards_not_played"]), 20)
+        self.assertEqual(response.data["cards_played_in_round"][0]["player"], self.players[0].id)
+        self.assertEqual(response.data["cards_played_in_round"][0]["card_face_up"], cards[0].id)
+
+    def test_game_state_get_number_of_queries(self) -> None:
+        get_catalog()
+        with self.assertNumQueries(3):
+            self.client.get(self.get_game_state_url(self.game.id))
+
+    def test_game_state_get_game_not_exists(self) -> None:
+        game = Game.objects.create(name="b", user=self.user_two)
+        response = self.client.get(self.get_game_state_url(game.id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], f"game {game.id} does not exist")
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..game_updates import GameUpdate, GameUpdateBackend, Subscription, get_backend
+from ..models import Game, Player
+
+User = get_user_model()
+
+
+def parse_server_sent_event(chunk: bytes) -> Tuple[str, Dict[str, Any]]:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+class PublishOnlyBackend(GameUpdateBackend):  # pylint: disable=abstract-method
+    def publish(self, game_id: uuid.UUID, update: GameUpdate) -> None:
+        pass
+
+
+class GameUpdatesAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_game_events_url(self, game_id: uuid.UUID) -> str:
+        return reverse("game-events", kwargs={"game_id": str(game_id)})
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        self.async_client.force_login(self.user)
+        players = []
+        for nick in ["a", "b"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = players
+        self.card = get_catalog().cards_in(self.game.cards_not_played)[0]
+
+    def reveal_card(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("reveal-card", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)}),
+                {"id": self.card.id},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    async def open_stream(self, **headers: str) -> AsyncIterator[bytes]:
+        response = await self.async_client.get(self.get_game_events_url(self.game.id), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream: AsyncIterator[bytes] = aiter(response.streaming_content)
+        return stream
+
+    async def test_game_events_stream(self) -> None:
+        stream = await self.open_stream()
+        event, state = parse_server_sent_event(await anext(stream))
+        self.assertEqual(event, "state")
+        self.assertEqual(state["id"], str(self.game.id))
+        self.assertEqual(len(state["cards_not_played"]), 20)
+        await sync_to_async(self.reveal_card)()
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        self.assertTrue(chunk.startswith(b"id: 1\n"))
+        event, delta = parse_server_sent_event(chunk)
+        self.assertEqual(event, "update")
+        self.assertEqual(
+            delta,
+            {
+                "version": 1,
+                "events": [{"kind": "CARD_REVEALED", "player": str(self.players[0].id), "card": str(self.card.id)}],
+            },
+        )
+        # server cancels the response when client disconnects
+        next_chunk = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        next_chunk.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await next_chunk
+        self.assertNotIn(self.game.id, get_backend().subscriptions)  # type: ignore[attr-defined]
+
+    @override_settings(GAME_UPDATES_KEEPALIVE=0.01)
+    async def test_game_events_stream_reconnect_with_current_version(self) -> None:
+        stream = await self.open_stream(last_event_id="0")
+        self.assertEqual(await anext(stream), b": keepalive\n\n")
+
+    async def test_game_events_stream_not_authenticated(self) -> None:
+        await self.async_client.alogout()
+        response = await self.async_client.get(self.get_game_events_url(self.game.id))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_game_events_stream_game_not_exists(self) -> None:
+        game = await Game.objects.acreate(name="b", user=self.user_two)
+        response = await self.async_client.get(self.get_game_events_url(game.id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content)["detail"], f"game {game.id} does not exist")
+
+    async def test_game_events_fan_out(self) -> None:
+        subscriptions = [get_backend().subscribe(self.game.id) for _ in range(3)]
+        get_backend().publish(self.game.id, GameUpdate(version=1, data="{}"))
+        for subscription in subscriptions:
+            self.assertEqual(await asyncio.wait_for(subscription.get(), 1), GameUpdate(version=1, data="{}"))
+            get_backend().unsubscribe(subscription)
+
+    async def test_game_events_lagged_subscription(self) -> None:
+        subscription = Subscription(self.game.id, asyncio.get_running_loop())
+        for version in range(subscription.queue.maxsize + 1):
+            subscription.put(GameUpdate(version=version, data="{}"))
+        self.assertEqual(await subscription.get(), None)
+        self.assertTrue(subscription.queue.empty())
+
+    def test_game_events_backend_not_implemented(self) -> None:
+        get_backend.cache_clear()
+        self.addCleanup(get_backend.cache_clear)
+        with override_settings(GAME_UPDATES_BACKEND="app.tests.test_game_updates.PublishOnlyBackend"):
+            with self.assertRaises(TypeError):
+                get_backend()
+
+    def test_game_events_published_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                self.client.post(
+                    reverse("play-card", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)}),
+                    {"card_face_up": self.card.id},
+                )
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.reveal_card()
+        self.assertEqual(len(callbacks), 1)
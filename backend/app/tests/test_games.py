@@ -2,10 +2,13 @@ import uuid
 from typing import Any
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from ..cards_catalog import get_catalog
 from ..models import Game, GameRound, Player, PlayerHand
 
 User = get_user_model()
@@ -37,7 +40,7 @@ class GameAPITests(APITestCase):  # type: ignore[misc]
                 response = self.client.post(self.url, new_data)
                 self.assertEqual(response.status_code, status.HTTP_201_CREATED)
                 game_object = Game.objects.filter(name=game_name, user=self.user).get()
-                self.assertEqual(game_object.cards_not_played.count(), number_of_cards)
+                self.assertEqual(len(get_catalog().cards_in(game_object.cards_not_played)), number_of_cards)
                 self.assertEqual(GameRound.objects.filter(game=game_object).count(), 1)
                 self.assertEqual(PlayerHand.objects.filter(game=game_object).count(), len(player_nicks))
 
@@ -78,6 +81,24 @@ class GameAPITests(APITestCase):  # type: ignore[misc]
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["name"], "a")
 
+    def test_game_get_same_queries_for_many_games(self) -> None:
+        players = list(Player.objects.filter(user=self.user, nick__in=["a", "b", "c"]))
+        user_many = User.objects.create_user(username="testuser_many", password="12345")
+        players_many = [Player.objects.create(nick=nick, user=user_many) for nick in ["a", "b", "c"]]
+        counts = []
+        for user, user_players, number_of_games in [(self.user, players, 5), (user_many, players_many, 500)]:
+            games = Game.objects.bulk_create(Game(name=str(number), user=user) for number in range(number_of_games))
+            Game.players.through.objects.bulk_create(
+                Game.players.through(game_id=game.id, player_id=player.id) for game in games for player in user_players
+            )
+            self.client.force_login(user)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, {"limit": 500})
+            self.assertEqual(len(response.data), number_of_games)
+            self.assertEqual(len(response.data[0]["players"]), 3)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
     def test_game_get_one(self) -> None:
         Game.objects.create(name="a", user=self.user)
         Game.objects.create(name="b", user=self.user_two)
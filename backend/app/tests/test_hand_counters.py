@@ -0,0 +1,79 @@
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..game_events import load_game_state
+from ..models import Game, Player, PlayerHand
+from .concurrent_requests import MAX_RETRIES, post_concurrently
+
+User = get_user_model()
+
+
+class HandCountersStressTests(TransactionTestCase):
+
+    fixtures = ["app/initial_data/initial_data.json"]
+    threads = 6
+    requests_per_thread = 10
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b", "c", "d"]]
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(self.players)
+            prepare_new_game(self.game)
+
+    def get_number_of_cards(self, player_id: uuid.UUID) -> int:
+        return PlayerHand.objects.get(game=self.game, player_id=player_id).number_of_cards
+
+    def get_url(self, name: str, player_id: uuid.UUID) -> str:
+        return reverse(name, kwargs={"game_id": str(self.game.id), "player_id": str(player_id)})
+
+    def test_hand_counters_concurrent_adds_not_lost(self) -> None:
+        player_id = self.players[0].id
+        url = self.get_url("add-card", player_id)
+        statuses, retries = post_concurrently(
+            self.user, [[(url, {"number_of_cards": 1})] * self.requests_per_thread] * self.threads
+        )
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * self.threads * self.requests_per_thread)
+        self.assertLess(max(retries), MAX_RETRIES)
+        self.assertEqual(self.get_number_of_cards(player_id), 6 + self.threads * self.requests_per_thread)
+        hand = load_game_state(Game.objects.get(id=self.game.id), use_cache=False)["hands"][str(player_id)]
+        self.assertEqual(hand["number_of_cards"], self.get_number_of_cards(player_id))
+
+    def test_hand_counters_concurrent_plays_and_retrieves_not_lost(self) -> None:
+        player_id = self.players[0].id
+        cards = get_catalog().cards_in(self.game.cards_not_played)
+        # other players play cards face up, so they can be retrieved into the hand of the first one
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        for player, card in zip(self.players[1:], cards):
+            response = client.post(self.get_url("play-card", player.id), {"card_face_up": card.id})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        adds: List[Tuple[str, Dict[str, Any]]] = [
+            (self.get_url("add-card", player_id), {"number_of_cards": 1})
+        ] * self.requests_per_thread
+        play: List[Tuple[str, Dict[str, Any]]] = [
+            (self.get_url("play-card", player_id), {"card_face_up": cards[3].id, "number_of_cards_face_down": 1})
+        ]
+        retrieves: List[List[Tuple[str, Dict[str, Any]]]] = [
+            [(self.get_url("retrieve-card", player_id), {"id": card.id})] for card in cards[:3]
+        ]
+        statuses, retries = post_concurrently(self.user, [adds] * (self.threads - 4) + [play] + retrieves)
+        number_of_adds = (self.threads - 4) * self.requests_per_thread
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * (number_of_adds + 4))
+        self.assertLess(max(retries), MAX_RETRIES)
+        # added and retrieved cards less the face up and face down ones played
+        self.assertEqual(self.get_number_of_cards(player_id), 6 + number_of_adds + 3 - 2)
+        hand = PlayerHand.objects.get(game=self.game, player_id=player_id)
+        self.assertEqual(get_catalog().cards_in(hand.cards), cards[:3])
+        state = load_game_state(Game.objects.get(id=self.game.id), use_cache=False)["hands"][str(player_id)]
+        self.assertEqual(state["number_of_cards"], hand.number_of_cards)
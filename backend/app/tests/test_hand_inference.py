@@ -0,0 +1,157 @@
+import time
+from typing import Any, Dict
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..game_events import load_game_state
+from ..hand_inference import chapter_setup, get_hand_inference, infer_hands
+from ..models import Game, Player
+
+User = get_user_model()
+
+
+class HandInferenceAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.client.force_authenticate(user=self.user)
+        self.players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b", "c", "d"]]
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(self.players)
+            prepare_new_game(self.game)
+        self.cards = get_catalog().cards_in(self.game.cards_not_played)
+        self.url = reverse("game-inference", kwargs={"game_id": str(self.game.id)})
+
+    def get_inference(self, **params: str) -> Dict[str, Any]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data  # type: ignore[no-any-return]
+
+    def post_card(self, url_name: str, player: Player, data: Dict[str, Any]) -> None:
+        response = self.client.post(
+            reverse(url_name, kwargs={"game_id": str(self.game.id), "player_id": str(player.id)}), data
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def assertConsistent(self, inference: Dict[str, Any]) -> None:  # pylint: disable=invalid-name
+        for player in inference["players"]:
+            self.assertAlmostEqual(sum(player["cards"].values()), player["number_of_cards"], places=2)
+        for card in self.cards:
+            total = inference["not_in_hands"].get(str(card.id), 0.0) + sum(
+                player["cards"].get(str(card.id), 0.0) for player in inference["players"]
+            )
+            self.assertIn(round(total, 2), (0.0, 1.0))
+
+    def test_hand_inference_new_game(self) -> None:
+        inference = self.get_inference()
+        self.assertEqual(len(self.cards), 28)
+        self.assertEqual([player["nick"] for player in inference["players"]], ["a", "b", "c", "d"])
+        for player in inference["players"]:
+            self.assertEqual(set(player["cards"].values()), {round(6 / 28, 4)})
+            self.assertEqual(len(player["cards"]), 28)
+        self.assertEqual(set(inference["not_in_hands"].values()), {round(4 / 28, 4)})
+        self.assertConsistent(inference)
+
+    def test_hand_inference_follows_reveals_and_plays(self) -> None:
+        revealed, played = self.cards[0], self.cards[1]
+        self.post_card("reveal-card", self.players[0], {"id": revealed.id})
+        self.post_card("play-card", self.players[1], {"card_face_up": played.id, "number_of_cards_face_down": 1})
+        inference = self.get_inference()
+        players = {player["nick"]: player for player in inference["players"]}
+        self.assertEqual(players["a"]["cards"][str(revealed.id)], 1.0)
+        for nick in ["b", "c", "d"]:
+            self.assertNotIn(str(revealed.id), players[nick]["cards"])
+        for player in players.values():
+            self.assertNotIn(str(played.id), player["cards"])
+        # 26 unknown cards: 5 hidden in a, 4 in b, 6 in c and d
+        unknown = str(self.cards[2].id)
+        self.assertEqual(
+            [players[nick]["cards"][unknown] for nick in ["a", "b", "c", "d"]],
+            [round(hidden / 26, 4) for hidden in [5, 4, 6, 6]],
+        )
+        self.assertConsistent(inference)
+
+    def test_hand_inference_revealed_card_played(self) -> None:
+        card = self.cards[0]
+        self.post_card("reveal-card", self.players[0], {"id": card.id})
+        self.post_card("play-card", self.players[0], {"card_face_up": card.id})
+        inference = self.get_inference()
+        players = {player["nick"]: player for player in inference["players"]}
+        self.assertEqual(players["a"]["number_of_cards"], 5)
+        for player in players.values():
+            self.assertNotIn(str(card.id), player["cards"])
+        self.assertEqual(inference["not_in_hands"][str(card.id)], 1.0)
+        # all 5 cards left in a are hidden among 27 unknown cards
+        self.assertEqual(players["a"]["cards"][str(self.cards[1].id)], round(5 / 27, 4))
+        self.assertConsistent(inference)
+        state = load_game_state(self.game, use_cache=False)
+        row = list(state["hands"]).index(str(self.players[0].id))
+        setup = chapter_setup(state)
+        self.assertEqual(setup.known_cards[row], ())
+        self.assertEqual(setup.hidden_slots[row], 5)
+
+    def test_hand_inference_card_codes(self) -> None:
+        inference = self.get_inference(card_format="code")
+        self.assertIn(get_catalog().code(self.cards[0]), inference["players"][0]["cards"])
+
+    def test_hand_inference_not_modified(self) -> None:
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_hand_inference_other_user_game(self) -> None:
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username="other", password="12345"))
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_hand_inference_fast_for_four_players(self) -> None:
+        state = load_game_state(self.game, use_cache=False)
+        card_bits = np.array([get_catalog().bit(card) for card in get_catalog().cards], dtype=np.int64)
+        start = time.perf_counter()
+        for _ in range(100):
+            infer_hands(state, card_bits)
+        self.assertLess((time.perf_counter() - start) / 100, 0.002)
+
+
+class HandInferenceCacheTests(TransactionTestCase):
+    """Inferences are cached only outside of transactions, so the wrapping transaction of TestCase can not be used"""
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def test_hand_inference_cached_per_version(self) -> None:
+        user = User.objects.create_user(username="testuser", password="12345")
+        players = [Player.objects.create(nick=nick, user=user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=user)
+            game.players.set(players)
+            prepare_new_game(game)
+        inference = get_hand_inference(game)
+        with self.assertNumQueries(0):
+            self.assertIs(get_hand_inference(game), inference)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(
+            reverse("add-card", kwargs={"game_id": str(game.id), "player_id": str(players[0].id)}),
+            {"number_of_cards": 1},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        game.refresh_from_db()
+        # only events recorded after the cached folded state are read
+        with self.assertNumQueries(1):
+            updated = get_hand_inference(game)
+        self.assertEqual(updated.version, inference.version + 1)
+        self.assertEqual(
+            dict(zip(updated.player_ids, updated.number_of_cards)), {str(players[0].id): 7, str(players[1].id): 6}
+        )
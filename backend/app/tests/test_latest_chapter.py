@@ -7,7 +7,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from ..api_views_logic import prepare_new_game
-from ..models import Game, Player
+from ..models import Game, GameRound, Player
 
 User = get_user_model()
 
@@ -37,6 +37,30 @@ class LatestChapterAPITests(APITestCase):  # type: ignore[misc]
         self.assertEqual(response.data["chapter"], 1)
         self.assertEqual(response.data["round"], 1)
 
+    def test_latest_chapter_get_rounds_created_out_of_order(self) -> None:
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=self.user)
+            game.players.set(Player.objects.all())
+            prepare_new_game(game)
+            GameRound.objects.create(game=game, chapter=2, round=3)
+            GameRound.objects.create(game=game, chapter=2, round=1)
+            GameRound.objects.create(game=game, chapter=1, round=5)
+        response = self.client.get(self.get_latest_chapter_url(game.id))
+        self.assertEqual(response.data["chapter"], 2)
+        self.assertEqual(response.data["round"], 3)
+
+    def test_latest_chapter_get_number_of_queries(self) -> None:
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=self.user)
+            game.players.set(Player.objects.all())
+            prepare_new_game(game)
+            for round_number in range(2, 20):
+                GameRound.objects.create(game=game, chapter=1, round=round_number)
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.get_latest_chapter_url(game.id))
+        self.assertEqual(response.data["round"], 19)
+
     def test_latest_chapter_game_not_exists(self) -> None:
         game = Game.objects.create(name="a", user=self.user_two)
         response = self.client.get(self.get_latest_chapter_url(game.id))
@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import LiveServerTestCase
+
+from ..load_test import LoadTestReport, RequestResult, percentile, run_load_test
+from ..models import Game, GameRound
+
+
+class LoadTestTests(LiveServerTestCase):
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def test_load_test_plays_games(self) -> None:
+        # live server of the test shares one in-memory database connection between threads, so games are played
+        # one after another here
+        for seed in range(2):
+            report = run_load_test(self.live_server_url, games=1, number_of_players=3, rounds=10, seed=seed)
+            self.assertEqual(report.failed_games, [])
+        self.assertEqual(Game.objects.count(), 2)
+        for game in Game.objects.all():
+            # rounds started by the simulation plus the first one
+            self.assertEqual(GameRound.objects.filter(game=game).count(), 11)
+        endpoints = {result.endpoint for result in report.results}
+        self.assertTrue({"register", "token", "create game", "state", "play", "new round"} <= endpoints)
+        self.assertGreater(report.requests_per_second, 0)
+
+    def test_load_test_plays_games_in_batches(self) -> None:
+        report = run_load_test(self.live_server_url, games=1, number_of_players=4, rounds=10, seed=3, batch=True)
+        self.assertEqual(report.failed_games, [])
+        game = Game.objects.get()
+        self.assertEqual(GameRound.objects.filter(game=game).count(), 11)
+        endpoints = {result.endpoint for result in report.results}
+        self.assertIn("submit round", endpoints)
+        self.assertNotIn("play", endpoints)
+
+    def test_load_test_polls(self) -> None:
+        for async_api in (False, True):
+            report = run_load_test(
+                self.live_server_url, games=1, number_of_players=2, rounds=2, seed=4, polls=3, async_api=async_api
+            )
+            self.assertEqual(report.failed_games, [])
+            polls = [result for result in report.results if result.endpoint.startswith("poll")]
+            self.assertEqual(len(polls), 15)
+
+    def test_load_test_command(self) -> None:
+        out = StringIO()
+        call_command("load_test", url=self.live_server_url, games=1, players=2, rounds=3, stdout=out)
+        self.assertIn("requests/s", out.getvalue())
+        self.assertIn("0 failed games", out.getvalue())
+
+    def test_load_test_percentile(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_load_test_report_counts_server_errors(self) -> None:
+        report = LoadTestReport(
+            elapsed=1.0,
+            results=[
+                RequestResult(endpoint="play", status=201, latency=0.01),
+                RequestResult(endpoint="play", status=400, latency=0.01),
+                # lock errors of servers without DEBUG=True are not recognised
+                RequestResult(endpoint="play", status=500, latency=0.01),
+                RequestResult(endpoint="play", status=500, latency=0.01, locked=True),
+            ],
+        )
+        lines = report.format().splitlines()
+        self.assertEqual(lines[1].split()[:5], ["play", "4", "3", "2", "1"])
+        self.assertIn("2 server errors (1 database is locked", lines[-1])
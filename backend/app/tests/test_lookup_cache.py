@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..api_views_logic import prepare_new_game
+from ..lookup_cache import lookup_cache
+from ..models import Game, Player
+
+User = get_user_model()
+
+
+@override_settings(API_LOOKUP_CACHE_SIZE=256)
+class LookupCacheTests(TransactionTestCase):
+    """Lookups are cached only outside of transactions, so the wrapping transaction of TestCase can not be used"""
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(self.players)
+            prepare_new_game(self.game)
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(user=self.user)
+        lookup_cache.clear()
+        self.addCleanup(lookup_cache.clear)
+        self.url = reverse(
+            "cards-able-to-play", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)}
+        )
+
+    def test_lookup_cache_warm_request_skips_lookups(self) -> None:
+        with self.assertNumQueries(2):
+            cold = self.api_client.get(self.url)
+        with self.assertNumQueries(0):
+            warm = self.api_client.get(self.url)
+        self.assertEqual(warm.status_code, status.HTTP_200_OK)
+        self.assertEqual(warm.json(), cold.json())
+        self.assertEqual(lookup_cache.stats(), {"size": 2, "hits": 2, "misses": 2})
+
+    def test_lookup_cache_invalidated_by_game_change(self) -> None:
+        self.api_client.get(self.url)
+        response = self.api_client.post(
+            reverse("add-card", kwargs={"game_id": str(self.game.id), "player_id": str(self.players[0].id)}),
+            {"number_of_cards": 2},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(lookup_cache.stats()["size"], 0)
+        response = self.api_client.get(reverse("game-state", kwargs={"game_id": str(self.game.id)}))
+        self.assertEqual([player["number_of_cards"] for player in response.json()["players"]], [8, 6])
+
+    def test_lookup_cache_game_not_shared_between_users(self) -> None:
+        self.api_client.get(self.url)
+        other_user = User.objects.create_user(username="otheruser", password="12345")
+        client = APIClient()
+        client.force_authenticate(user=other_user)
+        response = client.get(reverse("game-state", kwargs={"game_id": str(self.game.id)}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_lookup_cache_not_used_by_conditional_get(self) -> None:
+        url = reverse("game-state", kwargs={"game_id": str(self.game.id)})
+        etag = self.api_client.get(url)["ETag"]
+        # another process changes the game, this process keeps its cached row
+        Game.objects.filter(id=self.game.id).update(version=F("version") + 1)
+        self.assertEqual(lookup_cache.stats()["size"], 1)
+        response = self.api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(API_LOOKUP_CACHE_SIZE=0)
+    def test_lookup_cache_disabled(self) -> None:
+        self.api_client.get(self.url)
+        with self.assertNumQueries(2):
+            self.api_client.get(self.url)
+        self.assertEqual(lookup_cache.stats()["size"], 0)
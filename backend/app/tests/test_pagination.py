@@ -0,0 +1,158 @@
+import datetime
+import re
+import uuid
+from typing import Any, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..models import Game, GameRound, Player
+from ..pagination import encode_cursor
+
+User = get_user_model()
+
+
+class PaginationAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_next_url(self, response: Any) -> Optional[str]:
+        if "Link" not in response:
+            return None
+        match = re.fullmatch(r'<(.+)>; rel="next"', response["Link"])
+        assert match is not None
+        return match.group(1)
+
+    def get_all_pages(self, url: str) -> List[List[Any]]:
+        pages = []
+        next_url: Optional[str] = url
+        while next_url is not None:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.json())
+            next_url = self.get_next_url(response)
+        return pages
+
+    def create_games(self, user: Any, number_of_games: int) -> List[Game]:
+        games = [Game.objects.create(name=f"game {number}", user=user) for number in range(number_of_games)]
+        start = timezone.now() - datetime.timedelta(days=number_of_games)
+        for number, game in enumerate(games):
+            # same creation time for pairs of games, ties are ordered by id
+            game.created_time = start + datetime.timedelta(days=number // 2)
+            Game.objects.filter(id=game.id).update(created_time=game.created_time)
+        return sorted(games, key=lambda game: (game.created_time, game.id))
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+
+    def test_pagination_games(self) -> None:
+        games = self.create_games(self.user, 5)
+        self.create_games(self.user_two, 2)
+        pages = self.get_all_pages(reverse("games") + "?limit=2")
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual([game["id"] for page in pages for game in page], [str(game.id) for game in games])
+
+    def test_pagination_games_next_link_keeps_filters(self) -> None:
+        games = self.create_games(self.user, 5)
+        Game.objects.filter(id__in=[games[1].id, games[2].id, games[4].id]).update(finished=True)
+        response = self.client.get(reverse("games"), {"limit": 1, "finished": "true"})
+        self.assertIn("finished=true", response["Link"])
+        self.assertIn("limit=1", response["Link"])
+        pages = self.get_all_pages(reverse("games") + "?limit=1&finished=true")
+        self.assertEqual(
+            [game["id"] for page in pages for game in page], [str(games[1].id), str(games[2].id), str(games[4].id)]
+        )
+
+    def test_pagination_games_created_time_filters(self) -> None:
+        games = self.create_games(self.user, 6)
+        response = self.client.get(
+            reverse("games"),
+            {"created_after": games[2].created_time.isoformat(), "created_before": games[4].created_time.date()},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([game["id"] for game in response.data], [str(games[2].id), str(games[3].id)])
+        self.assertNotIn("Link", response)
+
+    def test_pagination_default_page_size(self) -> None:
+        with self.settings(API_PAGE_SIZE=3):
+            self.create_games(self.user, 5)
+            cursor = re.search(r"cursor=([^&>]+)", self.client.get(reverse("games"), {"limit": 1})["Link"])
+            assert cursor is not None
+            response = self.client.get(reverse("games"), {"cursor": cursor.group(1)})
+            self.assertEqual(len(response.data), 3)
+            self.assertIn("Link", response)
+
+    def test_pagination_not_paged_without_params(self) -> None:
+        with self.settings(API_PAGE_SIZE=3):
+            games = self.create_games(self.user, 5)
+            for url_name in ["games", "async-games"]:
+                with self.subTest(url_name=url_name):
+                    response = self.client.get(reverse(url_name))
+                    self.assertEqual([game["id"] for game in response.json()], [str(game.id) for game in games])
+                    self.assertNotIn("Link", response)
+
+    def test_pagination_same_queries_whatever_number_of_rows(self) -> None:
+        self.create_games(self.user, 3)
+        self.create_games(self.user_two, 30)
+        counts = []
+        for user in (self.user, self.user_two):
+            self.client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("games"), {"limit": 2})
+            self.assertEqual(len(response.data), 2)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_pagination_players(self) -> None:
+        players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b", "c"]]
+        pages = self.get_all_pages(reverse("players") + "?limit=2")
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual([player["id"] for page in pages for player in page], [str(player.id) for player in players])
+
+    def test_pagination_game_rounds(self) -> None:
+        players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            game = Game.objects.create(name="a", user=self.user)
+            game.players.set(players)
+            prepare_new_game(game)
+        for chapter, _round in [(2, 1), (1, 3), (1, 2), (2, 2)]:
+            GameRound.objects.create(game=game, chapter=chapter, round=_round)
+        pages = self.get_all_pages(reverse("game-rounds", kwargs={"game_id": str(game.id)}) + "?limit=2")
+        self.assertEqual(
+            [(game_round["chapter"], game_round["round"]) for page in pages for game_round in page],
+            [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2)],
+        )
+        async_pages = self.get_all_pages(reverse("async-game-rounds", kwargs={"game_id": str(game.id)}) + "?limit=2")
+        self.assertEqual(async_pages, pages)
+
+    def test_pagination_async_games(self) -> None:
+        self.create_games(self.user, 3)
+        self.assertEqual(
+            self.get_all_pages(reverse("async-games") + "?limit=2"), self.get_all_pages(reverse("games") + "?limit=2")
+        )
+
+    def test_pagination_invalid_params(self) -> None:
+        test_cases = [
+            ({"cursor": "abc"}, "invalid cursor"),
+            ({"cursor": "WyJhIiwgImIiXQ"}, "invalid cursor"),
+            ({"cursor": encode_cursor([{"a": 1}, "x"])}, "invalid cursor"),
+            ({"cursor": encode_cursor([[1], str(uuid.uuid4())])}, "invalid cursor"),
+            ({"limit": "a"}, "limit must be an integer"),
+            ({"limit": "0"}, "limit must be from 1 to 1000"),
+            ({"finished": "maybe"}, "finished must be true or false"),
+            ({"created_after": "yesterday"}, "created_after must be a date or datetime"),
+        ]
+        for params, detail in test_cases:
+            with self.subTest(params=params):
+                response = self.client.get(reverse("games"), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data["detail"], detail)
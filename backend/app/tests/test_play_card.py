@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
 from ..models import CardPlayedInRound, Game, GameRound, Player
 
 User = get_user_model()
@@ -87,8 +88,7 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_id = self.get_player_id("a", self.user)
         data = {"card_face_up": card.id}
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -105,8 +105,7 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_already_played(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_id = self.get_player_id("a", self.user)
         data = {"card_face_up": card.id}
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -118,8 +117,7 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_card_was_already_played(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_id = self.get_player_id("a", self.user)
         data = {"card_face_up": card.id}
         self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -132,8 +130,7 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_wrong_number_of_cards_one(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_id = self.get_player_id("a", self.user)
         data = {"card_face_up": card.id, "number_of_cards_face_down": 2}
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -146,8 +143,6 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_wrong_number_of_cards_two(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
         player_id = self.get_player_id("a", self.user)
         data = {"number_of_cards_face_down": 3}
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -157,8 +152,6 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_wrong_number_of_cards_three(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
         player_id = self.get_player_id("a", self.user)
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), {})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -167,8 +160,7 @@ class CardPlayedInRoundAPITests(APITestCase):  # type: ignore[misc]
     def test_play_card_post_wrong_player(self) -> None:
         game = Game.objects.first()
         assert game is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_id = self.get_player_id("e", self.user)
         data = {"card_face_up": card.id}
         response = self.client.post(self.get_card_played_in_round_url(game.id, player_id), data)
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from ..benchmark import LARGE, SMALL, app_routes, covered_routes, format_report, measure_routes, seed_game
+from ..cards_catalog import get_catalog
+
+User = get_user_model()
+
+
+class QueryBudgetTests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.small = seed_game(User.objects.create_user(username="small", password="12345"), "12345", SMALL)
+        self.large = seed_game(User.objects.create_user(username="large", password="12345"), "12345", LARGE)
+
+    def test_query_budget_all_routes_covered(self) -> None:
+        self.assertEqual(set(app_routes()) - set(covered_routes(self.small)), set())
+
+    def test_query_budget(self) -> None:
+        small_measurements = measure_routes(self.client, self.small)
+        large_measurements = measure_routes(self.client, self.large)
+        report = format_report(small_measurements + large_measurements)
+        for small, large in zip(small_measurements, large_measurements):
+            route = small.route
+            with self.subTest(route=route.name):
+                self.assertLess(small.status_code, 400, report)
+                self.assertLess(large.status_code, 400, report)
+                self.assertLessEqual(large.queries, route.budget, report)
+                if not route.scales_with_data:
+                    self.assertEqual(small.queries, large.queries, report)
+
+    def test_query_budget_cards_never_read_from_database(self) -> None:
+        # cards are ordered and looked up in the catalog, so once it is loaded no route reads the card table
+        get_catalog()
+        with CaptureQueriesContext(connection) as queries:
+            measurements = measure_routes(self.client, self.large)
+        card_queries = [query["sql"] for query in queries.captured_queries if 'FROM "app_card"' in query["sql"]]
+        self.assertEqual(card_queries, [], format_report(measurements))
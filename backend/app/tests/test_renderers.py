@@ -0,0 +1,85 @@
+import datetime
+import decimal
+import gzip
+import io
+import json
+import uuid
+from unittest import mock
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from .. import renderers
+from ..benchmark import LARGE, format_rendering_report, measure_rendering, seed_game
+from ..renderers import FastJSONParser, FastJSONRenderer
+
+User = get_user_model()
+
+
+class RenderersTests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.client.force_authenticate(user=self.user)
+
+    def test_renderers_same_output_as_drf(self) -> None:
+        data = {
+            "id": uuid.uuid4(),
+            "time": timezone.now(),
+            "date": datetime.date(2025, 1, 2),
+            "amount": decimal.Decimal("1.50"),
+            "detail": ErrorDetail("invalid", code="invalid"),
+            "nested": [{"text": "zażółć  "}, (1, 2), None, True],
+        }
+        expected = JSONRenderer().render(data)
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+        self.assertEqual(FastJSONRenderer().render({"a": 1}, "application/json; indent=2"), b'{\n  "a": 1\n}')
+
+    def test_renderers_parser(self) -> None:
+        body = json.dumps({"name": "zażółć", "players": [1, 2]}).encode()
+        for orjson_module in (orjson, None):
+            with self.subTest(orjson=orjson_module is not None), mock.patch.object(renderers, "orjson", orjson_module):
+                self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), {"name": "zażółć", "players": [1, 2]})
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(b'{"name": '))
+
+    def test_renderers_api(self) -> None:
+        response = self.client.post(reverse("players"), {"nick": "a"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {"nick": "a"})
+        response = self.client.post(reverse("players"), b'{"nick": ', content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.json()["detail"].startswith("JSON parse error"))
+
+    def test_renderers_gzip_large_bodies(self) -> None:
+        response = self.client.get(reverse("cards"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.client.get(reverse("cards")).json())
+        response = self.client.get(reverse("players"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", response)
+        with self.settings(API_GZIP_MIN_LENGTH=None):
+            response = self.client.get(reverse("cards"), HTTP_ACCEPT_ENCODING="gzip")
+            self.assertNotIn("Content-Encoding", response)
+
+    def test_renderers_benchmark(self) -> None:
+        seeded = seed_game(User.objects.create_user(username="large", password="12345"), "12345", LARGE)
+        measurements = measure_rendering(APIClient(), seeded, repeat=2)
+        report = format_rendering_report(measurements)
+        for drf, fast in zip(measurements[::2], measurements[1::2]):
+            with self.subTest(route=drf.route.name):
+                self.assertEqual((drf.renderer, fast.renderer), ("drf json", "fast json"))
+                self.assertEqual(drf.body_bytes, fast.body_bytes, report)
+                self.assertGreater(drf.body_bytes, 500, report)
+                self.assertLess(drf.gzip_bytes, drf.body_bytes, report)
@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
 from ..models import CardPlayedInRound, Game, GameRound, Player, PlayerHand
 
 User = get_user_model()
@@ -44,12 +45,11 @@ class RetrieveCardAPITests(APITestCase):  # type: ignore[misc]
         players = game.players.all()
         player = players[0]
         player_two = players[1]
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         CardPlayedInRound.objects.create(player=player, game_round=game_round, card_face_up=card)
         response = self.client.post(self.get_retrieve_card_url(game.id, player_two.id), {"id": card.id})
         player_hand = PlayerHand.objects.get(game=game, player_id=player_two.id)
-        player_cards = player_hand.cards.all()
+        player_cards = get_catalog().cards_in(player_hand.cards)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(player_hand.number_of_cards, 7)
         self.assertEqual(len(player_cards), 1)
@@ -63,8 +63,7 @@ class RetrieveCardAPITests(APITestCase):  # type: ignore[misc]
         players = game.players.all()
         player = players[0]
         player_two = players[1]
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         CardPlayedInRound.objects.create(player=player, game_round=game_round, card_face_up=card)
         self.client.post(self.get_retrieve_card_url(game.id, player.id), {"id": card.id})
         response = self.client.post(self.get_retrieve_card_url(game.id, player_two.id), {"id": card.id})
@@ -78,8 +77,7 @@ class RetrieveCardAPITests(APITestCase):  # type: ignore[misc]
         assert game_round is not None
         player = game.players.first()
         assert player is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         CardPlayedInRound.objects.create(player=player, game_round=game_round, card_face_up=card)
         GameRound.objects.create(game=game, chapter=2, round=1)
         response = self.client.post(self.get_retrieve_card_url(game.id, player.id), {"id": card.id})
@@ -93,8 +91,7 @@ class RetrieveCardAPITests(APITestCase):  # type: ignore[misc]
         assert game_round is not None
         player = game.players.first()
         assert player is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         CardPlayedInRound.objects.create(player=player, game_round=game_round, card_face_up=card)
         GameRound.objects.create(game=game, chapter=1, round=2)
         response = self.client.post(self.get_retrieve_card_url(game.id, player.id), {"id": card.id})
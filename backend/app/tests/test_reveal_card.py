@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
 from ..models import Game, GameRound, Player, PlayerHand
 
 User = get_user_model()
@@ -43,16 +44,16 @@ class RevealCardAPITests(APITestCase):  # type: ignore[misc]
         assert game_round is not None
         players = game.players.all()
         player = players[0]
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         response = self.client.post(self.get_reveal_card_url(game.id, player.id), {"id": card.id})
         player_hand = PlayerHand.objects.get(game=game, player_id=player.id)
-        player_cards = player_hand.cards.all()
+        player_cards = get_catalog().cards_in(player_hand.cards)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(player_hand.number_of_cards, 6)
         self.assertEqual(len(player_cards), 1)
         self.assertEqual(player_cards[0].id, card.id)
-        self.assertEqual(len(game.cards_not_played.all()), 19)
+        game.refresh_from_db()
+        self.assertEqual(len(get_catalog().cards_in(game.cards_not_played)), 19)
 
     def test_reveal_card_post_already_played(self) -> None:
         game = Game.objects.first()
@@ -62,8 +63,7 @@ class RevealCardAPITests(APITestCase):  # type: ignore[misc]
         players = game.players.all()
         player = players[0]
         player_two = players[1]
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         self.client.post(self.get_reveal_card_url(game.id, player.id), {"id": card.id})
         response = self.client.post(self.get_reveal_card_url(game.id, player_two.id), {"id": card.id})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
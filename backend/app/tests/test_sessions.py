@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..benchmark import SMALL, format_sessions_report, measure_sessions, seed_game
+
+User = get_user_model()
+
+
+class SessionsTests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="testuser", password="12345")
+
+    def test_sessions_not_saved_by_safe_api_requests(self) -> None:
+        with override_settings(SESSION_SAVE_EVERY_REQUEST=True):
+            client = APIClient()
+            client.force_login(self.user)
+            response = client.get(reverse("me"))
+            self.assertEqual(response.data, {"username": "testuser"})
+            self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+            self.assertIn("Cookie", response["Vary"])
+            response = client.post(reverse("players"), {"nick": "a"})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    @override_settings(SESSION_ENGINE=settings.SESSION_ENGINES["signed_cookies"])
+    def test_sessions_signed_cookies_login_and_logout(self) -> None:
+        client = APIClient()
+        response = client.post("/api/login/", {"username": "testuser", "password": "12345"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(client.get(reverse("me")).data, {"username": "testuser"})
+        client.post("/api/logout/")
+        self.assertEqual(client.get(reverse("me")).data, {"username": None})
+
+    def test_sessions_benchmark(self) -> None:
+        seeded = seed_game(User.objects.create_user(username="small", password="12345"), "12345", SMALL)
+        measurements = measure_sessions(seeded)
+        report = format_sessions_report(measurements)
+        by_engine = {
+            engine: [measurement for measurement in measurements if measurement.engine == engine]
+            for engine in settings.SESSION_ENGINES
+        }
+        self.assertEqual([measurement.session_queries for measurement in by_engine["db"]], [1, 1, 1], report)
+        for engine in ("cached_db", "signed_cookies"):
+            with self.subTest(engine=engine):
+                self.assertEqual([measurement.session_queries for measurement in by_engine[engine]], [0, 0, 0], report)
+                self.assertEqual(
+                    [measurement.queries + 1 for measurement in by_engine[engine]],
+                    [measurement.queries for measurement in by_engine["db"]],
+                    report,
+                )
+        measurements = measure_sessions(seeded, save_every_request=True)
+        report = format_sessions_report(measurements)
+        for measurement in measurements:
+            with self.subTest(route=measurement.route.name, engine=measurement.engine):
+                # pages save the session on every request, API reads never do
+                self.assertEqual(measurement.sets_cookie, not measurement.route.path.startswith("/api/"), report)
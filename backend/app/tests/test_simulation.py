@@ -0,0 +1,94 @@
+import io
+import json
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..game_events import load_game_state
+from ..hand_inference import chapter_setup
+from ..models import Game, Player
+from ..simulation import ChapterSetup, format_scaling, measure_scaling, run_simulation
+
+User = get_user_model()
+
+# two suits of three cards, player 0 holds card 0 and one hidden card, player 1 holds two hidden cards, card 5 was
+# played face up in the current round by player 1
+SETUP = ChapterSetup(
+    number_of_suits=2,
+    card_suits=(0, 0, 0, 1, 1, 1),
+    card_ranks=(1, 2, 3, 1, 2, 3),
+    known_cards=((0,), ()),
+    hidden_slots=(1, 2),
+    unknown_cards=(1, 2, 3, 4),
+    round_plays=((1, 5),),
+)
+
+
+class SimulationTests(SimpleTestCase):
+
+    def test_simulation_deterministic_whatever_the_number_of_processes(self) -> None:
+        single = run_simulation(SETUP, samples=1200, seed=7, workers=1)
+        pooled = run_simulation(SETUP, samples=1200, seed=7, workers=2)
+        self.assertEqual(single.samples, 1200)
+        for name in ("card_played", "card_wins", "suit_leads", "suit_wins", "initiative"):
+            with self.subTest(name=name):
+                np.testing.assert_array_equal(getattr(single, name), getattr(pooled, name))
+        other_seed = run_simulation(SETUP, samples=1200, seed=8, workers=1)
+        self.assertFalse(np.array_equal(single.card_played, other_seed.card_played))
+
+    def test_simulation_outcomes_consistent(self) -> None:
+        totals = run_simulation(SETUP, samples=1000, seed=0, workers=1)
+        # the current round is led by player 1 with card 5, nobody can surpass the three
+        self.assertEqual(totals.card_played[5], 1000)
+        self.assertEqual(totals.card_wins[5], 1000)
+        # player 1 still holds two cards, so two more rounds are played and every round led face up is won
+        self.assertEqual(totals.suit_leads.sum(), 3000)
+        self.assertEqual(totals.suit_wins.sum(), 3000)
+        self.assertEqual(totals.initiative.sum(), 1000)
+        self.assertTrue((totals.card_wins <= totals.card_played).all())
+
+    def test_simulation_budget_and_time_limit(self) -> None:
+        self.assertEqual(run_simulation(SETUP, samples=1234, workers=1).samples, 1234)
+        self.assertEqual(run_simulation(SETUP, samples=1000, workers=1, time_limit=0).samples, 0)
+
+    def test_simulation_scaling_benchmark(self) -> None:
+        measurements = measure_scaling(SETUP, 1000, [1, 2])
+        self.assertEqual([measurement.workers for measurement in measurements], [1, 2])
+        self.assertTrue(all(measurement.samples_per_second > 0 for measurement in measurements))
+        self.assertEqual(len(format_scaling(measurements).splitlines()), 3)
+
+
+class SimulateChapterTests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b", "c", "d"]]
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+
+    def test_simulate_chapter_setup_of_new_game(self) -> None:
+        setup = chapter_setup(load_game_state(self.game, use_cache=False))
+        self.assertEqual(setup.hidden_slots, (6, 6, 6, 6))
+        self.assertEqual(len(setup.unknown_cards), 28)
+        self.assertEqual(setup.round_plays, ())
+
+    def test_simulate_chapter_command(self) -> None:
+        stdout = io.StringIO()
+        call_command("simulate_chapter", str(self.game.id), samples=300, workers=1, card_format="code", stdout=stdout)
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(result["samples"], 300)
+        self.assertEqual([player["nick"] for player in result["players"]], ["a", "b", "c", "d"])
+        # every player plays one card in each of six rounds, every round is led face up and won
+        self.assertAlmostEqual(sum(suit["leads"] for suit in result["suits"].values()), 6.0, places=2)
+        self.assertAlmostEqual(sum(player["rounds_won"] for player in result["players"]), 6.0, places=2)
+        self.assertAlmostEqual(sum(player["initiative"] for player in result["players"]), 1.0, places=2)
+        self.assertTrue(all(len(code) == 4 for code in result["cards"]))
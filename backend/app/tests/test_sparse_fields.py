@@ -0,0 +1,105 @@
+from typing import Any, List
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..models import Game, GameRound, Player
+
+User = get_user_model()
+
+
+class SparseFieldsAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_with_queries(self, url: str, params: Any = None) -> Any:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in queries.captured_queries]
+
+    def get_game_queries(self, queries: List[str]) -> List[str]:
+        return [sql for sql in queries if 'FROM "app_game"' in sql]
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = [Player.objects.create(nick=nick, user=self.user) for nick in ["a", "b"]]
+        with transaction.atomic():
+            for name in ["a", "b"]:
+                game = Game.objects.create(name=name, user=self.user)
+                game.players.set(players)
+                prepare_new_game(game)
+        self.game = Game.objects.get(name="a")
+
+    def test_sparse_fields_games(self) -> None:
+        full_response, full_queries = self.get_with_queries(reverse("games"))
+        response, queries = self.get_with_queries(reverse("games"), {"fields": "id,name"})
+        self.assertEqual([set(game) for game in response.data], [{"id", "name"}, {"id", "name"}])
+        self.assertEqual([game["name"] for game in response.data], [game["name"] for game in full_response.data])
+        # players are not prefetched and cards are not read
+        self.assertEqual(len(queries), len(full_queries) - 1)
+        self.assertNotIn("cards_not_played", self.get_game_queries(queries)[0])
+        self.assertIn("cards_not_played", self.get_game_queries(full_queries)[0])
+
+    def test_sparse_fields_games_exclude(self) -> None:
+        response = self.client.get(reverse("games"), {"exclude": "cards_not_played"})
+        self.assertEqual(set(response.data[0]), {"id", "name", "players", "finished"})
+        self.assertEqual(len(response.data[0]["players"]), 2)
+        response = self.client.get(reverse("games"), {"fields": "id,name,finished", "exclude": "name"})
+        self.assertEqual(set(response.data[0]), {"id", "finished"})
+
+    def test_sparse_fields_game_by_name(self) -> None:
+        full_response, full_queries = self.get_with_queries(reverse("games"), {"name": "a"})
+        response, queries = self.get_with_queries(reverse("games"), {"name": "a", "fields": "id"})
+        self.assertEqual(response.data, {"id": str(self.game.id)})
+        self.assertEqual(response["ETag"], full_response["ETag"])
+        self.assertEqual(len(queries), len(full_queries) - 1)
+        async_response = self.client.get(reverse("async-games"), {"name": "a", "fields": "id"})
+        self.assertEqual(async_response.json(), {"id": str(self.game.id)})
+
+    def test_sparse_fields_players(self) -> None:
+        response = self.client.get(reverse("players"), {"fields": "nick"})
+        self.assertEqual(response.data, [{"nick": "a"}, {"nick": "b"}])
+
+    def test_sparse_fields_game_rounds(self) -> None:
+        GameRound.objects.create(game=self.game, chapter=1, round=2)
+        for url_name in ("game-rounds", "async-game-rounds"):
+            with self.subTest(url_name=url_name):
+                url = reverse(url_name, kwargs={"game_id": str(self.game.id)})
+                response = self.client.get(url, {"fields": "round", "limit": 1})
+                self.assertEqual(response.json(), [{"round": 1}])
+                response = self.client.get(response["Link"].split(">")[0][1:])
+                self.assertEqual(response.json(), [{"round": 2}])
+
+    def test_sparse_fields_cards_played(self) -> None:
+        player_id = Player.objects.get(nick="a").id
+        self.client.post(
+            reverse("play-card", kwargs={"game_id": str(self.game.id), "player_id": str(player_id)}),
+            {"number_of_cards_face_down": 1},
+        )
+        for url_name in ("play-card", "async-play-card"):
+            with self.subTest(url_name=url_name):
+                url = reverse(url_name, kwargs={"game_id": str(self.game.id), "player_id": str(player_id)})
+                response = self.client.get(url, {"exclude": "id,game_round"})
+                self.assertEqual(
+                    response.json(),
+                    [{"player": str(player_id), "card_face_up": None, "number_of_cards_face_down": 1}],
+                )
+
+    def test_sparse_fields_unknown_field(self) -> None:
+        test_cases = [
+            ({"fields": "id,foo"}, "unknown fields: foo"),
+            ({"exclude": "bar,baz"}, "unknown fields: bar, baz"),
+        ]
+        for params, detail in test_cases:
+            with self.subTest(params=params):
+                response = self.client.get(reverse("games"), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data["detail"], detail)
@@ -0,0 +1,65 @@
+import io
+import os
+import runpy
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from ..sqlite_benchmark import connect, format_write_benchmark, run_write_benchmark
+
+
+class SqliteBenchmarkTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+
+    def test_sqlite_benchmark_production_options_applied_on_connection(self) -> None:
+        connection = connect(Path(self.directory.name) / "db.sqlite3", settings.SQLITE_PRODUCTION_OPTIONS)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone(), ("wal",))
+        # NORMAL
+        self.assertEqual(connection.execute("PRAGMA synchronous").fetchone(), (1,))
+        connection.close()
+
+    def test_sqlite_benchmark_production_profile_applied_to_django_connection(self) -> None:
+        with mock.patch.dict(os.environ, {"ARCTRACKER_DATABASE_PROFILE": "production"}):
+            profile = runpy.run_path(str(settings.BASE_DIR / "ArcTracker" / "settings.py"))["DATABASES"]["default"]
+        self.assertEqual(profile["OPTIONS"], settings.SQLITE_PRODUCTION_OPTIONS)
+        path = Path(self.directory.name) / "db.sqlite3"
+        connections["production"] = DatabaseWrapper(
+            {**connections["default"].settings_dict, **profile, "NAME": path}, "production"
+        )
+        self.addCleanup(connections.__delitem__, "production")
+        self.addCleanup(connections["production"].close)
+        with connections["production"].cursor() as cursor:
+            pragmas = {
+                pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                for pragma in ["journal_mode", "synchronous", "busy_timeout"]
+            }
+        # NORMAL synchronous mode, busy timeout in milliseconds
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 20000})
+        with transaction.atomic(using="production"):
+            # IMMEDIATE transaction holds the write lock from its start, before anything is written
+            other = sqlite3.connect(path, timeout=0)
+            self.addCleanup(other.close)
+            with self.assertRaisesMessage(sqlite3.OperationalError, "database is locked"):
+                other.execute("BEGIN IMMEDIATE")
+
+    def test_sqlite_benchmark_production_profile_not_locked(self) -> None:
+        result = run_write_benchmark(Path(self.directory.name), "production", threads=4, transactions=25)
+        self.assertEqual((result.committed, result.locked), (100, 0))
+        self.assertGreater(result.commits_per_second, 0)
+        self.assertIn("production", format_write_benchmark([result]))
+
+    def test_sqlite_benchmark_command(self) -> None:
+        stdout = io.StringIO()
+        call_command("sqlite_benchmark", threads=2, transactions=5, directory=self.directory.name, stdout=stdout)
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ["profile", "default", "production"])
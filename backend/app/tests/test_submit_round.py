@@ -0,0 +1,160 @@
+import uuid
+from typing import Any, Dict
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
+from ..game_events import build_game_state, load_game_state
+from ..lookup_cache import lookup_cache
+from ..models import CardPlayedInRound, Game, GameEvent, GameRound, Player, PlayerHand
+
+User = get_user_model()
+
+
+class RoundSubmitAPITests(APITestCase):  # type: ignore[misc]
+
+    fixtures = ["app/initial_data/initial_data.json"]
+
+    def get_submit_round_url(self, game_id: uuid.UUID) -> str:
+        return reverse("submit-round", kwargs={"game_id": str(game_id)})
+
+    def submit(self, data: Dict[str, Any]) -> Any:
+        return self.client.post(self.get_submit_round_url(self.game.id), data, format="json")
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="12345")
+        self.user_two = User.objects.create_user(username="testuser_two", password="12345")
+        self.client.force_authenticate(user=self.user)
+        players = []
+        for nick in ["a", "b", "c"]:
+            players.append(Player.objects.create(nick=nick, user=self.user))
+        with transaction.atomic():
+            self.game = Game.objects.create(name="a", user=self.user)
+            self.game.players.set(players)
+            prepare_new_game(self.game)
+        self.players = [str(player.id) for player in players]
+        self.cards = [str(card.id) for card in get_catalog().cards_in(self.game.cards_not_played)]
+
+    def test_submit_round_post(self) -> None:
+        a, b, c = self.players[0], self.players[1], self.players[2]
+        response = self.submit(
+            {
+                "reveals": [{"player": a, "card": self.cards[0]}],
+                "plays": [
+                    {"player": a, "card_face_up": self.cards[0], "number_of_cards_face_down": 1},
+                    {"player": b, "card_face_up": self.cards[1]},
+                    {"player": c, "number_of_cards_face_down": 2},
+                ],
+                "retrieves": [{"player": c, "card": self.cards[1]}],
+                "advance": True,
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["chapter"], 1)
+        self.assertEqual(response.data["round"], 2)
+        self.assertEqual(response.data["cards_played_in_round"], [])
+        self.assertEqual([player["number_of_cards"] for player in response.data["players"]], [4, 5, 5])
+        self.assertEqual(len(response.data["cards_not_played"]), 18)
+        hands = {str(hand.player_id): hand for hand in PlayerHand.objects.filter(game=self.game)}
+        # card revealed to a and played face up is no longer known to be in the hand
+        self.assertEqual(hands[a].cards, 0)
+        self.assertEqual([str(card.id) for card in get_catalog().cards_in(hands[c].cards)], [self.cards[1]])
+        self.assertEqual(CardPlayedInRound.objects.filter(game_round__game=self.game, game_round__round=1).count(), 3)
+        self.assertEqual(GameEvent.objects.filter(game=self.game).count(), 6)
+        self.game.refresh_from_db()
+        self.assertEqual(load_game_state(self.game, use_cache=False), build_game_state(self.game))
+
+    def test_submit_round_post_stale_game(self) -> None:
+        a, b, c = self.players[0], self.players[1], self.players[2]
+        stale_game = Game.objects.select_related("current_round").get(id=self.game.id)
+        plays = [{"player": player, "number_of_cards_face_down": 1} for player in self.players]
+        response = self.submit({"reveals": [{"player": a, "card": self.cards[0]}], "plays": plays, "advance": True})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # the view gets the game as it was before the first submission, as from lookup cache of another worker
+        with mock.patch.object(lookup_cache, "get_or_load", return_value=stale_game):
+            response = self.submit(
+                {
+                    "reveals": [{"player": b, "card": self.cards[1]}],
+                    "plays": [{"player": c, "card_face_up": self.cards[2]}, *plays[:2]],
+                    "advance": True,
+                }
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["round"], 3)
+        self.game.refresh_from_db()
+        cards_not_played = [str(card.id) for card in get_catalog().cards_in(self.game.cards_not_played)]
+        self.assertEqual(len(cards_not_played), len(self.cards) - 3)
+        self.assertNotIn(self.cards[0], cards_not_played)
+        self.assertEqual(load_game_state(self.game, use_cache=False), build_game_state(self.game))
+
+    def test_submit_round_post_without_advance(self) -> None:
+        response = self.submit({"plays": [{"player": self.players[0], "number_of_cards_face_down": 1}]})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["round"], 1)
+        self.assertEqual(len(response.data["cards_played_in_round"]), 1)
+
+    def test_submit_round_post_player_played_this_round(self) -> None:
+        game_round = GameRound.objects.get(game=self.game)
+        CardPlayedInRound.objects.create(player_id=self.players[0], game_round=game_round, number_of_cards_face_down=1)
+        response = self.submit(
+            {
+                "plays": [
+                    {"player": self.players[1], "number_of_cards_face_down": 1},
+                    {"player": self.players[0], "number_of_cards_face_down": 1},
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], "player a played card this round")
+        self.assertEqual(CardPlayedInRound.objects.count(), 1)
+
+    def test_submit_round_post_card_already_played(self) -> None:
+        response = self.submit(
+            {
+                "plays": [
+                    {"player": self.players[0], "card_face_up": self.cards[0]},
+                    {"player": self.players[1], "card_face_up": self.cards[0]},
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], f"card {self.cards[0]} was already played face up")
+        self.assertEqual(CardPlayedInRound.objects.count(), 0)
+        self.assertEqual(GameEvent.objects.filter(game=self.game).count(), 0)
+
+    def test_submit_round_post_card_can_not_be_retrieved(self) -> None:
+        response = self.submit({"retrieves": [{"player": self.players[0], "card": self.cards[0]}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], f"card {self.cards[0]} can not be retrieved")
+
+    def test_submit_round_post_not_all_players_played(self) -> None:
+        response = self.submit(
+            {"plays": [{"player": self.players[0], "number_of_cards_face_down": 1}], "advance": True}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], "not all players that have cards played in this round")
+        self.assertEqual(GameRound.objects.filter(game=self.game).count(), 1)
+        self.assertEqual(CardPlayedInRound.objects.count(), 0)
+
+    def test_submit_round_post_player_not_in_game(self) -> None:
+        player = Player.objects.create(nick="d", user=self.user)
+        response = self.submit({"plays": [{"player": str(player.id), "number_of_cards_face_down": 1}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], f"player {player.id} does not play in this game")
+
+    def test_submit_round_post_invalid_play(self) -> None:
+        response = self.submit({"plays": [{"player": self.players[0]}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_submit_round_post_game_not_exists(self) -> None:
+        game = Game.objects.create(name="b", user=self.user_two)
+        response = self.client.post(self.get_submit_round_url(game.id), {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["detail"], f"game {game.id} does not exist")
@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from ..api_views_logic import prepare_new_game
+from ..cards_catalog import get_catalog
 from ..models import Game, GameRound, Player, PlayerHand
 
 User = get_user_model()
@@ -43,19 +44,20 @@ class UnrevealCardAPITests(APITestCase):  # type: ignore[misc]
         assert game_round is not None
         players = game.players.all()
         player = players[0]
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         player_hand = PlayerHand.objects.get(game=game, player_id=player.id)
-        player_hand.cards.add(card)
+        player_hand.cards |= get_catalog().bit(card)
         player_hand.save()
-        game.cards_not_played.remove(card)
+        game.cards_not_played &= ~get_catalog().bit(card)
         game.save()
         response = self.client.post(self.get_unreveal_card_url(game.id, player.id), {"id": card.id})
-        player_cards = player_hand.cards.all()
+        player_hand.refresh_from_db()
+        game.refresh_from_db()
+        player_cards = get_catalog().cards_in(player_hand.cards)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(player_hand.number_of_cards, 6)
         self.assertEqual(len(player_cards), 0)
-        self.assertEqual(len(game.cards_not_played.all()), 20)
+        self.assertEqual(len(get_catalog().cards_in(game.cards_not_played)), 20)
 
     def test_unreveal_card_post_already_played(self) -> None:
         game = Game.objects.first()
@@ -64,8 +66,7 @@ class UnrevealCardAPITests(APITestCase):  # type: ignore[misc]
         assert game_round is not None
         player = game.players.first()
         assert player is not None
-        card = game.cards_not_played.first()
-        assert card is not None
+        card = get_catalog().cards_in(game.cards_not_played)[0]
         response = self.client.post(self.get_unreveal_card_url(game.id, player.id), {"id": card.id})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data["detail"], f"card {card.id} can not be unrevealed")
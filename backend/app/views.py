@@ -5,14 +5,16 @@ from django.contrib.auth import login, logout
 from django.contrib.auth import models as auth_models
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse, HttpResponseNotFound
 from django.shortcuts import redirect, render
 
+from .cards_catalog import get_catalog
 from .forms import CardPlayedInRoundForm, ChoosePlayerForm, GameForm, NumberOfCardsAddedForm, PlayerCardForm, PlayerForm
-from .models import CardPlayedInRound, Game, GameRound, Player, PlayerHand
+from .game_events import record_event, start_event_log
+from .models import CardPlayedInRound, Game, GameEventKind, GameRound, Player, PlayerHand
 from .views_logic import (
     assign_cards,
-    cards_number_order,
     create_initial_round,
     deal_initial_hands,
     get_cards_played_by_round,
@@ -75,13 +77,15 @@ def new_game_view(request: HttpRequest) -> HttpResponse:
     if request.method == "POST":
         game_form = GameForm(request.POST, user=request.user)
         if game_form.is_valid():
-            game = game_form.save(commit=False)
-            game.user = request.user
-            game.save()
-            game_form.save_m2m()
-            assign_cards(game)
-            create_initial_round(game)
-            deal_initial_hands(game)
+            with transaction.atomic():
+                game = game_form.save(commit=False)
+                game.user = request.user
+                game.save()
+                game_form.save_m2m()
+                assign_cards(game)
+                create_initial_round(game)
+                deal_initial_hands(game)
+                start_event_log(game)
             return redirect(f"/game/{game.id}/1/1")
     else:
         game_form = GameForm(user=request.user)
@@ -115,7 +119,8 @@ def players_view(request: HttpRequest) -> HttpResponse:
 @login_required(login_url="/login/")
 def games_view(request: HttpRequest) -> HttpResponse:
     assert isinstance(request.user, auth_models.User)
-    return render(request, "view.html", {"name": "games", "models": Game.objects.filter(user=request.user)})
+    games = Game.objects.filter(user=request.user).prefetch_related("players")
+    return render(request, "view.html", {"name": "games", "models": games})
 
 
 @login_required(login_url="/login/")
@@ -131,16 +136,17 @@ def new_action_view(  # pylint: disable=too-many-return-statements, too-many-bra
     player = Player.objects.filter(id=player_id).get()
     player_hand = PlayerHand.objects.get(player=player, game=game)
 
-    card_played_in_round_form = CardPlayedInRoundForm(cards=get_cards_to_play(game, player))
+    card_played_in_round_form = CardPlayedInRoundForm(cards=get_cards_to_play(game, player_hand))
     card_retrived_in_round_form = PlayerCardForm(cards=get_cards_to_retrieve(game, chapter_number, round_number))
     number_of_cards_added_form = NumberOfCardsAddedForm()
     reveal_card_form = PlayerCardForm(cards=get_cards_to_reveal(game))
-    unreveal_card_form = PlayerCardForm(cards=player_hand.cards.all())
+    player_cards = get_catalog().cards_in(player_hand.cards)
+    unreveal_card_form = PlayerCardForm(cards=player_cards)
 
     if request.method == "POST":
         submit_type = request.POST.get("submit_type")
         if submit_type == "card_played":
-            card_played_in_round_form = CardPlayedInRoundForm(request.POST, cards=get_cards_to_play(game, player))
+            card_played_in_round_form = CardPlayedInRoundForm(request.POST, cards=get_cards_to_play(game, player_hand))
             if card_played_in_round_form.is_valid():
                 handle_card_played(card_played_in_round_form, game, player, chapter_number, round_number)
                 return redirect(f"/game/{game.id}/{chapter_number}/{round_number}")
@@ -154,7 +160,7 @@ def new_action_view(  # pylint: disable=too-many-return-statements, too-many-bra
         elif submit_type == "number_of_cards_added":
             number_of_cards_added_form = NumberOfCardsAddedForm(request.POST)
             if number_of_cards_added_form.is_valid():
-                handle_number_of_cards_added(number_of_cards_added_form, player)
+                handle_number_of_cards_added(number_of_cards_added_form, game, player)
                 return redirect(f"/game/{game_id}/{chapter_number}/{round_number}")
         elif submit_type == "reveal_card":
             reveal_card_form = PlayerCardForm(request.POST, cards=get_cards_to_reveal(game))
@@ -162,7 +168,7 @@ def new_action_view(  # pylint: disable=too-many-return-statements, too-many-bra
                 handle_reveal_card(reveal_card_form, game, player)
                 return redirect(f"/game/{game_id}/{chapter_number}/{round_number}")
         elif submit_type == "unreveal_card":
-            unreveal_card_form = PlayerCardForm(request.POST, cards=player_hand.cards.all())
+            unreveal_card_form = PlayerCardForm(request.POST, cards=player_cards)
             if unreveal_card_form.is_valid():
                 handle_unreveal_card(unreveal_card_form, game, player)
                 return redirect(f"/game/{game_id}/{chapter_number}/{round_number}")
@@ -198,7 +204,9 @@ def current_game_view(  # pylint: disable=too-many-return-statements
         if submit_type == "new_round":
             if cards_played_in_rounds < number_of_players:
                 return HttpResponseNotFound("not all players played in this round")
-            GameRound(game=game_object, chapter=chapter_number, round=round_number + 1).save()
+            with transaction.atomic():
+                GameRound(game=game_object, chapter=chapter_number, round=round_number + 1).save()
+                record_event(game_object, GameEventKind.ROUND_CREATED)
             return redirect(f"/game/{game_id}/{chapter_number}/{round_number + 1}")
         if submit_type == "new_chapter":
             if cards_played_in_rounds < number_of_players:
@@ -219,9 +227,7 @@ def current_game_view(  # pylint: disable=too-many-return-statements
             "name": game_object.name,
             "cards_by_hand": get_cards_to_images_by_hand(game_object).items(),
             "cards_played": get_cards_played_by_round(game_object, chapter_number, round_number).items(),
-            "cards_by_suit": get_cards_to_images_by_suit(
-                game_object.cards_not_played.order_by("suit", cards_number_order)
-            ).values(),
+            "cards_by_suit": get_cards_to_images_by_suit(get_catalog().cards_in(game_object.cards_not_played)).values(),
             "chapter_number": chapter_number,
             "round_number": round_number,
             "new_player_action": choose_player_form,
@@ -1,23 +1,15 @@
-import uuid
 from collections import defaultdict
-from typing import Dict, List
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, Iterable, List, Optional
 
-from django.db.models import Case, IntegerField, When
-from django.db.models.query import QuerySet
+from django.db import transaction
+from django.db.models import F
 
+from .cards_catalog import ALL_CARDS_MASK, get_catalog
 from .forms import CardPlayedInRoundForm, NumberOfCardsAddedForm, PlayerCardForm
-from .models import Card, CardNumber, CardPlayedInRound, Game, GameRound, Player, PlayerHand
-
-cards_number_order = Case(
-    When(number="ONE", then=1),
-    When(number="TWO", then=2),
-    When(number="THREE", then=3),
-    When(number="FOUR", then=4),
-    When(number="FIVE", then=5),
-    When(number="SIX", then=6),
-    When(number="SEVEN", then=7),
-    output_field=IntegerField(),
-)
+from .game_events import record_event, record_events
+from .models import Card, CardPlayedInRound, Game, GameEvent, GameEventKind, GameRound, Player, PlayerHand
 
 
 def assign_cards(game: Game) -> None:
@@ -25,11 +17,8 @@ def assign_cards(game: Game) -> None:
 
     :param game: Game object
     """
-    if game.players.count() < 4:
-        cards = Card.objects.exclude(number__in=[CardNumber.ONE, CardNumber.SEVEN])
-    else:
-        cards = Card.objects.all()
-    game.cards_not_played.set(cards)
+    game.cards_not_played = get_catalog().deck_mask(game.players.count())
+    game.save(update_fields=["cards_not_played"])
 
 
 def create_initial_round(game: Game) -> None:
@@ -50,6 +39,7 @@ def deal_initial_hands(game: Game) -> None:
     )
 
 
+@transaction.atomic
 def start_new_chapter(game: Game, chapter_number: int) -> None:
     """Creates new chapter and prepares new card hands for players
 
@@ -58,73 +48,134 @@ def start_new_chapter(game: Game, chapter_number: int) -> None:
     """
     GameRound.objects.create(game=game, chapter=chapter_number + 1, round=1)
     assign_cards(game)
+    PlayerHand.objects.filter(game=game).update(cards=0, number_of_cards=6)
+    record_events(
+        game,
+        [GameEvent(kind=GameEventKind.CHAPTER_CREATED), GameEvent(kind=GameEventKind.CARDS_DEALT, number_of_cards=6)],
+    )
+
+
+def add_card_to_hand(player_hand: PlayerHand, card: Card, number_of_cards: int = 0) -> None:
+    """Marks card as known to be in player hand and changes number of cards in hand with single row update
+
+    :param player_hand: PlayerHand object
+    :param card: card added to hand
+    :param number_of_cards: change of number of cards in hand
+    """
+    bit = get_catalog().bit(card)
+    PlayerHand.objects.filter(id=player_hand.id).update(
+        cards=F("cards").bitor(bit), number_of_cards=F("number_of_cards") + number_of_cards
+    )
+    player_hand.cards |= bit
+    player_hand.number_of_cards += number_of_cards
+
+
+def change_number_of_cards(player_hand: PlayerHand, number_of_cards: int) -> None:
+    """Changes number of cards in player hand with single row update relative to the stored value, so changes made
+    by concurrent requests are not overwritten
+
+    :param player_hand: PlayerHand object
+    :param number_of_cards: change of number of cards in hand
+    """
+    PlayerHand.objects.filter(id=player_hand.id).update(number_of_cards=F("number_of_cards") + number_of_cards)
+    player_hand.number_of_cards += number_of_cards
+
 
-    for player in game.players.all():
-        hand = PlayerHand.objects.get(player=player, game=game)
-        hand.cards.clear()
-        hand.number_of_cards = 6
-        hand.save()
+def play_cards_from_hand(player_hand: PlayerHand, card_face_up: Optional[Card], number_of_cards_face_down: int) -> None:
+    """Takes cards played from player hand with single row update relative to the stored values, so changes made by
+    concurrent requests are not overwritten. Card played face up is no longer known to be in the hand.
+
+    :param player_hand: PlayerHand object
+    :param card_face_up: card played face up
+    :param number_of_cards_face_down: number of cards played face down
+    """
+    mask = ALL_CARDS_MASK & ~(get_catalog().bit(card_face_up) if card_face_up else 0)
+    number_of_cards = number_of_cards_face_down + (1 if card_face_up else 0)
+    PlayerHand.objects.filter(id=player_hand.id).update(
+        cards=F("cards").bitand(mask), number_of_cards=F("number_of_cards") - number_of_cards
+    )
+    player_hand.cards &= mask
+    player_hand.number_of_cards -= number_of_cards
+
+
+def remove_card_from_hand(player_hand: PlayerHand, card: Card) -> None:
+    """Removes card from cards known to be in player hand with single row update
+
+    :param player_hand: PlayerHand object
+    :param card: card removed from hand
+    """
+    mask = ALL_CARDS_MASK & ~get_catalog().bit(card)
+    PlayerHand.objects.filter(id=player_hand.id).update(cards=F("cards").bitand(mask))
+    player_hand.cards &= mask
+
+
+def remove_card_from_not_played(game: Game, card: Card) -> None:
+    """Removes card from cards not played in game with single row update
+
+    :param game: Game object
+    :param card: card that was played or revealed
+    """
+    mask = ALL_CARDS_MASK & ~get_catalog().bit(card)
+    Game.objects.filter(id=game.id).update(cards_not_played=F("cards_not_played").bitand(mask))
+    game.cards_not_played &= mask
 
 
-def get_cards_to_play(game: Game, player: Player) -> QuerySet[Card]:
+def add_card_to_not_played(game: Game, card: Card) -> None:
+    """Puts card back to cards not played in game with single row update
+
+    :param game: Game object
+    :param card: card that was unrevealed
+    """
+    bit = get_catalog().bit(card)
+    Game.objects.filter(id=game.id).update(cards_not_played=F("cards_not_played").bitor(bit))
+    game.cards_not_played |= bit
+
+
+def get_cards_to_play(game: Game, player_hand: PlayerHand) -> List[Card]:
     """Returns cards that we believe the player can play in this round
 
     :param game: Game object
-    :param player: Active Player object
-    :return: QuerySet of cards
+    :param player_hand: PlayerHand object of active player
+    :return: List of cards
     """
-    player_hand = PlayerHand.objects.get(player=player, game=game)
-    player_card_ids = player_hand.cards.values_list("id", flat=True)
-    not_played_card_ids = game.cards_not_played.values_list("id", flat=True)
-    card_ids = list(player_card_ids) + list(not_played_card_ids)
-    return Card.objects.filter(id__in=card_ids).order_by("suit", cards_number_order)
+    return get_catalog().cards_in(player_hand.cards | game.cards_not_played)
 
 
-def get_cards_to_reveal(game: Game) -> QuerySet[Card]:
+def get_cards_to_reveal(game: Game) -> List[Card]:
     """Returns cards that we believe the player can reveal in this round
 
     :param game: Game object
-    :return: QuerySet of cards
+    :return: List of cards
     """
-    not_played_card_ids = game.cards_not_played.values_list("id", flat=True)
-    return Card.objects.filter(id__in=not_played_card_ids).order_by("suit", cards_number_order)
+    return get_catalog().cards_in(game.cards_not_played)
 
 
-def get_cards_to_retrieve(game: Game, chapter_number: int, round_number: int) -> QuerySet[Card]:
+def get_cards_to_retrieve(game: Game, chapter_number: int, round_number: int) -> List[Card]:
     """Returns cards that we believe the player can retrieve in this round (played card in active round face up)
 
     :param game: Game object
     :param chapter_number: game chapter
     :param round_number: chapter round
-    :return: QuerySet of cards
+    :return: List of cards
     """
     game_round = GameRound.objects.get(game=game, chapter=chapter_number, round=round_number)
     card_ids_played_in_round = CardPlayedInRound.objects.filter(game_round=game_round).values_list(
-        "card_face_up__id", flat=True
-    )
-    player_card_ids: List[uuid.UUID] = [
-        card_id
-        for card_id in PlayerHand.objects.filter(game=game, player__in=game.players.all()).values_list(
-            "cards__id", flat=True
-        )
-        if card_id is not None
-    ]
-    return (
-        Card.objects.filter(id__in=card_ids_played_in_round)
-        .exclude(id__in=player_card_ids)
-        .order_by("suit", cards_number_order)
+        "card_face_up_id", flat=True
     )
+    player_cards = reduce(or_, PlayerHand.objects.filter(game=game).values_list("cards", flat=True), 0)
+    return get_catalog().cards_in(get_catalog().mask_by_ids(card_ids_played_in_round) & ~player_cards)
 
 
-def get_cards_to_images_by_suit(cards: QuerySet[Card]) -> Dict[str, List[str]]:
+def get_cards_to_images_by_suit(cards: Iterable[Card]) -> Dict[str, List[str]]:
     """Prepares cards to be show in frontend as images. It sorts them by card suit.
 
     :param cards: cards that we want to show
     :return: Dictionary with keys as suit and image paths as values
     """
+    catalog = get_catalog()
     cards_by_suit: Dict[str, List[str]] = defaultdict(list)
-    for card in cards:
-        cards_by_suit[card.suit].append(card.suit + "/" + card.number + ".jpg")
+    for card in catalog.sorted(cards):
+        cards_by_suit[card.suit].append(catalog.image(card))
     return cards_by_suit
 
 
@@ -134,16 +185,55 @@ def get_cards_to_images_by_hand(game: Game) -> Dict[str, List[str]]:
     :param game: Game object
     :return: Dictionary with keys as players nick and image paths as values
     """
+    catalog = get_catalog()
     cards_by_hand: Dict[str, List[str]] = defaultdict(list)
-    for player in game.players.all():
-        player_hand = PlayerHand.objects.get(player=player, game=game)
-        for player_card in player_hand.cards.all():
-            cards_by_hand[player.nick].append(player_card.suit + "/" + player_card.number + ".jpg")
-        for _ in range(0, player_hand.number_of_cards - player_hand.cards.count()):
-            cards_by_hand[player.nick].append("back.png")
+    for player_hand in PlayerHand.objects.filter(game=game).select_related("player"):
+        player_cards = catalog.cards_in(player_hand.cards)
+        for player_card in player_cards:
+            cards_by_hand[player_hand.player.nick].append(catalog.image(player_card))
+        for _ in range(0, player_hand.number_of_cards - len(player_cards)):
+            cards_by_hand[player_hand.player.nick].append("back.png")
     return cards_by_hand
 
 
+def get_chapter_history(
+    game: Game, chapter_number: int, round_number: Optional[int] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Returns cards played in chapter till given round, grouped by rounds. It runs one query whatever the number of
+    rounds or players.
+
+    :param game: Game object
+    :param chapter_number: game chapter
+    :param round_number: last chapter round to include, all rounds if not given
+    :return: Dictionary with round numbers as keys and cards played by players in that round as values
+    """
+    filters: Dict[str, Any] = {"game": game, "chapter": chapter_number}
+    if round_number is not None:
+        filters["round__lte"] = round_number
+    rows = (
+        GameRound.objects.filter(**filters)
+        .order_by("round")
+        .values_list(
+            "round",
+            "cardplayedinround__player_id",
+            "cardplayedinround__card_face_up_id",
+            "cardplayedinround__number_of_cards_face_down",
+        )
+    )
+    history: Dict[int, List[Dict[str, Any]]] = {}
+    for _round, player_id, card_face_up_id, number_of_cards_face_down in rows:
+        cards_played = history.setdefault(_round, [])
+        if player_id is not None:
+            cards_played.append(
+                {
+                    "player": player_id,
+                    "card_face_up": card_face_up_id,
+                    "number_of_cards_face_down": number_of_cards_face_down,
+                }
+            )
+    return history
+
+
 def get_cards_played_by_round(game: Game, chapter_number: int, round_number: int) -> Dict[str, List[List[str]]]:
     """Prepares history of played cards in chapter till given round by players. It sorts them by player names.
 
@@ -152,23 +242,21 @@ def get_cards_played_by_round(game: Game, chapter_number: int, round_number: int
     :param round_number: chapter round
     :return: Dictionary with keys as players nick and List of image paths of cards played in rounds as values
     """
-    cards_played_in_chapter: Dict[str, List[List[str]]] = defaultdict(list)
-    for player in game.players.all():
-        cards_played_in_chapter[player.nick] = []
-        for i in range(1, round_number + 1):
-            cards_played_in_chapter[player.nick].append([])
-            game_round = GameRound.objects.get(game=game, chapter=chapter_number, round=i)
-            if CardPlayedInRound.objects.filter(player=player, game_round=game_round).exists():
-                card_played_in_round = CardPlayedInRound.objects.filter(player=player, game_round=game_round).get()
-                if card_played_in_round.card_face_up is not None:
-                    cards_played_in_chapter[player.nick][-1].append(
-                        card_played_in_round.card_face_up.suit + "/" + card_played_in_round.card_face_up.number + ".jpg"
-                    )
-                for i in range(0, card_played_in_round.number_of_cards_face_down):
-                    cards_played_in_chapter[player.nick][-1].append("back.png")
+    catalog = get_catalog()
+    nicks = dict(game.players.values_list("id", "nick"))
+    cards_played_in_chapter: Dict[str, List[List[str]]] = {nick: [] for nick in nicks.values()}
+    for cards_played in get_chapter_history(game, chapter_number, round_number).values():
+        for rounds in cards_played_in_chapter.values():
+            rounds.append([])
+        for card_played in cards_played:
+            images = cards_played_in_chapter[nicks[card_played["player"]]][-1]
+            if card_played["card_face_up"] is not None:
+                images.append(catalog.image_by_id(card_played["card_face_up"]))
+            images.extend(["back.png"] * card_played["number_of_cards_face_down"])
     return cards_played_in_chapter
 
 
+@transaction.atomic
 def handle_card_played(
     card_played_in_round_form: CardPlayedInRoundForm, game: Game, player: Player, chapter_number: int, round_number: int
 ) -> None:
@@ -184,17 +272,21 @@ def handle_card_played(
     card_played.player = player
     card_played.game_round = GameRound.objects.get(game=game, chapter=chapter_number, round=round_number)
     card_played.save()
-    player_hand = PlayerHand.objects.get(player=player, game=game)
+    player_hand = PlayerHand.objects.only("id", "cards", "number_of_cards").get(player=player, game=game)
 
     if card_played.card_face_up:
-        player_hand.number_of_cards -= 1
-        game.cards_not_played.remove(card_played.card_face_up)
-        game.save()
-
-    player_hand.number_of_cards -= card_played.number_of_cards_face_down
-    player_hand.save()
+        remove_card_from_not_played(game, card_played.card_face_up)
+    play_cards_from_hand(player_hand, card_played.card_face_up, card_played.number_of_cards_face_down)
+    record_event(
+        game,
+        GameEventKind.CARD_PLAYED,
+        player_id=player.id,
+        card=card_played.card_face_up,
+        number_of_cards=card_played.number_of_cards_face_down,
+    )
 
 
+@transaction.atomic
 def handle_card_retrieved(card_retrived_in_round_form: PlayerCardForm, game: Game, player: Player) -> None:
     """Handles card_retrieved POST submit
 
@@ -203,23 +295,34 @@ def handle_card_retrieved(card_retrived_in_round_form: PlayerCardForm, game: Gam
     :param player: Player object
     """
     player_hand = PlayerHand.objects.get(player=player, game=game)
-    player_hand.number_of_cards += 1
-    player_hand.cards.add(card_retrived_in_round_form.cleaned_data["card"])
-    player_hand.save()
-    game.cards_not_played.remove(card_retrived_in_round_form.cleaned_data["card"])
+    add_card_to_hand(player_hand, card_retrived_in_round_form.cleaned_data["card"], number_of_cards=1)
+    remove_card_from_not_played(game, card_retrived_in_round_form.cleaned_data["card"])
+    record_event(
+        game, GameEventKind.CARD_RETRIEVED, player_id=player.id, card=card_retrived_in_round_form.cleaned_data["card"]
+    )
 
 
-def handle_number_of_cards_added(number_of_cards_added_form: NumberOfCardsAddedForm, player: Player) -> None:
+@transaction.atomic
+def handle_number_of_cards_added(
+    number_of_cards_added_form: NumberOfCardsAddedForm, game: Game, player: Player
+) -> None:
     """Handles number_of_cards_added POST submit
 
     :param number_of_cards_added_form: cards added by active player
+    :param game: Game object
     :param player: Player object
     """
-    player_hand = PlayerHand.objects.get(player=player)
-    player_hand.number_of_cards += number_of_cards_added_form.cleaned_data["number_of_cards"]
-    player_hand.save()
+    player_hand = PlayerHand.objects.only("id", "number_of_cards").get(player=player, game=game)
+    change_number_of_cards(player_hand, number_of_cards_added_form.cleaned_data["number_of_cards"])
+    record_event(
+        game,
+        GameEventKind.CARDS_ADDED,
+        player_id=player.id,
+        number_of_cards=number_of_cards_added_form.cleaned_data["number_of_cards"],
+    )
 
 
+@transaction.atomic
 def handle_reveal_card(reveal_card_form: PlayerCardForm, game: Game, player: Player) -> None:
     """Handles reveal_card POST submit
 
@@ -228,11 +331,12 @@ def handle_reveal_card(reveal_card_form: PlayerCardForm, game: Game, player: Pla
     :param player: Player object
     """
     player_hand_object = PlayerHand.objects.filter(player=player, game=game).get()
-    player_hand_object.cards.add(reveal_card_form.cleaned_data["card"])
-    player_hand_object.save()
-    game.cards_not_played.remove(reveal_card_form.cleaned_data["card"])
+    add_card_to_hand(player_hand_object, reveal_card_form.cleaned_data["card"])
+    remove_card_from_not_played(game, reveal_card_form.cleaned_data["card"])
+    record_event(game, GameEventKind.CARD_REVEALED, player_id=player.id, card=reveal_card_form.cleaned_data["card"])
 
 
+@transaction.atomic
 def handle_unreveal_card(unreveal_card_form: PlayerCardForm, game: Game, player: Player) -> None:
     """Handles unreveal_card POST submit
 
@@ -241,6 +345,6 @@ def handle_unreveal_card(unreveal_card_form: PlayerCardForm, game: Game, player:
     :param player: Player object
     """
     player_hand_object = PlayerHand.objects.filter(player=player, game=game).get()
-    player_hand_object.cards.remove(unreveal_card_form.cleaned_data["card"])
-    player_hand_object.save()
-    game.cards_not_played.add(unreveal_card_form.cleaned_data["card"])
+    remove_card_from_hand(player_hand_object, unreveal_card_form.cleaned_data["card"])
+    add_card_to_not_played(game, unreveal_card_form.cleaned_data["card"])
+    record_event(game, GameEventKind.CARD_UNREVEALED, player_id=player.id, card=unreveal_card_form.cleaned_data["card"])
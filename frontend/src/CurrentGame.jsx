@@ -7,54 +7,42 @@ import PlayCardForm from "./PlayCardForm";
 
 export default function CurrentGame() {
     const [game, setGame] = useState({});
-    const [cards, setCards] = useState([]);
-    const [players, setPlayers] = useState([]);
     const [selected, setSelected] = useState(null);
     const { name } = useParams();
-    const cardsNotPlayedElements = cards.filter(card => game.cards_not_played?.includes(card.id)).map(card => <Card key={card.id} number={card.number} suit={card.suit}/>)
+    const cardsNotPlayedElements = (game.cards_not_played ?? []).map(card => <Card key={card.id} number={card.number} suit={card.suit}/>)
 
-    const setGameStateFromAPI = async (includePlayers = false) => {
+    const setGameStateFromAPI = async (gameId) => {
         try {
-            const resGame = await fetch(`${API_URL}/api/games/?name=${encodeURIComponent(name)}`, { 
+            const res = await fetch(`${API_URL}/api/games/${gameId}/state`, { 
                 credentials: "include",
                 headers: { "Accept": "application/json" }
             });
-            const gameData = await resGame.json();
-            setGame(gameData);
-
-            if (includePlayers) {
-            const resPlayers = await fetch(`${API_URL}/api/players/`, { 
-                credentials: "include",
-                headers: { "Accept": "application/json" }
-            });
-            const playersData = await resPlayers.json();
-            setPlayers(playersData.filter(player => gameData.players.includes(player.id)));
-            }
+            const gameState = await res.json();
+            setGame(gameState);
         } catch (err) {
-            console.error("Failed to fetch game/players:", err);
+            console.error("Failed to fetch game state:", err);
         }
     };
 
-    const setCardsFromAPI = async () => {
+    const setGameFromAPI = async () => {
         try {
-            const res = await fetch(`${API_URL}/api/cards/`, { 
+            const res = await fetch(`${API_URL}/api/games/?name=${encodeURIComponent(name)}`, { 
                 credentials: "include",
                 headers: { "Accept": "application/json" }
             });
-            const cardsData = await res.json();
-            setCards(cardsData);
+            const gameData = await res.json();
+            await setGameStateFromAPI(gameData.id);
         } catch (err) {
-            console.error("Failed to fetch cards:", err);
+            console.error("Failed to fetch game:", err);
         }
     };
 
     useEffect(() => {
-        setGameStateFromAPI(true); // game + players
-        setCardsFromAPI();
+        setGameFromAPI();
     }, []);
 
     const reloadAfterPlayCard = async () => {
-        await setGameStateFromAPI(); // just game
+        await setGameStateFromAPI(game.id);
         setSelected(null);
     };
 
@@ -67,7 +55,7 @@ export default function CurrentGame() {
             </div>
             <h3>Choose Action:</h3>
             <PlayOptions selected={selected} setSelected={setSelected}/>
-            {selected == "Play" && <PlayCardForm game={game} players={players} reloadAfterPlayCard={reloadAfterPlayCard}/>}
+            {selected == "Play" && <PlayCardForm game={game} players={game.players ?? []} reloadAfterPlayCard={reloadAfterPlayCard}/>}
         </section>
     );
-}
\ No newline at end of file
+}